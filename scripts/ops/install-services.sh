@@ -60,6 +60,8 @@ SYSTEM_SERVICES=(
   argos-headless.service
   argos-droneid.service
   gsmevil-patch.service
+  argos-module-retention.service
+  argos-module-retention.timer
 )
 
 for name in "${SYSTEM_SERVICES[@]}"; do
@@ -81,6 +83,17 @@ for name in "${SYSTEM_SERVICES[@]}"; do
   chmod 644 "$SYSTEMD_DIR/$name"
 done
 
+# Runtime directories: /run/argos/locks must exist whichever services are
+# up, so every module run takes its device leases in the same place
+TMPFILES_CONF="argos-tmpfiles.conf"
+if [[ -f "$DEPLOY_DIR/$TMPFILES_CONF" ]]; then
+  echo "  Installing tmpfiles.d/argos.conf"
+  sed "s|__SETUP_USER__|$SETUP_USER|g" \
+      "$DEPLOY_DIR/$TMPFILES_CONF" > /etc/tmpfiles.d/argos.conf
+  chmod 644 /etc/tmpfiles.d/argos.conf
+  systemd-tmpfiles --create /etc/tmpfiles.d/argos.conf 2>/dev/null || true
+fi
+
 # User-level service (argos-dev-monitor) — installed to user systemd
 USER_SERVICE="argos-dev-monitor.service"
 if [[ -f "$DEPLOY_DIR/$USER_SERVICE" ]]; then
@@ -110,6 +123,8 @@ echo "Enabling core services..."
 systemctl enable argos-startup.service 2>/dev/null || true
 systemctl enable argos-final.service 2>/dev/null || true
 systemctl enable argos-kismet.service 2>/dev/null || true
+# Daily module_runs rollup/prune; without it the table grows without bound
+systemctl enable argos-module-retention.timer 2>/dev/null || true
 # Enable monitor services only if their binaries were installed
 for bin in argos-cpu-protector argos-wifi-resilience argos-process-manager; do
   if [[ -x "/usr/local/bin/${bin}.sh" ]]; then
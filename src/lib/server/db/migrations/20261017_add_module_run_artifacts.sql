@@ -0,0 +1,8 @@
+-- Migration 20261017: Link module_runs to the tactical artifact store
+-- Full module stdout/stderr now live in compressed, content-addressed files
+-- (tactical/modules/core/artifacts.py). module_runs.stdout/stderr keep a
+-- short preview; these columns hold the "sha256:<hex>" artifact keys, or
+-- NULL when the whole output fit in the preview.
+
+ALTER TABLE module_runs ADD COLUMN stdout_artifact TEXT;
+ALTER TABLE module_runs ADD COLUMN stderr_artifact TEXT;
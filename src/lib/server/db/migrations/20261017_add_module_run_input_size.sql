@@ -0,0 +1,8 @@
+-- Migration 20261017: Coarse input size per module run
+-- TacticalModule records the bucketed size feature the adaptive timeout
+-- estimator keys durations by (tactical/modules/core/estimator.py), e.g.
+-- "hosts:256", "probes:1024", "bytes:1048576", "mhz:1024", "seconds:16".
+-- Stored at run time so file sizes are those of the input actually read.
+-- NULL for runs without one; the estimator derives it from args instead.
+
+ALTER TABLE module_runs ADD COLUMN input_size TEXT;
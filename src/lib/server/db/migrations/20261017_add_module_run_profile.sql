@@ -0,0 +1,7 @@
+-- Migration 20261017: Link module_runs to on-demand profiles
+-- With ARGOS_PROFILE=cpu|alloc|pyspy, TacticalModule writes a cProfile
+-- .pstats, tracemalloc snapshot or py-spy speedscope file (plus a top-N
+-- .txt summary) under the artifact root's profiles/ directory
+-- (tactical/modules/core/profiling.py). NULL for unprofiled runs.
+
+ALTER TABLE module_runs ADD COLUMN profile_path TEXT;
@@ -0,0 +1,6 @@
+-- Migration 20261017: Per-run resource accounting for module_runs
+-- JSON written by TacticalModule.log_run(): wall time, module and child
+-- process CPU (user/sys ms), peak RSS (KB), storage read/write bytes and a
+-- per-tool breakdown from /proc/<pid>/io + wait4(). NULL for older rows.
+
+ALTER TABLE module_runs ADD COLUMN resources TEXT;
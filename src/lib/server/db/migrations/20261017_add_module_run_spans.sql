@@ -0,0 +1,22 @@
+-- Migration 20261017: Per-phase timings for module runs
+-- TacticalModule records spans (spawn, tool, parse, serialise, db_log and
+-- module-defined phases) per run; with ARGOS_TIMINGS=db they are written
+-- here, keyed by the run_id that module_runs now carries. start_ms is the
+-- offset from the start of the run; nested spans have depth > 0.
+
+CREATE TABLE IF NOT EXISTS module_run_spans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    module_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    start_ms REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    depth INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_module_run_spans_run ON module_run_spans(run_id);
+CREATE INDEX IF NOT EXISTS idx_module_run_spans_module_name ON module_run_spans(module_name, name);
+
+-- Last: a duplicate-column error on re-run skips only what follows it
+ALTER TABLE module_runs ADD COLUMN run_id TEXT;
+CREATE INDEX IF NOT EXISTS idx_module_runs_run_id ON module_runs(run_id);
@@ -0,0 +1,10 @@
+-- Migration 20261017: Composite (device_id, timestamp) index on signals
+-- wifi_recon's Argos DB fallback (WiFiRecon._query_argos_targets) looks up
+-- each device's latest signal with
+--   SELECT id FROM signals WHERE device_id = ? ORDER BY timestamp DESC, id DESC LIMIT 1
+-- idx_signals_device only narrows that to the device's rows, which are then
+-- sorted, so busy devices cost O(their signals) per lookup. With timestamp
+-- (and the implicit rowid) in the index the lookup is one index-only seek.
+-- Plan checked by tests/unit/wifi-recon-argos-query-plan.test.ts.
+CREATE INDEX IF NOT EXISTS idx_signals_device_timestamp
+  ON signals(device_id, timestamp);
@@ -0,0 +1,60 @@
+-- Migration 20261017: Shared host/service/device state per campaign
+-- Discovery modules (net_discover, nbtscan_scanner, packet_manipulator
+-- arp-scan, port_scanner, mass_scanner) upsert what they find here, keyed by
+-- the campaign their engagement belongs to, so later modules in the same
+-- campaign can read prior results and skip work already done instead of
+-- re-parsing module_runs.stdout. See tactical/modules/core/state_store.py.
+-- sources is a comma-separated list of the modules that reported the row.
+
+CREATE TABLE IF NOT EXISTS campaign_hosts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id INTEGER NOT NULL,
+    ip TEXT NOT NULL,
+    mac TEXT,
+    vendor TEXT,
+    hostname TEXT,
+    netbios_name TEXT,
+    os TEXT,
+    status TEXT NOT NULL DEFAULT 'up',
+    sources TEXT NOT NULL DEFAULT '',
+    first_seen INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+    last_seen INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+    UNIQUE (campaign_id, ip),
+    FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_campaign_hosts_mac ON campaign_hosts(campaign_id, mac);
+CREATE INDEX IF NOT EXISTS idx_campaign_hosts_hostname ON campaign_hosts(campaign_id, hostname);
+CREATE INDEX IF NOT EXISTS idx_campaign_hosts_last_seen ON campaign_hosts(campaign_id, last_seen);
+
+CREATE TABLE IF NOT EXISTS campaign_services (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id INTEGER NOT NULL,
+    ip TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    protocol TEXT NOT NULL DEFAULT 'tcp',
+    state TEXT NOT NULL DEFAULT 'open',
+    service TEXT,
+    version TEXT,
+    banner TEXT,
+    sources TEXT NOT NULL DEFAULT '',
+    first_seen INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+    last_seen INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+    UNIQUE (campaign_id, ip, port, protocol),
+    FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_campaign_services_service ON campaign_services(campaign_id, service);
+
+CREATE TABLE IF NOT EXISTS campaign_devices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id INTEGER NOT NULL,
+    mac TEXT NOT NULL,
+    vendor TEXT,
+    last_ip TEXT,
+    sources TEXT NOT NULL DEFAULT '',
+    first_seen INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+    last_seen INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+    UNIQUE (campaign_id, mac),
+    FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE CASCADE
+);
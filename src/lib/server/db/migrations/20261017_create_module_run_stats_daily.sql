@@ -0,0 +1,51 @@
+-- Migration 20261017: Daily rollup and retention for module_runs
+-- module_runs grows without bound (stdout/stderr previews, args, resources)
+-- and dashboard queries over recent activity slow down across a multi-week
+-- exercise. tactical/modules/core/retention.py rolls runs older than the
+-- retention window into one row per UTC day and module here, writes the raw
+-- rows (with their spans) to gzip JSONL archives, and deletes them; it can
+-- also prune oldest days first until the DB fits a size budget. Same shape
+-- as signal_stats_hourly / device_stats_daily (migration 001), except
+-- day_timestamp is unix seconds to match module_runs.ran_at.
+
+CREATE TABLE IF NOT EXISTS module_run_stats_daily (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day_timestamp INTEGER NOT NULL,
+    module_name TEXT NOT NULL,
+    run_count INTEGER NOT NULL,
+    failure_count INTEGER NOT NULL,
+    failure_rate REAL NOT NULL,
+    avg_duration_ms REAL,
+    p50_duration_ms REAL,
+    p95_duration_ms REAL,
+    max_duration_ms INTEGER,
+    archive_path TEXT,
+    created_at INTEGER DEFAULT (strftime('%s', 'now') * 1000),
+    UNIQUE(day_timestamp, module_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_module_run_stats_daily_module ON module_run_stats_daily(module_name, day_timestamp);
+
+-- Recent-activity queries filter by module and time together
+CREATE INDEX IF NOT EXISTS idx_module_runs_module_ran_at ON module_runs(module_name, ran_at);
+
+-- Per-day activity across both live and rolled-up runs
+CREATE VIEW IF NOT EXISTS module_run_activity_daily AS
+SELECT
+    day_timestamp,
+    module_name,
+    run_count,
+    failure_count,
+    avg_duration_ms,
+    'rollup' AS source
+FROM module_run_stats_daily
+UNION ALL
+SELECT
+    CAST(ran_at / 86400 AS INTEGER) * 86400 AS day_timestamp,
+    module_name,
+    COUNT(*) AS run_count,
+    SUM(CASE WHEN exit_code IS NULL OR exit_code != 0 THEN 1 ELSE 0 END) AS failure_count,
+    AVG(duration_ms) AS avg_duration_ms,
+    'live' AS source
+FROM module_runs
+GROUP BY CAST(ran_at / 86400 AS INTEGER) * 86400, module_name;
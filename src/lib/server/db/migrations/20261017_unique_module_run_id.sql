@@ -0,0 +1,12 @@
+-- Migration 20261017: One module_runs row per run
+-- module_runner.ts and the Python module both log each run; they now share
+-- a run_id and merge into one row (tactical/modules/core/run_log.py).
+-- Older duplicates keep their latest row, then run_id becomes unique so
+-- either side can upsert on it. NULL run_ids (older rows) are unaffected.
+
+DELETE FROM module_runs
+WHERE run_id IS NOT NULL
+  AND id NOT IN (SELECT MAX(id) FROM module_runs WHERE run_id IS NOT NULL GROUP BY run_id);
+
+DROP INDEX IF EXISTS idx_module_runs_run_id;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_module_runs_run_id ON module_runs(run_id);
@@ -0,0 +1,111 @@
+// Fold of `module_runner.ts wifi_recon --ndjson` output into one result
+//
+// Kept apart from the /api/kismet/recon route so the line handling (chunks
+// split mid-line, oversized records, a run that never printed its summary)
+// can be tested without spawning the module.
+
+export interface ReconResult {
+	status: string;
+	module: string;
+	targets?: unknown[];
+	alerts?: unknown[];
+	summary?: Record<string, unknown>;
+	message?: string;
+	timestamp?: string;
+	[key: string]: unknown;
+}
+
+/** One line of `module_runner.ts wifi_recon --ndjson` output */
+export interface ReconRecord extends ReconResult {
+	type?: 'header' | 'item' | 'summary';
+	key?: string;
+	data?: unknown;
+}
+
+export interface ReconFoldOutcome {
+	/** The folded result, or null when no summary record arrived */
+	result: ReconResult | null;
+	/** Lines dropped for exceeding the per-record byte limit */
+	oversized: number;
+	/** Non-JSON lines skipped */
+	skipped: number;
+}
+
+export interface ReconFold {
+	/** Feed a stdout chunk; complete lines are folded as they arrive */
+	push(chunk: string): void;
+	/** Fold the trailing partial line and return the outcome */
+	end(): ReconFoldOutcome;
+}
+
+/**
+ * Fold one --ndjson record into the result: items are appended to their
+ * key as they arrive, the summary record supplies the envelope fields.
+ */
+export function applyRecord(result: ReconResult, line: string): void {
+	const record = JSON.parse(line) as ReconRecord;
+	if (record.type === 'item' && record.key) {
+		const items = (result[record.key] as unknown[] | undefined) ?? [];
+		items.push(record.data);
+		result[record.key] = items;
+	} else if (record.type === 'summary') {
+		const envelope: Record<string, unknown> = { ...record };
+		delete envelope.type;
+		Object.assign(result, envelope);
+	}
+}
+
+/**
+ * Records are parsed as they arrive; only the current partial line is
+ * buffered, so large target lists are never held as one string. A line
+ * growing past maxLineBytes is dropped rather than buffered.
+ */
+export function createReconFold(maxLineBytes: number): ReconFold {
+	const result: ReconResult = { status: '', module: 'wifi_recon' };
+	let pending = '';
+	let pendingOverflow = false;
+	let sawSummary = false;
+	let oversized = 0;
+	let skipped = 0;
+
+	function handleLine(line: string): void {
+		if (!line.trim()) return;
+		try {
+			applyRecord(result, line);
+			if (result.status) sawSummary = true;
+		} catch {
+			skipped++;
+		}
+	}
+
+	return {
+		push(chunk: string): void {
+			const lines = (pending + chunk).split('\n');
+			const tail = lines.pop() ?? '';
+			// The first completed line is the rest of an oversized record
+			if (pendingOverflow && lines.length > 0) {
+				lines.shift();
+				pendingOverflow = false;
+			}
+			lines.forEach(handleLine);
+			pending = tail;
+			// UTF-8 takes at most 3 bytes per UTF-16 unit, so only a line
+			// past a third of the limit needs its bytes counted
+			if (
+				pending.length > maxLineBytes / 3 &&
+				Buffer.byteLength(pending, 'utf-8') > maxLineBytes
+			) {
+				if (!pendingOverflow) oversized++;
+				pending = '';
+				pendingOverflow = true;
+			}
+		},
+
+		end(): ReconFoldOutcome {
+			if (!pendingOverflow) handleLine(pending);
+			pending = '';
+			pendingOverflow = false;
+			return { result: sawSummary ? result : null, oversized, skipped };
+		}
+	};
+}
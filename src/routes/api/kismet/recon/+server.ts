@@ -4,7 +4,9 @@
  * Bridges the tactical wifi_recon Python module (which reads native .kismet
  * SQLite files directly) into the web UI, providing WPS, beacon fingerprints,
  * retry/error rates, client associations, GPS bounds, frequency maps, and alerts
- * that the standard Kismet REST API does not expose.
+ * that the standard Kismet REST API does not expose. The module runs with
+ * --ndjson so targets are parsed record by record instead of as one
+ * stdout blob capped at 10 MB.
  *
  * GET /api/kismet/recon
  *   ?type=all|ap|client          (default: all)
@@ -24,22 +26,12 @@ import { spawn } from 'child_process';
 import { join } from 'path';
 
 import { createHandler } from '$lib/server/api/create-handler';
+import { createReconFold, type ReconResult } from '$lib/server/kismet/recon-fold';
 import { logger } from '$lib/utils/logger';
 
 const MODULE_RUNNER = join(process.cwd(), 'tactical/modules/module_runner.ts');
 const TIMEOUT_MS = 30_000;
-const MAX_OUTPUT_BYTES = 10_000_000;
-
-interface ReconResult {
-	status: string;
-	module: string;
-	targets?: unknown[];
-	alerts?: unknown[];
-	summary?: Record<string, unknown>;
-	message?: string;
-	timestamp?: string;
-	[key: string]: unknown;
-}
+const MAX_LINE_BYTES = 10_000_000; // per --ndjson record
 
 const VALID_TYPES = /^(all|ap|client)$/i;
 const VALID_SORTS = /^(signal|last_seen|data|packets|clients)$/;
@@ -77,7 +69,9 @@ function applyBoolFlag(args: string[], url: URL, bf: { key: string; flag: string
 }
 
 function buildArgs(url: URL): string[] {
-	const args = ['wifi_recon'];
+	// A dashboard refresh is a read: don't upsert every target into
+	// rf_signals.db (and contend with its writers) on each GET
+	const args = ['wifi_recon', '--no-ingest'];
 	PARAM_RULES.forEach((rule) => applyParamRule(args, url, rule));
 	BOOL_FLAGS.forEach((bf) => applyBoolFlag(args, url, bf));
 	return args;
@@ -85,12 +79,11 @@ function buildArgs(url: URL): string[] {
 
 function runRecon(args: string[]): Promise<ReconResult> {
 	return new Promise((resolvePromise, reject) => {
-		const chunks: Buffer[] = [];
-		let totalBytes = 0;
+		const fold = createReconFold(MAX_LINE_BYTES);
 		let stdoutEnded = false;
 		let exitCode: number | null = null;
 
-		const child = spawn('npx', ['tsx', MODULE_RUNNER, ...args], {
+		const child = spawn('npx', ['tsx', MODULE_RUNNER, ...args, '--ndjson'], {
 			stdio: ['ignore', 'pipe', 'pipe'],
 			cwd: process.cwd(),
 			env: { ...process.env }
@@ -101,36 +94,25 @@ function runRecon(args: string[]): Promise<ReconResult> {
 			reject(new Error('Recon timed out after 30s'));
 		}, TIMEOUT_MS);
 
-		child.stdout.on('data', (chunk: Buffer) => {
-			totalBytes += chunk.length;
-			if (totalBytes <= MAX_OUTPUT_BYTES) chunks.push(chunk);
-		});
+		child.stdout.setEncoding('utf-8');
+		child.stdout.on('data', (chunk: string) => fold.push(chunk));
 
 		child.stderr.on('data', (chunk: Buffer) => {
 			logger.debug(`[recon] ${chunk.toString().trim()}`);
 		});
 
-		function parseStdout(raw: string): ReconResult {
-			const jsonStart = raw.indexOf('{');
-			if (jsonStart === -1) throw new Error('wifi_recon returned no JSON object');
-			return JSON.parse(raw.slice(jsonStart)) as ReconResult;
-		}
-
 		function tryResolve(): void {
 			if (!stdoutEnded || exitCode === null) return;
 			clearTimeout(timer);
+			const { result, oversized, skipped } = fold.end();
 
-			const stdout = Buffer.concat(chunks).toString('utf-8').trim();
-			if (!stdout) {
-				reject(new Error(`wifi_recon exited ${exitCode} with no output`));
+			if (skipped) logger.warn(`[recon] Skipped ${skipped} non-JSON output line(s)`);
+			if (oversized) logger.warn(`[recon] Dropped ${oversized} oversized output record(s)`);
+			if (!result) {
+				reject(new Error(`wifi_recon exited ${exitCode} without a result`));
 				return;
 			}
-
-			try {
-				resolvePromise(parseStdout(stdout));
-			} catch {
-				reject(new Error('wifi_recon returned non-JSON output'));
-			}
+			resolvePromise(result);
 		}
 
 		child.stdout.on('end', () => {
@@ -5,17 +5,18 @@ ad_enum — Active Directory enumeration via enum4linux + netexec.
 CLI deps: enum4linux-ng (installed on Kali), nxc
 
 Enumerates SMB/AD information: users, groups, shares, password policy,
-machines, and domain information.
+machines, and domain information. enum4linux-ng and the four nxc queries
+are independent, so they run concurrently.
 """
 
 import json
 import re
 import time
 
-from base_module import TacticalModule
+from base_module import AsyncTacticalModule
 
 
-class ADEnum(TacticalModule):
+class ADEnum(AsyncTacticalModule):
     name = "ad_enum"
     description = "Active Directory enumeration via enum4linux + netexec"
 
@@ -41,17 +42,16 @@ class ADEnum(TacticalModule):
             help="Enumeration tool (default: both)",
         )
 
-    def run(self, args) -> None:
+    async def run_async(self, args) -> None:
         start = time.monotonic()
         results: dict = {"target": args.target, "tool": args.tool}
 
+        jobs = {}
         if args.tool in ("enum4linux", "both"):
-            e4l_data = self._run_enum4linux(args)
-            results["enum4linux"] = e4l_data
-
+            jobs["enum4linux"] = self._run_enum4linux(args)
         if args.tool in ("nxc", "both"):
-            nxc_data = self._run_nxc(args)
-            results["nxc"] = nxc_data
+            jobs["nxc"] = self._run_nxc(args)
+        results.update(zip(jobs, await self.gather(*jobs.values())))
 
         duration_ms = int((time.monotonic() - start) * 1000)
         results["duration_ms"] = duration_ms
@@ -63,7 +63,7 @@ class ADEnum(TacticalModule):
         )
         self.output_success(results)
 
-    def _run_enum4linux(self, args) -> dict:
+    async def _run_enum4linux(self, args) -> dict:
         """Run enum4linux-ng for SMB enumeration."""
         e4l_args = ["-A", args.target]  # -A = all simple enumeration
 
@@ -72,10 +72,10 @@ class ADEnum(TacticalModule):
         if args.password:
             e4l_args.extend(["-p", args.password])
 
-        result = self.run_tool("enum4linux-ng", e4l_args, timeout=args.timeout)
+        result = await self.run_tool_async("enum4linux-ng", e4l_args, timeout=args.timeout)
         return self._parse_enum4linux(result.stdout)
 
-    def _run_nxc(self, args) -> dict:
+    async def _run_nxc(self, args) -> dict:
         """Run netexec for SMB enumeration."""
         base_args = ["smb", args.target]
         if args.username:
@@ -86,25 +86,17 @@ class ADEnum(TacticalModule):
         if args.domain:
             base_args.extend(["-d", args.domain])
 
-        data: dict = {}
-
-        # Users
-        result = self.run_tool("nxc", base_args + ["--users"], timeout=60)
-        data["users"] = self._parse_nxc_list(result.stdout)
-
-        # Shares
-        result = self.run_tool("nxc", base_args + ["--shares"], timeout=60)
-        data["shares"] = self._parse_nxc_list(result.stdout)
-
-        # Groups
-        result = self.run_tool("nxc", base_args + ["--groups"], timeout=60)
-        data["groups"] = self._parse_nxc_list(result.stdout)
+        users, shares, groups, pass_pol = await self.gather(*(
+            self.run_tool_async("nxc", base_args + [flag], timeout=60)
+            for flag in ("--users", "--shares", "--groups", "--pass-pol")
+        ))
 
-        # Password policy
-        result = self.run_tool("nxc", base_args + ["--pass-pol"], timeout=60)
-        data["password_policy"] = result.stdout[:2000]
-
-        return data
+        return {
+            "users": self._parse_nxc_list(users.stdout),
+            "shares": self._parse_nxc_list(shares.stdout),
+            "groups": self._parse_nxc_list(groups.stdout),
+            "password_policy": pass_pol.stdout[:2000],
+        }
 
     @staticmethod
     def _parse_enum4linux(output: str) -> dict:
@@ -12,11 +12,12 @@ Returns decompiled output paths, class counts, and manifest metadata.
 
 import argparse
 import re
-import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Any
 
-from base_module import TacticalModule
+from base_module import TacticalModule, lazy_import
+
+ET = lazy_import("xml.etree.ElementTree")
 
 # jadx output: "INFO  - done" or class count line
 _JADX_CLASS_RE = re.compile(r"classes:\s*(\d+)", re.IGNORECASE)
@@ -3,28 +3,82 @@
 Tactical Module Base Class — replaces Artemis ArtemisBase (Karton framework).
 
 Provides shared infrastructure for all tactical modules:
-- Structured JSON output (stdout only)
-- CLI tool execution with timeout and capture
-- SQLite DB logging to module_runs table
+- Structured JSON output (stdout only), or ModuleResult via run_collect()
+- json_dumps()/json_loads() on the fastest installed JSON backend
+- CLI tool execution with timeout and capture (buffered or streamed), with
+  each tool in its own supervised process group whose partial output
+  survives timeouts and SIGINT
+- Pooled long-lived tool sessions (r2, recon-ng) reused across runs
+- SQLite DB logging to module_runs table (batched, WAL)
 - Input validation helpers (MAC, IP, interface, port)
-- Common argparse setup
+- Common argparse setup (built lazily) and lazy_import() for heavy deps
+- Exclusive leases on shared hardware (HackRF, WiFi adapters)
+- Per-phase timings (spawn, tool, parse, serialise, db_log) via span()
+- AsyncTacticalModule: run_tool_async()/gather() to overlap independent tools
+- Campaign-scoped host/service/device store shared between modules
+- Bulk upserts of findings into rf_signals devices/signals/networks
+- Consistent read-only snapshots of live databases (Kismet, rf_signals)
+- On-demand cProfile/tracemalloc/py-spy profiling via ARGOS_PROFILE
+- Timeouts and ETAs learned from past runs (--timeout auto)
 
-Every module inherits from TacticalModule and implements run().
+Every module inherits from TacticalModule and implements run(), or from
+AsyncTacticalModule and implements run_async().
 """
 
 import argparse
-import json
+import contextlib
 import logging
 import os
 import re
-import sqlite3
 import subprocess
 import sys
 import time
+import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, TextIO
+
+from core import jsonio
+from core.lazy import lazy_import  # noqa: F401 — re-exported for modules
+from core.spans import SpanRecorder, no_span, timings_mode
+
+if TYPE_CHECKING:
+    import asyncio
+    import sqlite3
+
+    from core.estimator import Estimate
+    from core.process import ToolStream
+    from core.profiling import RunProfiler
+    from core.rf_ingest import RFIngest
+    from core.state_store import CampaignState
+    from core.tool_pool import ToolSession
+
+
+def json_dumps(obj: Any) -> str:
+    """Encode with the fastest installed backend (orjson/msgspec/stdlib, core/jsonio.py)."""
+    return jsonio.dumps(obj)
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Decode with the fastest installed backend; raises json.JSONDecodeError."""
+    return jsonio.loads(data)
+
+
+def _timeout_arg(value: str) -> int | str:
+    """--timeout value: seconds, or "auto" for the learned timeout."""
+    if value == "auto":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected seconds or 'auto', got {value!r}") from None
+
+
+# Format tag in the --ndjson header record; bump on incompatible changes.
+NDJSON_FORMAT = "argos-ndjson/1"
 
 # ── Logging to stderr only (stdout reserved for JSON output) ───────
 logging.basicConfig(
@@ -42,17 +96,60 @@ class TacticalModule(ABC):
     name: str = "unnamed_module"
     description: str = ""
 
+    # Result cache (core/result_cache.py) — set > 0 in deterministic offline
+    # modules to reuse results for identical args and unchanged inputs.
+    cache_ttl: int = 0  # seconds
+
+    # Shared hardware (core/locks.py) held exclusively for the whole run,
+    # e.g. ("hackrf",). Override lease_devices() for per-argument devices.
+    devices: tuple[str, ...] = ()
+
+    # WiFi modules name the argument holding their interface (e.g.
+    # "interface"); the radio behind it is leased along with `devices`.
+    lease_interface_arg: str = ""
+
+    # Modules whose findings belong on the map (core/rf_ingest.py) set this;
+    # it adds --no-ingest to opt a run out.
+    ingests_rf: bool = False
+
     def __init__(self) -> None:
         self.logger = logging.getLogger(self.name)
-        self.parser = argparse.ArgumentParser(
-            prog=self.name,
-            description=self.description,
-        )
-        self._add_common_args()
-        self._add_module_args()
+        self._collecting = False
+        self._parser: argparse.ArgumentParser | None = None
+        self._usage_start: dict[str, Any] | None = None
+        self._run_started = 0.0
+        self._tool_usage: list[dict[str, Any]] = []
+        self._leases: list[Any] = []
+        self._item_sink: TextIO | None = None
+        self._items: dict[str, list[Any]] = {}
+        self._item_counts: dict[str, int] = {}
+        self._spans: SpanRecorder | None = None
+        self._run_id: str | None = None
+        self._span_db: str | None = None
+        self._in_execute = False
+        self._profile_path: str | None = None
+        self._db_path: str | None = None
+        self._partial_tools: list[dict[str, Any]] = []
 
     # ── Argument setup ─────────────────────────────────────────────
 
+    @property
+    def parser(self) -> argparse.ArgumentParser:
+        """
+        The module's argparse parser, built on first use.
+
+        Callers that already hold a Namespace (run_collect from the daemon
+        or another module) never pay for building it.
+        """
+        if self._parser is None:
+            self._parser = argparse.ArgumentParser(
+                prog=self.name,
+                description=self.description,
+            )
+            self._add_common_args()
+            self._add_module_args()
+        return self._parser
+
     def _add_common_args(self) -> None:
         """Add args shared by all modules."""
         self.parser.add_argument(
@@ -62,9 +159,10 @@ class TacticalModule(ABC):
         )
         self.parser.add_argument(
             "--timeout",
-            type=int,
-            default=120,
-            help="Execution timeout in seconds (default: 120)",
+            type=_timeout_arg,
+            help="Execution timeout in seconds, or 'auto' to derive it from past runs "
+                 "of this module on similar-sized input (default: 120; "
+                 "auto when $ARGOS_ADAPTIVE_TIMEOUT=1)",
         )
         self.parser.add_argument(
             "--json",
@@ -72,6 +170,40 @@ class TacticalModule(ABC):
             default=True,
             help="Output JSON (always true, kept for compatibility)",
         )
+        self.parser.add_argument(
+            "--ndjson",
+            action="store_true",
+            help="Stream newline-delimited JSON: header, one record per item, summary",
+        )
+        self.parser.add_argument(
+            "--campaign-id",
+            type=int,
+            dest="campaign_id",
+            help="Campaign whose shared host/service state to read and update "
+                 "(default: $ARGOS_CAMPAIGN_ID, or the campaign of $ARGOS_ENGAGEMENT_ID)",
+        )
+        if self.ingests_rf:
+            self.parser.add_argument(
+                "--no-ingest",
+                action="store_true",
+                dest="no_ingest",
+                help="Don't record findings in rf_signals.db devices/signals/networks",
+            )
+        if self.cache_ttl > 0:
+            self.parser.add_argument(
+                "--no-cache",
+                action="store_true",
+                dest="no_cache",
+                help=f"Ignore cached results and re-run the tool (cache TTL: {self.cache_ttl}s)",
+            )
+        if self.devices or type(self).lease_devices is not TacticalModule.lease_devices:
+            self.parser.add_argument(
+                "--lock-timeout",
+                type=int,
+                default=600,
+                dest="lock_timeout",
+                help="Seconds to queue for busy hardware before giving up (default: 600)",
+            )
 
     def _add_module_args(self) -> None:
         """Override in subclass to add module-specific args."""
@@ -87,28 +219,74 @@ class TacticalModule(ABC):
     # ── JSON output ────────────────────────────────────────────────
 
     def output_success(self, data: dict[str, Any]) -> None:
-        """Print success JSON to stdout and exit 0."""
-        result = {
-            "status": "success",
-            "module": self.name,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            **data,
-        }
-        print(json.dumps(result, default=str))
-        sys.exit(0)
+        """Print success JSON to stdout and exit 0 (raises ModuleExit under run_collect)."""
+        if self._item_sink is not None:
+            data = {**data, "streamed": dict(self._item_counts)}
+        elif self._items:
+            data = {**data, **{k: v for k, v in self._items.items() if k not in data}}
+        self._finish(ModuleResult(
+            status="success",
+            module=self.name,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            data=data,
+        ))
 
     def output_error(self, message: str, details: dict[str, Any] | None = None) -> None:
-        """Print error JSON to stdout and exit 1."""
-        result = {
-            "status": "error",
-            "module": self.name,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "message": message,
-        }
-        if details:
-            result["details"] = details
-        print(json.dumps(result, default=str))
-        sys.exit(1)
+        """Print error JSON to stdout and exit 1 (raises ModuleExit under run_collect)."""
+        self._finish(ModuleResult(
+            status="error",
+            module=self.name,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            message=message,
+            details=details or None,
+        ))
+
+    def _finish(self, result: "ModuleResult") -> None:
+        """Hand a result back to run_collect(), or print it and exit when run standalone."""
+        if not self._collecting:
+            print(json_dumps(result.to_envelope()))
+        raise ModuleExit(result)
+
+    # ── Streaming results (--ndjson) ───────────────────────────────
+
+    @property
+    def streaming(self) -> bool:
+        """True when items go straight to stdout as NDJSON records."""
+        return self._item_sink is not None
+
+    def emit_item(self, key: str, item: Any) -> None:
+        """
+        Report one result item under `key` (e.g. "targets", "entries").
+
+        With --ndjson the item is written immediately as
+        {"type": "item", "key": key, "data": item} and not kept; the summary
+        record counts items per key under "streamed". Otherwise items are
+        collected and output_success() adds them to the envelope as
+        data[key], so both modes carry the same information.
+        """
+        if self._item_sink is None:
+            self._items.setdefault(key, []).append(item)
+            return
+        self._item_counts[key] = self._item_counts.get(key, 0) + 1
+        self._write_record({"type": "item", "key": key, "data": item})
+
+    def emit_items(self, key: str, items: Iterable[Any]) -> None:
+        """emit_item() for each of items."""
+        for item in items:
+            self.emit_item(key, item)
+
+    def _write_record(self, record: dict[str, Any], flush: bool = False) -> None:
+        if self._item_sink is None:
+            return
+        if self._spans is not None:
+            start = time.perf_counter()
+            line = json_dumps(record)
+            self._spans.add("serialise", time.perf_counter() - start)
+        else:
+            line = json_dumps(record)
+        self._item_sink.write(line + "\n")
+        if flush:
+            self._item_sink.flush()
 
     # ── Extended validation helpers ────────────────────────────────
 
@@ -149,40 +327,54 @@ class TacticalModule(ABC):
         env: dict[str, str] | None = None,
     ) -> tuple[str, str]:
         """
-        Execute a long-running CLI tool via Popen with duration-limited capture.
+        Execute a long-running CLI tool with duration-limited capture.
         Sends SIGTERM after duration seconds, SIGKILL after 5s grace.
-        Returns (stdout, stderr) strings.
+        Returns (stdout, stderr) strings — everything the tool wrote,
+        including when it was interrupted (see `interrupted`).
         """
-        import signal
-
-        cmd = [binary] + args
-        self.logger.info("Running (Popen, %ds): %s", duration, " ".join(cmd))
-        merged_env = {**os.environ, **(env or {})}
+        stream = self._start_tool(binary, args, duration, env, raw=True, mode="Popen")
+        return stream.collect()
 
-        try:
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=merged_env,
-                preexec_fn=os.setsid,
-            )
-        except FileNotFoundError:
-            self.output_error(f"Tool not found: {binary}. Is it installed?")
-            return "", ""  # unreachable
+    def stream_tool(
+        self,
+        binary: str,
+        args: list[str],
+        duration: int = 60,
+        env: dict[str, str] | None = None,
+        raw: bool = False,
+    ) -> "ToolStream":
+        """
+        Start a long-running CLI tool and return a ToolStream over its output.
 
-        try:
-            stdout, stderr = proc.communicate(timeout=duration)
-        except subprocess.TimeoutExpired:
-            os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
-            try:
-                stdout, stderr = proc.communicate(timeout=5)
-            except subprocess.TimeoutExpired:
-                os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
-                stdout, stderr = proc.communicate(timeout=5)
+        Iterating yields ("stdout" | "stderr", line) pairs as the tool
+        produces them (raw=True yields bytes chunks instead of lines).
+        Same duration/SIGTERM/SIGKILL policy as run_tool_popen(); read
+        returncode and timed_out from the stream once iteration ends.
+        """
+        return self._start_tool(binary, args, duration, env, raw=raw, mode="stream")
 
-        return stdout, stderr
+    def run_tool_stream(
+        self,
+        binary: str,
+        args: list[str],
+        on_stdout: Callable[[Any], None],
+        on_stderr: Callable[[Any], None] | None = None,
+        duration: int = 60,
+        env: dict[str, str] | None = None,
+        raw: bool = False,
+    ) -> "ToolStream":
+        """
+        Callback flavour of stream_tool(): feed each stdout line to on_stdout
+        and each stderr line to on_stderr (stderr is dropped if None).
+        Returns the finished ToolStream for returncode/timed_out/bytes_read.
+        """
+        stream = self.stream_tool(binary, args, duration=duration, env=env, raw=raw)
+        for stream_name, payload in stream:
+            if stream_name == "stdout":
+                on_stdout(payload)
+            elif on_stderr is not None:
+                on_stderr(payload)
+        return stream
 
     def run_tool(
         self,
@@ -190,35 +382,213 @@ class TacticalModule(ABC):
         args: list[str],
         timeout: int | None = None,
         env: dict[str, str] | None = None,
+        partial: bool = False,
     ) -> subprocess.CompletedProcess[str]:
         """
-        Execute a CLI tool safely via subprocess.run().
+        Execute a CLI tool to completion and capture its output.
         No shell=True — arguments passed as list (no injection).
+
+        A tool still running after timeout seconds (default 120) is stopped
+        the way run_tool_popen() stops it. By default that is an error whose
+        details keep the partial output (tails inline, full text in the
+        artifact store). With partial=True — for line-oriented output the
+        module can still parse — the partial CompletedProcess is returned
+        instead and the envelope's `partial` block records the cut-off.
         """
+        timeout = timeout or 120
+        stream = self._start_tool(binary, args, timeout, env, raw=True)
+        stdout, stderr = stream.collect()
+        return self._tool_result(binary, args, timeout, stream, stdout, stderr, partial)
+
+    def _tool_result(
+        self,
+        binary: str,
+        args: list[str],
+        timeout: int,
+        stream: "ToolStream",
+        stdout: str,
+        stderr: str,
+        partial: bool,
+    ) -> subprocess.CompletedProcess[str]:
+        """run_tool()'s outcome for a collected stream: CompletedProcess or output_error()."""
         cmd = [binary] + args
-        self.logger.info("Running: %s", " ".join(cmd))
+        if stream.timed_out:
+            self._note_partial(binary, stream)
+        if stream.partial and not partial:
+            reason = f"timed out after {timeout}s" if stream.timed_out else "interrupted"
+            self.output_error(
+                f"Tool {reason}: {binary}",
+                {"command": " ".join(cmd), "partial_output": self._keep_partial_output(stdout, stderr)},
+            )
+        returncode = stream.returncode if stream.returncode is not None else -1
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
 
+    def _start_tool(
+        self,
+        binary: str,
+        args: list[str],
+        duration: float,
+        env: dict[str, str] | None,
+        raw: bool,
+        mode: str = "",
+    ) -> "ToolStream":
+        """Spawn binary in its own process group, supervised by a ToolStream (core/process.py)."""
+        from core.process import ToolStream
+
+        cmd = [binary] + args
+        if mode:
+            self.logger.info("Running (%s, %ds): %s", mode, duration, " ".join(cmd))
+        else:
+            self.logger.info("Running: %s", " ".join(cmd))
         merged_env = {**os.environ, **(env or {})}
-        timeout = timeout or 120
 
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                env=merged_env,
-            )
-            return result
+            with self.span("spawn"):
+                proc = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    bufsize=0,
+                    env=merged_env,
+                    start_new_session=True,
+                )
         except FileNotFoundError:
             self.output_error(f"Tool not found: {binary}. Is it installed?")
             raise  # unreachable after output_error exits
-        except subprocess.TimeoutExpired:
-            self.output_error(
-                f"Tool timed out after {timeout}s: {binary}",
-                {"command": " ".join(cmd)},
-            )
-            raise
+
+        # The tool's lifetime overlaps the caller's parsing of its output
+        started = time.perf_counter()
+
+        def on_exit(usage: dict[str, Any]) -> None:
+            self._tool_exited(binary, started, usage)
+            # Running out a capture duration is normal; being interrupted is not
+            if stream.interrupted:
+                self._note_partial(binary, stream)
+
+        stream = ToolStream(proc, duration, raw=raw, on_exit=on_exit)
+        return stream
+
+    # ── Partial results ────────────────────────────────────────────
+
+    @property
+    def interrupted(self) -> bool:
+        """
+        True once the runner sent SIGINT. Running tools have been asked to
+        stop and hand back what they have; modules looping over many
+        targets should stop starting new work and report results so far.
+        """
+        from core.process import interrupt_requested
+
+        return interrupt_requested()
+
+    def _note_partial(self, binary: str, stream: "ToolStream") -> None:
+        """Record a tool that was stopped early, for the envelope's `partial` block."""
+        self._partial_tools.append({
+            "binary": binary,
+            "reason": "interrupted" if stream.interrupted else "timeout",
+            "returncode": stream.returncode,
+            "stdout_bytes": stream.bytes_read["stdout"],
+            "stderr_bytes": stream.bytes_read["stderr"],
+        })
+
+    def _keep_partial_output(self, stdout: str, stderr: str) -> dict[str, Any]:
+        """
+        Error details for the output of a tool that was stopped: each
+        stream's tail inline, and the full text in the artifact store
+        (core/artifacts.py) when the run has a DB path to put it beside.
+        """
+        from core.artifacts import PREVIEW_CHARS, ArtifactStore, default_root
+
+        kept: dict[str, Any] = {}
+        for name, text in (("stdout", stdout), ("stderr", stderr)):
+            kept[f"{name}_chars"] = len(text)
+            kept[f"{name}_tail"] = text[-PREVIEW_CHARS:]
+            if len(text) > PREVIEW_CHARS and self._db_path:
+                try:
+                    kept[f"{name}_artifact"] = ArtifactStore(default_root(self._db_path)).put(text)
+                except OSError as e:
+                    self.logger.warning("Failed to keep partial %s: %s", name, e)
+        return kept
+
+    def tool_session(
+        self,
+        key: tuple[Any, ...],
+        factory: Callable[[], "ToolSession"],
+    ) -> "ToolSession | None":
+        """
+        Return the pooled long-lived session for key, starting it with factory().
+
+        Sessions outlive the run (see core/tool_pool.py), so under the daemon
+        the next query on the same input skips the tool's start-up and
+        analysis. Returns None when the session cannot be started; callers
+        fall back to run_tool().
+        """
+        from core.tool_pool import ToolSessionError, get_pool
+
+        try:
+            session = get_pool().session(key, factory)
+        except (OSError, ToolSessionError) as exc:
+            self.logger.warning("No %s session (%s); using one-shot runs", key[0], exc)
+            return None
+        self.logger.info("Using %s session (%d commands so far)", key[0], session.commands)
+        return session
+
+    # ── Campaign state ─────────────────────────────────────────────
+
+    def campaign_state(self, args: argparse.Namespace) -> "CampaignState | None":
+        """
+        The shared host/service/device store for this run's campaign
+        (core/state_store.py), or None for a run outside any campaign.
+        Discovery modules record what they find; later modules read it
+        to skip hosts and ports already characterised.
+        """
+        from core.state_store import CampaignState, resolve_campaign
+
+        db_path = getattr(args, "db_path", None)
+        if not db_path or not Path(db_path).exists():
+            return None
+        campaign_id = resolve_campaign(db_path, getattr(args, "campaign_id", None))
+        if campaign_id is None:
+            return None
+        return CampaignState(db_path, campaign_id)
+
+    # ── Snapshot reads ─────────────────────────────────────────────
+
+    @contextlib.contextmanager
+    def snapshot_db(
+        self, db_path: str, mode: str = "auto", cache_ttl: float = 0,
+    ) -> Iterator["sqlite3.Connection"]:
+        """
+        Read-only connection to a point-in-time view of a database another
+        process is writing (core/snapshot.py): a pinned WAL read
+        transaction, or a backup-API copy that is reused for cache_ttl
+        seconds (longer while the source is unchanged). Long analytical
+        queries then neither hold off Kismet or the Node server nor wait
+        on them.
+        """
+        from core.snapshot import open_snapshot
+
+        with contextlib.ExitStack() as stack:
+            with self.span("snapshot"):
+                conn = stack.enter_context(open_snapshot(db_path, mode=mode, cache_ttl=cache_ttl))
+            yield conn
+
+    # ── RF ingest ──────────────────────────────────────────────────
+
+    def rf_ingest(self, args: argparse.Namespace) -> "RFIngest | None":
+        """
+        Batch writer for this run's devices, signals and networks in
+        rf_signals.db (core/rf_ingest.py), or None with --no-ingest or
+        no DB. One ingest() call is one transaction of executemany()
+        upserts, so a run's findings land together.
+        """
+        from core.rf_ingest import RFIngest
+
+        db_path = getattr(args, "db_path", None)
+        if getattr(args, "no_ingest", False) or not db_path or not Path(db_path).exists():
+            return None
+        return RFIngest(db_path, source=self.name)
 
     # ── DB logging ─────────────────────────────────────────────────
 
@@ -232,28 +602,72 @@ class TacticalModule(ABC):
         stderr: str,
         duration_ms: int,
         engagement_id: int | None = None,
-    ) -> int | None:
-        """Log a module execution to the module_runs table. Returns row ID."""
+    ) -> bool:
+        """
+        Queue a module execution for the module_runs table.
+
+        Full stdout/stderr are archived in the compressed, content-addressed
+        artifact store (core/artifacts.py); the row keeps a short preview
+        plus the artifact key, and the run's resource usage so far as JSON.
+        Rows go through the process-wide batched writer in core/run_log.py
+        (one WAL connection, background flush, flushed again at exit).
+        Without an explicit engagement_id, ARGOS_ENGAGEMENT_ID (set by
+        core/scheduler.py) links the row. The row carries this run's run_id,
+        which module_run_spans rows refer to. Returns True if the row was
+        accepted.
+        """
         if not db_path or not Path(db_path).exists():
             self.logger.warning("DB not found at %s, skipping log", db_path)
-            return None
+            return False
 
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.execute(
-                """INSERT INTO module_runs
-                   (engagement_id, module_name, args, exit_code, stdout, stderr, duration_ms)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (engagement_id, module_name, args_json, exit_code,
-                 stdout[:10000], stderr[:10000], duration_ms),
+        with self.span("db_log"):
+            return self._submit_run(
+                db_path, module_name, args_json, exit_code, stdout, stderr, duration_ms, engagement_id,
             )
-            conn.commit()
-            row_id = cursor.lastrowid
-            conn.close()
-            return row_id
-        except sqlite3.Error as e:
-            self.logger.warning("Failed to log run to DB: %s", e)
-            return None
+
+    def _submit_run(
+        self,
+        db_path: str,
+        module_name: str,
+        args_json: str,
+        exit_code: int,
+        stdout: str,
+        stderr: str,
+        duration_ms: int,
+        engagement_id: int | None,
+    ) -> bool:
+        from core.artifacts import store_output
+        from core.estimator import size_key
+        from core.run_log import get_writer
+
+        try:
+            stdout_preview, stdout_key = store_output(db_path, stdout)
+            stderr_preview, stderr_key = store_output(db_path, stderr)
+        except OSError as e:
+            self.logger.warning("Failed to archive run output, keeping preview only: %s", e)
+            stdout_preview, stdout_key = stdout[:10000], None
+            stderr_preview, stderr_key = stderr[:10000], None
+
+        if engagement_id is None and os.environ.get("ARGOS_ENGAGEMENT_ID", "").isdigit():
+            engagement_id = int(os.environ["ARGOS_ENGAGEMENT_ID"])
+
+        resources = self._resources_so_far()
+        self._span_db = db_path
+        return get_writer(db_path).submit({
+            "engagement_id": engagement_id,
+            "module_name": module_name,
+            "args": args_json,
+            "exit_code": exit_code,
+            "stdout": stdout_preview,
+            "stderr": stderr_preview,
+            "duration_ms": duration_ms,
+            "stdout_artifact": stdout_key,
+            "stderr_artifact": stderr_key,
+            "resources": json_dumps(resources) if resources else None,
+            "run_id": self._run_id,
+            "profile_path": self._profile_path,
+            "input_size": size_key(args_json),
+        })
 
     # ── Input validation helpers ───────────────────────────────────
 
@@ -338,15 +752,83 @@ class TacticalModule(ABC):
         """Implement module logic. Call output_success() or output_error() when done."""
         ...
 
-    def execute(self) -> None:
-        """Parse args and run the module with timing and error handling."""
-        args = self.parser.parse_args()
-        start = time.monotonic()
+    def run_collect(
+        self,
+        args: argparse.Namespace | list[str] | None = None,
+        run_id: str | None = None,
+    ) -> "ModuleResult":
+        """
+        Run the module in-process and return its ModuleResult without exiting.
+
+        args is either a parsed Namespace or an argv list (parsed with this
+        module's parser; argparse errors become an error result). Batch
+        drivers, the module daemon and other modules call this instead of
+        spawning `python3 <module>.py`. run_id is the caller's id for this
+        run (module_runner.ts), so its module_runs row and ours merge;
+        a fresh one is made if not given.
+        """
+        if not isinstance(args, argparse.Namespace):
+            try:
+                args = self.parser.parse_args(args)
+            except SystemExit as e:
+                return self._error_result(
+                    f"Invalid arguments for {self.name}", exit_code=e.code or 2,
+                )
 
+        cache_key = self._cache_lookup_key(args)
+        if cache_key:
+            cached = self._cache_get(args, cache_key)
+            if cached is not None:
+                return cached
+
+        from core.usage import snapshot
+
+        self._spans = SpanRecorder() if timings_mode() != "off" else None
+        self._run_id = run_id or uuid.uuid4().hex
+        self._span_db = None
+        self._run_started = time.monotonic()
+        self._usage_start = snapshot()
+        self._tool_usage = []
+        self._items = {}
+        self._item_counts = {}
+        self._leases = []
+        self._db_path = getattr(args, "db_path", None)
+        self._partial_tools = []
+        self._resolve_timeout(args)
+        profiler = self._start_profiler(args)
+        result = self._run_guarded(args)
+        if profiler is not None:
+            result.profile = profiler.stop()
+            self.logger.info("Profile written to %s", result.profile["path"])
+        result.resources = self._resources_so_far()
+        if self._partial_tools or self.interrupted:
+            result.partial = {"interrupted": self.interrupted, "tools": list(self._partial_tools)}
+        self._usage_start = None
+        # A run cut short is not the answer to cache for these args
+        if cache_key and result.ok and result.partial is None:
+            self._cache_put(args, cache_key, result)
+        if self._spans is not None:
+            result.timings = self._spans.summary()
+            # execute() persists after timing the envelope's serialisation
+            if not self._in_execute:
+                self._persist_spans()
+        return result
+
+    def _run_guarded(self, args: argparse.Namespace) -> "ModuleResult":
+        """Call run() and turn every way it can end into a ModuleResult."""
+        start = time.monotonic()
+        self._collecting = True
         try:
-            self.run(args)
-        except SystemExit:
-            raise  # Let output_success/output_error exit cleanly
+            with self._hold_devices(args):
+                self.run(args)
+        except ModuleExit as e:
+            return e.result
+        except SystemExit as e:
+            # A module (or library it uses) called sys.exit() directly
+            return self._error_result(
+                f"Module exited with code {e.code} and no result",
+                exit_code=e.code if isinstance(e.code, int) and e.code else 1,
+            )
         except Exception as e:
             self.logger.exception("Unhandled exception in %s", self.name)
             duration_ms = int((time.monotonic() - start) * 1000)
@@ -356,11 +838,542 @@ class TacticalModule(ABC):
                 self.log_run(
                     args.db_path,
                     self.name,
-                    json.dumps(vars(args), default=str),
+                    json_dumps(vars(args)),
                     1,
                     "",
                     str(e),
                     duration_ms,
                 )
 
-            self.output_error(f"Unhandled error: {type(e).__name__}: {e}")
+            return self._error_result(f"Unhandled error: {type(e).__name__}: {e}")
+        finally:
+            self._collecting = False
+
+        return self._error_result("Module returned without calling output_success/output_error")
+
+    # ── Hardware leases ────────────────────────────────────────────
+
+    def lease_devices(self, args: argparse.Namespace) -> list[str]:
+        """
+        Devices to hold for this run: the `devices` attribute, plus the
+        radio behind the `lease_interface_arg` interface if set.
+        """
+        devices = list(self.devices)
+        if self.lease_interface_arg:
+            devices.append(self.wifi_adapter(getattr(args, self.lease_interface_arg)))
+        return devices
+
+    def wifi_adapter(self, interface: str) -> str:
+        """
+        Lease name for the radio behind a WiFi interface (wlan1 and wlan1mon
+        share one). A bad or missing interface is an error here, before the
+        run queues for a lease it could never use.
+        """
+        from core.locks import wifi_adapter
+
+        if not self.validate_interface(interface):
+            self.output_error(f"Invalid interface: {interface}")
+        if not self.check_interface_exists(interface):
+            self.output_error(
+                f"Interface {interface} does not exist. "
+                "Run 'airmon-ng start <iface>' to create a monitor interface."
+            )
+        return wifi_adapter(interface)
+
+    @contextlib.contextmanager
+    def hold_device(self, device: str, timeout: float = 600) -> Iterator[None]:
+        """
+        Hold one device exclusively, queueing behind other modules using it.
+
+        Calls output_error() if it is still busy after timeout seconds.
+        Wait and hold times are reported under resources.leases.
+        """
+        from core.locks import DeviceLease, LeaseTimeout
+
+        try:
+            lease = DeviceLease(device, owner=self.name, timeout=timeout)
+            lease.acquire()
+        except LeaseTimeout as e:
+            self.output_error(str(e), {"device": device, "holder": e.holder})
+        except OSError as e:
+            self.output_error(f"Cannot lock {device}: {e}")
+        if lease.wait_ms:
+            self.logger.info("Waited %dms for %s", lease.wait_ms, device)
+        self._leases.append(lease)
+        try:
+            yield
+        finally:
+            lease.release()
+
+    @contextlib.contextmanager
+    def _hold_devices(self, args: argparse.Namespace) -> Iterator[None]:
+        """Hold every device from lease_devices() around run()."""
+        timeout = getattr(args, "lock_timeout", 600)
+        with contextlib.ExitStack() as stack:
+            for device in self.lease_devices(args):
+                stack.enter_context(self.hold_device(device, timeout))
+            yield
+
+    # ── Resource accounting ────────────────────────────────────────
+
+    def _record_tool_usage(self, binary: str, usage: dict[str, Any]) -> None:
+        """Attach a reaped tool's CPU/RSS/io counters to the current run."""
+        if usage:
+            self._tool_usage.append({"binary": binary, **usage})
+
+    def _resources_so_far(self) -> dict[str, Any] | None:
+        """
+        CPU time, peak RSS and I/O since run_collect() started this run.
+
+        "module" is this Python process, "children" every tool process
+        reaped so far, "tools" the per-process breakdown for tools started
+        through the run_tool*()/stream_tool() helpers.
+        """
+        if self._usage_start is None:
+            return None
+
+        from core.usage import usage_since
+
+        return {
+            "wall_ms": int((time.monotonic() - self._run_started) * 1000),
+            **usage_since(self._usage_start),
+            "tools": list(self._tool_usage),
+            **({"leases": [lease.metrics() for lease in self._leases]} if self._leases else {}),
+        }
+
+    # ── Phase timings ──────────────────────────────────────────────
+
+    def span(self, name: str) -> contextlib.AbstractContextManager[None]:
+        """
+        Time a phase of this run, e.g. `with self.span("parse"): ...`.
+
+        Spans land in the envelope's `timings` (see core/spans.py). Tool
+        spawn/runtime, NDJSON serialisation and log_run() are timed by the
+        base class; modules wrap their own parsing and post-processing.
+        With ARGOS_TIMINGS=off this is a shared no-op context.
+        """
+        if self._spans is None:
+            return no_span()
+        return self._spans.span(name)
+
+    def _tool_exited(self, binary: str, started: float, usage: dict[str, Any]) -> None:
+        """ToolStream exit hook: resource usage plus the tool's lifetime as a "tool" span."""
+        self._record_tool_usage(binary, usage)
+        if self._spans is not None:
+            self._spans.add_span("tool", started, time.perf_counter() - started)
+
+    def _serialise_envelope(self, envelope: dict[str, Any]) -> str:
+        """JSON for the final envelope, with its own serialisation counted in timings."""
+        if self._spans is None or "timings" not in envelope:
+            return json_dumps(envelope)
+        envelope = {k: v for k, v in envelope.items() if k != "timings"}
+        start = time.perf_counter()
+        body = json_dumps(envelope)
+        self._spans.add_span("serialise", start, time.perf_counter() - start)
+        # Spliced in afterwards so the timings include the dump above
+        return f'{body[:-1]},"timings":{json_dumps(self._spans.summary())}}}'
+
+    def _persist_spans(self) -> None:
+        """With ARGOS_TIMINGS=db, queue this run's spans for module_run_spans."""
+        if self._spans is None or self._span_db is None or timings_mode() != "db":
+            return
+
+        from core.run_log import get_writer
+
+        writer = get_writer(self._span_db)
+        for row in self._spans.rows(self._run_id or "", self.name):
+            writer.submit(row, table="module_run_spans")
+
+    # ── Profiling ──────────────────────────────────────────────────
+
+    def _start_profiler(self, args: argparse.Namespace) -> "RunProfiler | None":
+        """Start the ARGOS_PROFILE profiler for this run, if one is requested (core/profiling.py)."""
+        self._profile_path = None
+        if not os.environ.get("ARGOS_PROFILE"):
+            return None
+
+        from core.profiling import RunProfiler, profile_dir, profile_mode
+
+        mode = profile_mode()
+        if mode is None:
+            return None
+        profiler = RunProfiler(mode, profile_dir(args.db_path), f"{self.name}-{self._run_id}")
+        if not profiler.start():
+            return None
+        self._profile_path = str(profiler.path)
+        return profiler
+
+    # ── Adaptive timeout ───────────────────────────────────────────
+
+    def estimate(self, args: argparse.Namespace) -> "Estimate":
+        """
+        Expected duration and suggested timeout for this invocation, from
+        past module_runs of this module on similar-sized input
+        (core/estimator.py). Estimate.progress(elapsed_s) gives an ETA.
+        """
+        from core.estimator import estimate
+
+        return estimate(getattr(args, "db_path", "") or "", self.name, args)
+
+    def _resolve_timeout(self, args: argparse.Namespace) -> None:
+        """Settle --timeout to seconds: as given, learned ("auto"), or the default."""
+        if not hasattr(args, "timeout") or args.timeout not in (None, "auto"):
+            return
+
+        from core.estimator import DEFAULT_TIMEOUT_S, adaptive_enabled
+
+        if args.timeout is None and not adaptive_enabled():
+            args.timeout = DEFAULT_TIMEOUT_S
+            return
+        est = self.estimate(args)
+        args.timeout = est.timeout_s
+        if est.samples:
+            self.logger.info(
+                "Timeout %ds from %d past runs (%s, p50 %.1fs, p95 %.1fs)",
+                est.timeout_s, est.samples, est.input_size or "any size",
+                (est.p50_ms or 0) / 1000, (est.p95_ms or 0) / 1000,
+            )
+
+    # ── Result cache ───────────────────────────────────────────────
+
+    def cache_inputs(self, args: argparse.Namespace) -> list[str] | None:
+        """
+        Files whose content determines this invocation's result.
+
+        Override in cacheable modules. Return None when this particular
+        invocation must not be cached (live capture, side-effect outputs).
+        """
+        return []
+
+    def cache_hit_valid(self, args: argparse.Namespace, data: dict[str, Any]) -> bool:
+        """Override to reject a cached result whose side effects are gone (e.g. output dir)."""
+        return True
+
+    def _cache_lookup_key(self, args: argparse.Namespace) -> str | None:
+        """Return the cache key for args, or None if this run is not cacheable."""
+        # Streamed items never reach the result, so there is nothing to cache
+        if self.cache_ttl <= 0 or getattr(args, "no_cache", False) or self.streaming:
+            return None
+        inputs = self.cache_inputs(args)
+        if inputs is None:
+            return None
+
+        from core.result_cache import cache_key
+
+        try:
+            return cache_key(self.name, vars(args), inputs)
+        except OSError as e:
+            # Missing input — let run() report it properly
+            self.logger.debug("Not caching %s: %s", self.name, e)
+            return None
+
+    def _cache_get(self, args: argparse.Namespace, key: str) -> "ModuleResult | None":
+        from core.result_cache import ResultCache, default_root
+
+        entry = ResultCache(default_root(args.db_path)).get(key, self.cache_ttl)
+        if entry is None or not self.cache_hit_valid(args, entry["data"]):
+            return None
+        self.logger.info("Cache hit for %s (%.0fs old)", self.name, time.time() - entry["created"])
+        return ModuleResult(
+            status="success",
+            module=self.name,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            data={**entry["data"], "cached": True},
+        )
+
+    def _cache_put(self, args: argparse.Namespace, key: str, result: "ModuleResult") -> None:
+        from core.result_cache import ResultCache, default_root
+
+        try:
+            ResultCache(default_root(args.db_path)).put(key, result.data)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning("Failed to cache %s result: %s", self.name, e)
+
+    def _error_result(self, message: str, exit_code: int = 1) -> "ModuleResult":
+        return ModuleResult(
+            status="error",
+            module=self.name,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            message=message,
+            exit_code=exit_code,
+        )
+
+    def execute(self, argv: list[str] | None = None) -> None:
+        """
+        CLI entry point: parse args, run the module, print the JSON envelope
+        and exit with its status code.
+
+        argv defaults to sys.argv[1:]. Built on run_collect(), so standalone
+        and in-process runs produce identical envelopes.
+
+        With --ndjson, stdout is instead a header record (with the run's
+        learned duration `estimate` when there is history), the items
+        passed to emit_item() as they are produced, then {"type":
+        "summary", **envelope}.
+
+        SIGINT drains running tools and the run finishes with the output
+        they produced, flagged under `partial`; SIGTERM stops the tools
+        before exiting (core/process.py).
+
+        Under module_runner.ts, the run takes the runner's ARGOS_RUN_ID and
+        its module_runs rows go back over the ARGOS_RUN_LOG_FD pipe for the
+        runner to write with its own (core/run_log.py). Both are taken out
+        of the environment so tools started by the module do not inherit them.
+        """
+        from core.process import install_signal_handlers
+
+        install_signal_handlers()
+        run_id = os.environ.pop("ARGOS_RUN_ID", None) or None
+        runner_fd = os.environ.pop("ARGOS_RUN_LOG_FD", "")
+        if runner_fd.isdigit():
+            from core.run_log import use_runner_pipe
+
+            use_runner_pipe(int(runner_fd))
+        args = self.parser.parse_args(argv)
+        if args.ndjson:
+            self._item_sink = sys.stdout
+            header = {
+                "type": "header",
+                "format": NDJSON_FORMAT,
+                "module": self.name,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            # Lets a consumer show an ETA/progress bar while items stream in
+            est = self.estimate(args)
+            if est.p50_ms is not None:
+                header["estimate"] = est.to_dict()
+            self._write_record(header, flush=True)
+        self._in_execute = True
+        result = self.run_collect(args, run_id=run_id)
+        envelope = result.to_envelope()
+        if self._item_sink is not None:
+            envelope = {"type": "summary", **envelope}
+        print(self._serialise_envelope(envelope), flush=True)
+        self._persist_spans()
+        sys.exit(result.exit_code)
+
+
+# ── Async modules ──────────────────────────────────────────────────
+
+
+class AsyncTacticalModule(TacticalModule):
+    """
+    TacticalModule whose logic is a coroutine, for modules whose work
+    splits into independent tool runs or queries:
+
+        async def run_async(self, args):
+            users, shares = await self.gather(
+                self.run_tool_async("nxc", base + ["--users"], timeout=60),
+                self.run_tool_async("nxc", base + ["--shares"], timeout=60),
+            )
+
+    run() drives run_async() on a fresh event loop, so execute(),
+    run_collect() and the daemon treat it like any other module; total
+    latency is the slowest part rather than the sum.
+    """
+
+    @abstractmethod
+    async def run_async(self, args: argparse.Namespace) -> None:
+        """Implement module logic. Call output_success() or output_error() when done."""
+        ...
+
+    def run(self, args: argparse.Namespace) -> None:
+        import asyncio
+
+        asyncio.run(self.run_async(args))
+
+    async def run_tool_async(
+        self,
+        binary: str,
+        args: list[str],
+        timeout: int | None = None,
+        env: dict[str, str] | None = None,
+        partial: bool = False,
+    ) -> subprocess.CompletedProcess[str]:
+        """
+        run_tool() as a coroutine. The tool runs under the same supervisor
+        (core/process.py) with its output collected on a worker thread, so
+        timeouts, partial output, SIGINT draining and usage accounting are
+        unchanged. Cancelling the coroutine stops the tool's process group.
+        """
+        import asyncio
+
+        timeout = timeout or 120
+        stream = self._start_tool(binary, args, timeout, env, raw=True)
+        collect = asyncio.ensure_future(asyncio.to_thread(stream.collect))
+        try:
+            stdout, stderr = await asyncio.shield(collect)
+        except asyncio.CancelledError:
+            stream.terminate()
+            with contextlib.suppress(Exception):
+                await collect
+            raise
+        return self._tool_result(binary, args, timeout, stream, stdout, stderr, partial)
+
+    async def gather(
+        self,
+        *aws: Awaitable[Any],
+        timeout: float | None = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """
+        Run awaitables concurrently and return their results in order.
+
+        Unlike asyncio.gather(), the first failure cancels the others
+        (stopping their tools) before it is raised, and after timeout
+        seconds anything still running is cancelled and TimeoutError
+        raised. With return_exceptions=True, failures and timed-out
+        entries are returned in place instead. output_error() from any of
+        them always ends the run.
+        """
+        import asyncio
+
+        tasks = [asyncio.ensure_future(_contain_exit(aw)) for aw in aws]
+        if not tasks:
+            return []
+        try:
+            done, pending = await asyncio.wait(
+                tasks,
+                timeout=timeout,
+                return_when=asyncio.ALL_COMPLETED if return_exceptions else asyncio.FIRST_EXCEPTION,
+            )
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
+            raise
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        errors = [_task_error(t) if t in done else None for t in tasks]
+        for exc in errors:
+            if isinstance(exc, _SubtaskExit):
+                raise exc.exit
+        if not return_exceptions:
+            for exc in errors:
+                if exc is not None:
+                    raise exc
+            if pending:
+                raise TimeoutError(f"{len(pending)} of {len(tasks)} tasks still running after {timeout}s")
+            return [t.result() for t in tasks]
+
+        return [
+            TimeoutError(f"Still running after {timeout}s") if t in pending
+            else exc if exc is not None
+            else t.result()
+            for t, exc in zip(tasks, errors)
+        ]
+
+
+class _SubtaskExit(Exception):
+    """Carries a ModuleExit out of a gather() task as an ordinary exception."""
+
+    def __init__(self, exit: "ModuleExit") -> None:
+        super().__init__(str(exit.result.message))
+        self.exit = exit
+
+
+def _task_error(task: "asyncio.Future[Any]") -> BaseException | None:
+    import asyncio
+
+    return asyncio.CancelledError() if task.cancelled() else task.exception()
+
+
+async def _contain_exit(aw: Awaitable[Any]) -> Any:
+    # A SystemExit escaping a task stops the event loop mid-gather instead
+    # of propagating to the awaiting coroutine
+    try:
+        return await aw
+    except ModuleExit as e:
+        raise _SubtaskExit(e) from None
+
+
+# ── In-process results ─────────────────────────────────────────────
+
+
+@dataclass
+class ModuleResult:
+    """
+    Outcome of one module run — the data behind the JSON envelope.
+
+    to_envelope() yields exactly what output_success/output_error print:
+    {status, module, timestamp, **data} or {status, module, timestamp,
+    message, details?}, plus `resources` (CPU, peak RSS, I/O) and
+    `timings` (per-phase spans) when the run went through run_collect(),
+    `profile` (paths and top-N) when ARGOS_PROFILE was set, and
+    `partial` when tools were stopped early and the result is built from
+    what they produced.
+    """
+
+    status: str
+    module: str
+    timestamp: str
+    data: dict[str, Any] = field(default_factory=dict)
+    message: str = ""
+    details: dict[str, Any] | None = None
+    exit_code: int = -1
+    resources: dict[str, Any] | None = None
+    timings: dict[str, Any] | None = None
+    profile: dict[str, Any] | None = None
+    partial: dict[str, Any] | None = None
+
+    def __post_init__(self) -> None:
+        if self.exit_code == -1:
+            self.exit_code = 0 if self.status == "success" else 1
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "success"
+
+    def to_envelope(self) -> dict[str, Any]:
+        """Build the CLI JSON envelope for this result."""
+        envelope: dict[str, Any] = {
+            "status": self.status,
+            "module": self.module,
+            "timestamp": self.timestamp,
+        }
+        if self.ok:
+            envelope.update(self.data)
+        else:
+            envelope["message"] = self.message
+            if self.details:
+                envelope["details"] = self.details
+        if self.resources:
+            envelope["resources"] = self.resources
+        if self.timings:
+            envelope["timings"] = self.timings
+        if self.profile:
+            envelope["profile"] = self.profile
+        if self.partial:
+            envelope["partial"] = self.partial
+        return envelope
+
+    def raise_for_status(self) -> "ModuleResult":
+        """Return self on success, raise ModuleError on failure (for chaining)."""
+        if not self.ok:
+            raise ModuleError(self)
+        return self
+
+
+class ModuleError(Exception):
+    """Raised by ModuleResult.raise_for_status() when a composed module fails."""
+
+    def __init__(self, result: ModuleResult) -> None:
+        super().__init__(f"{result.module}: {result.message}")
+        self.result = result
+
+
+class ModuleExit(SystemExit):
+    """
+    Raised by output_success/output_error to stop run() with a result.
+
+    Subclasses SystemExit so `except Exception` blocks inside modules cannot
+    swallow it, and so a module run outside execute()/run_collect() still
+    exits with the right code.
+    """
+
+    def __init__(self, result: ModuleResult) -> None:
+        super().__init__(result.exit_code)
+        self.result = result
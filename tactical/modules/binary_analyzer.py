@@ -35,6 +35,8 @@ class BinaryAnalyzer(TacticalModule):
         "signature scanning, entropy analysis, and optional extraction."
     )
 
+    cache_ttl = 86400
+
     def _add_module_args(self) -> None:
         self.parser.add_argument(
             "--file",
@@ -160,6 +162,10 @@ class BinaryAnalyzer(TacticalModule):
             return []
         return [str(p) for p in extract_dir.rglob("*") if p.is_file()]
 
+    def cache_inputs(self, args: argparse.Namespace) -> list[str] | None:
+        """Scans depend only on the file; extraction writes files, so it always re-runs."""
+        return None if args.extract else [args.file]
+
     def run(self, args: argparse.Namespace) -> None:
         """Execute binwalk analysis and parse results."""
         self._validate_args(args)
@@ -0,0 +1,8 @@
+"""
+Shared runtime support for tactical modules.
+
+base_module.py is the public surface every module inherits from; the
+heavier machinery behind it (subprocess streaming, DB writers, caches,
+schedulers) lives in this package so the base class stays readable and
+modules that never touch a subsystem never import it.
+"""
@@ -0,0 +1,115 @@
+"""
+Content-addressed artifact store for full module stdout/stderr.
+
+module_runs used to keep only the first 10,000 characters of each stream,
+which throws away most of an nmap XML report, tshark JSON dump or Kismet
+export and still bloats rf_signals.db with raw text. Full outputs now go
+to compressed files keyed by their SHA-256; module_runs keeps the key plus
+a short preview.
+
+Layout: <root>/<first two hex chars>/<sha256>.<zst|gz>. zstd is used when
+the `zstandard` package is installed, gzip otherwise; reads accept either.
+Identical outputs (repeated scans of an unchanged target) are stored once.
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # optional — gzip fallback
+    zstandard = None
+
+# Outputs at or below this size are kept inline in module_runs only.
+PREVIEW_CHARS = 2000
+
+KEY_PREFIX = "sha256:"
+
+# Favour speed over ratio: artifacts are written on the module's exit path.
+_ZSTD_LEVEL = 3
+_GZIP_LEVEL = 1
+
+
+def default_root(db_path: str) -> Path:
+    """Artifact directory for a DB: $ARGOS_ARTIFACT_DIR or <db dir>/module_artifacts."""
+    override = os.environ.get("ARGOS_ARTIFACT_DIR")
+    if override:
+        return Path(override)
+    return Path(db_path).resolve().parent / "module_artifacts"
+
+
+class ArtifactStore:
+    """Write-once, deduplicated, compressed blobs addressed by SHA-256."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def put(self, data: str | bytes) -> str:
+        """Store data (if not already present) and return its key."""
+        raw = data.encode("utf-8", errors="replace") if isinstance(data, str) else data
+        digest = hashlib.sha256(raw).hexdigest()
+        if self._find(digest) is not None:
+            return KEY_PREFIX + digest
+
+        if zstandard is not None:
+            ext = "zst"
+            blob = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+        else:
+            ext = "gz"
+            blob = gzip.compress(raw, compresslevel=_GZIP_LEVEL, mtime=0)
+
+        target = self._path(digest, ext)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent writers of the same output never
+        # expose a half-written file.
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return KEY_PREFIX + digest
+
+    def get(self, key: str) -> bytes:
+        """Return the decompressed bytes for key. Raises KeyError if unknown."""
+        digest = key.removeprefix(KEY_PREFIX)
+        path = self._find(digest)
+        if path is None:
+            raise KeyError(key)
+        blob = path.read_bytes()
+        if path.suffix == ".gz":
+            return gzip.decompress(blob)
+        if zstandard is None:
+            raise RuntimeError(f"Artifact {key} is zstd-compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(blob)
+
+    def get_text(self, key: str) -> str:
+        """Return the artifact decoded as UTF-8."""
+        return self.get(key).decode("utf-8", errors="replace")
+
+    def _path(self, digest: str, ext: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.{ext}"
+
+    def _find(self, digest: str) -> Path | None:
+        for ext in ("zst", "gz"):
+            path = self._path(digest, ext)
+            if path.exists():
+                return path
+        return None
+
+
+def store_output(db_path: str, text: str) -> tuple[str, str | None]:
+    """
+    Split a stream into (preview, artifact_key) for module_runs.
+
+    Short outputs are returned whole with no artifact; longer ones are
+    archived in full and only the first PREVIEW_CHARS stay in the row.
+    """
+    if len(text) <= PREVIEW_CHARS:
+        return text, None
+    return text[:PREVIEW_CHARS], ArtifactStore(default_root(db_path)).put(text)
@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Tactical module daemon — long-lived workers that run modules in-process.
+
+Every module_runner.ts call normally pays for a fresh python3 interpreter
+plus re-importing argparse, sqlite3, requests, dnspython, scapy... which
+costs hundreds of ms per call on the Pi 5. The daemon imports the
+TacticalModule subclasses once and then serves newline-delimited JSON
+requests, either on stdin/stdout or on a Unix socket:
+
+    request:  {"id": 1, "module": "port_scanner", "args": ["--target", "10.0.0.1"],
+               "timeout_ms": 120000, "run_id": "<optional, see core/run_log.py>",
+               "env": {"ARGOS_ENGAGEMENT_ID": "3", "ARGOS_TIMINGS": "summary"}}
+    response: {"id": 1, "exit_code": 0, "duration_ms": 842, "stderr": "...",
+               "result": {<the same envelope output_success/output_error print>}}
+
+    {"id": 2, "op": "stats"} returns counters for shared subsystems such as
+    the batched module_runs writer (rows written/dropped, flush latency)
+    and the pooled tool sessions (core/tool_pool.py) kept warm between requests.
+
+Usage:
+    python3 tactical/modules/core/daemon.py                      # one worker, stdin/stdout
+    python3 tactical/modules/core/daemon.py --socket /run/argos/tactical.sock --workers 2
+
+Modules run through TacticalModule.run_collect(), so no JSON is re-parsed.
+"env" carries the caller's ARGOS_* settings (engagement/campaign ids,
+ARGOS_PROFILE, ARGOS_TIMINGS, ...) that a spawned module would inherit;
+they replace the worker's own ARGOS_* variables for the request. A worker
+serves one request at a time: per-request stdout/stderr capture and env
+swap process-global state. On a socket the daemon is a dispatcher in
+front of --workers such worker processes (this script on stdin/stdout),
+so one long nmap or hydra run does not hold up every other caller:
+
+  - A request's deadline is timeout_ms after it arrives. One still waiting
+    for a free worker at its deadline, or whose client has hung up, is
+    dropped without running.
+  - At the deadline the worker drains the run as the runner's SIGINT does
+    (core/process.py): tools are stopped, the module reports what it has
+    with a `partial` block. Nothing is raised into module code, so
+    transactions, locks and run_collect()'s cleanup are never cut short.
+  - A worker still busy DRAIN_GRACE seconds after the deadline is
+    terminated (taking its tool groups with it) and replaced.
+"""
+
+import argparse
+import contextlib
+import importlib
+import inspect
+import io
+import logging
+import os
+import queue
+import select
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, TextIO
+
+MODULES_DIR = Path(__file__).resolve().parent.parent
+if str(MODULES_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULES_DIR))
+
+from base_module import ModuleResult, TacticalModule  # noqa: E402
+from core import jsonio  # noqa: E402
+from core.process import install_signal_handlers, request_interrupt, reset_interrupt  # noqa: E402
+
+logger = logging.getLogger("module_daemon")
+
+_MODULE_NAME_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789_")
+_NOT_MODULES = {"base_module"}
+# Set by module_runner.ts for a spawned module only (core/run_log.py)
+_RUNNER_ONLY_ENV = {"ARGOS_RUN_ID", "ARGOS_RUN_LOG_FD"}
+
+DEFAULT_WORKERS = 2
+# Seconds past a request's deadline before its worker is replaced, and
+# from SIGTERM to SIGKILL (module_runner.ts DRAIN_GRACE_MS/KILL_GRACE_MS)
+DRAIN_GRACE = 10.0
+KILL_GRACE = 5.0
+# How often a queued request checks its deadline and client
+QUEUE_POLL = 0.5
+
+
+class ModuleRegistry:
+    """Imports tactical modules once and hands out their TacticalModule classes."""
+
+    def __init__(self) -> None:
+        self._classes: dict[str, type[TacticalModule]] = {}
+        self._failures: dict[str, str] = {}
+
+    @staticmethod
+    def available() -> list[str]:
+        """Names of every module file in tactical/modules/."""
+        return sorted(
+            p.stem for p in MODULES_DIR.glob("*.py")
+            if p.stem not in _NOT_MODULES and not p.stem.startswith("_")
+        )
+
+    def preload(self, names: list[str]) -> None:
+        """Import the given modules up front, logging (not raising) on failure."""
+        start = time.monotonic()
+        for name in names:
+            try:
+                self.get(name)
+            except LookupError as e:
+                logger.warning("Preload skipped %s: %s", name, e)
+        logger.info(
+            "Preloaded %d/%d modules in %dms",
+            len(self._classes), len(names), int((time.monotonic() - start) * 1000),
+        )
+
+    def get(self, name: str) -> type[TacticalModule]:
+        """Return the TacticalModule subclass defined in <name>.py."""
+        if name in self._classes:
+            return self._classes[name]
+        if name in self._failures:
+            raise LookupError(self._failures[name])
+        if not name or not set(name) <= _MODULE_NAME_CHARS or name in _NOT_MODULES:
+            raise LookupError(f"Invalid module name: {name!r}")
+        if not (MODULES_DIR / f"{name}.py").exists():
+            raise LookupError(f"Module not found: {name}")
+
+        try:
+            mod = importlib.import_module(name)
+        except Exception as e:  # ImportError for missing tool libs, SyntaxError, ...
+            self._failures[name] = f"Failed to import {name}: {type(e).__name__}: {e}"
+            raise LookupError(self._failures[name]) from e
+
+        for obj in vars(mod).values():
+            if (
+                inspect.isclass(obj)
+                and issubclass(obj, TacticalModule)
+                and obj is not TacticalModule
+                and obj.__module__ == mod.__name__
+                and not inspect.isabstract(obj)
+            ):
+                self._classes[name] = obj
+                return obj
+
+        self._failures[name] = f"No TacticalModule subclass in {name}.py"
+        raise LookupError(self._failures[name])
+
+
+def _error_envelope(module: str, message: str) -> dict[str, Any]:
+    """Build an envelope shaped like TacticalModule.output_error()."""
+    return ModuleResult(
+        status="error",
+        module=module,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        message=message,
+    ).to_envelope()
+
+
+def _bad_request(message: str) -> dict[str, Any]:
+    return {
+        "id": None,
+        "exit_code": 1,
+        "duration_ms": 0,
+        "stderr": "",
+        "result": _error_envelope("module_daemon", f"Bad request: {message}"),
+    }
+
+
+@contextlib.contextmanager
+def _request_env(env: Any) -> Iterator[None]:
+    """Make env the process's ARGOS_* variables while a request runs."""
+    saved = {k: v for k, v in os.environ.items() if k.startswith("ARGOS_")}
+    wanted = {
+        str(k): str(v) for k, v in (env if isinstance(env, dict) else {}).items()
+        if str(k).startswith("ARGOS_") and k not in _RUNNER_ONLY_ENV
+    }
+    for key in saved:
+        del os.environ[key]
+    os.environ.update(wanted)
+    try:
+        yield
+    finally:
+        for key in wanted:
+            os.environ.pop(key, None)
+        os.environ.update(saved)
+
+
+def _on_alarm(signum: int, frame: Any) -> None:
+    logger.warning("Request deadline reached; draining the module")
+    request_interrupt()
+
+
+def handle_request(registry: ModuleRegistry, request: dict[str, Any]) -> dict[str, Any]:
+    """Run one module invocation in-process and return the response frame."""
+    req_id = request.get("id")
+    name = str(request.get("module", "")).removesuffix(".py")
+    argv = [str(a) for a in request.get("args", [])]
+    timeout_ms = int(request.get("timeout_ms") or 0)
+    start = time.monotonic()
+
+    def respond(exit_code: int, result: dict[str, Any], stderr: str = "") -> dict[str, Any]:
+        return {
+            "id": req_id,
+            "exit_code": exit_code,
+            "duration_ms": int((time.monotonic() - start) * 1000),
+            "stderr": stderr,
+            "result": result,
+        }
+
+    try:
+        module_cls = registry.get(name)
+    except LookupError as e:
+        return respond(1, _error_envelope(name or "module_daemon", str(e)))
+
+    stderr_buf = io.StringIO()
+    # Module loggers write through the root handler bound to the real stderr
+    # at import time, so capture them with a per-request handler instead.
+    log_handler = logging.StreamHandler(stderr_buf)
+    log_handler.setFormatter(logging.Formatter(
+        "%(asctime)s [%(name)s] %(levelname)s: %(message)s", datefmt="%H:%M:%S",
+    ))
+    root = logging.getLogger()
+    root.addHandler(log_handler)
+
+    reset_interrupt()
+    if timeout_ms > 0:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout_ms / 1000)
+    try:
+        # Modules only report through run_collect(); anything they print to
+        # stdout directly must not corrupt the protocol stream.
+        with _request_env(request.get("env")), \
+                contextlib.redirect_stdout(stderr_buf), contextlib.redirect_stderr(stderr_buf):
+            result = module_cls().run_collect(argv, run_id=request.get("run_id") or None)
+    finally:
+        if timeout_ms > 0:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        root.removeHandler(log_handler)
+
+    return respond(result.exit_code, result.to_envelope(), stderr_buf.getvalue())
+
+
+def handle_stats(request: dict[str, Any]) -> dict[str, Any]:
+    """Report the daemon's shared subsystems (module_runs writer, warm tool sessions)."""
+    from core.run_log import all_stats
+    from core.tool_pool import get_pool
+
+    return {"id": request.get("id"), "stats": {"run_log": all_stats(), "tool_pool": get_pool().stats()}}
+
+
+def serve_stream(registry: ModuleRegistry, reader: TextIO, writer: TextIO) -> None:
+    """Serve newline-delimited JSON requests from reader until EOF."""
+    for line in reader:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = jsonio.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            response = _bad_request(str(e))
+        else:
+            if request.get("op") == "stats":
+                response = handle_stats(request)
+            else:
+                response = handle_request(registry, request)
+        writer.write(jsonio.dumps(response) + "\n")
+        writer.flush()
+
+
+# ── Worker pool (socket mode) ──────────────────────────────────────
+
+
+def _client_gone(conn: socket.socket) -> bool:
+    """True once the caller has closed its end (a readable socket with nothing to read)."""
+    try:
+        readable, _, _ = select.select([conn], [], [], 0)
+        return bool(readable) and not conn.recv(1, socket.MSG_PEEK)
+    except OSError:
+        return True
+
+
+class Worker:
+    """One worker process: this script serving requests on stdin/stdout."""
+
+    def __init__(self, preload: str) -> None:
+        self.proc = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--preload", preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._buffer = b""
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def request(self, line: str, deadline: float | None) -> bytes | None:
+        """Send one request line; its response line, or None if the worker died or overran deadline."""
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        try:
+            self.proc.stdin.write(line.encode() + b"\n")
+            self.proc.stdin.flush()
+        except OSError:
+            return None
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buffer:
+            wait = None if deadline is None else deadline - time.monotonic()
+            if wait is not None and wait <= 0:
+                return None
+            readable, _, _ = select.select([fd], [], [], wait)
+            if not readable:
+                return None
+            chunk = os.read(fd, 64 * 1024)
+            if not chunk:
+                return None
+            self._buffer += chunk
+        response, _, self._buffer = self._buffer.partition(b"\n")
+        return response
+
+    def stop(self) -> None:
+        """SIGTERM (the worker stops its tool groups on the way out), then SIGKILL."""
+        if self.alive():
+            self.proc.terminate()
+            try:
+                self.proc.wait(KILL_GRACE)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        for pipe in (self.proc.stdin, self.proc.stdout):
+            if pipe is not None:
+                with contextlib.suppress(OSError):
+                    pipe.close()
+
+
+class WorkerPool:
+    """A fixed number of Workers shared by the socket's connections."""
+
+    def __init__(self, size: int, preload: str) -> None:
+        self._preload = preload
+        self._idle: queue.Queue[Worker] = queue.Queue()
+        self._all: set[Worker] = set()
+        self._lock = threading.Lock()
+        self._stats = {"workers": size, "busy": 0, "queued": 0, "served": 0, "dropped": 0, "replaced": 0}
+        for _ in range(size):
+            self._add(Worker(preload))
+
+    def _add(self, worker: Worker) -> None:
+        with self._lock:
+            self._all.add(worker)
+        self._idle.put(worker)
+
+    def _replace(self, worker: Worker) -> None:
+        worker.stop()
+        with self._lock:
+            self._all.discard(worker)
+            self._stats["replaced"] += 1
+        self._add(Worker(self._preload))
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _acquire(self, deadline: float | None, conn: socket.socket) -> Worker | str:
+        """An idle worker, or why the request is dropped ("deadline", "client")."""
+        self._count("queued")
+        try:
+            while True:
+                wait = QUEUE_POLL if deadline is None else min(QUEUE_POLL, deadline - time.monotonic())
+                if wait <= 0:
+                    return "deadline"
+                try:
+                    worker = self._idle.get(timeout=wait)
+                except queue.Empty:
+                    if _client_gone(conn):
+                        return "client"
+                    continue
+                if not worker.alive():
+                    logger.warning("Worker %d exited; replacing it", worker.proc.pid)
+                    self._replace(worker)
+                    continue
+                if _client_gone(conn):
+                    self._idle.put(worker)
+                    return "client"
+                return worker
+        finally:
+            self._count("queued", -1)
+
+    def dispatch(self, request: dict[str, Any], conn: socket.socket) -> bytes | None:
+        """Run request on a worker: its response line, or None to drop it (client gone)."""
+        start = time.monotonic()
+        timeout_ms = int(request.get("timeout_ms") or 0)
+        deadline = start + timeout_ms / 1000 if timeout_ms > 0 else None
+        name = str(request.get("module") or request.get("op") or "")
+
+        worker = self._acquire(deadline, conn)
+        if isinstance(worker, str):
+            self._count("dropped")
+            if worker == "client":
+                logger.info("Dropped %s request: client disconnected while queued", name)
+                return None
+            logger.warning("Dropped %s request: no worker free within %dms", name, timeout_ms)
+            return self._failure(request, start, f"No daemon worker free within {timeout_ms}ms")
+
+        self._count("busy")
+        try:
+            if deadline is not None:
+                # The worker drains at what is left of the deadline
+                request = {**request, "timeout_ms": max(1, int((deadline - time.monotonic()) * 1000))}
+            response = worker.request(jsonio.dumps(request), None if deadline is None else deadline + DRAIN_GRACE)
+        finally:
+            self._count("busy", -1)
+
+        if response is None:
+            reason = f"Module timed out after {timeout_ms}ms" if worker.alive() else "Daemon worker exited"
+            logger.warning("%s (%s); replacing worker %d", reason, name, worker.proc.pid)
+            self._replace(worker)
+            return self._failure(request, start, reason)
+        self._idle.put(worker)
+        self._count("served")
+        return response
+
+    @staticmethod
+    def _failure(request: dict[str, Any], start: float, message: str) -> bytes:
+        return jsonio.dumps({
+            "id": request.get("id"),
+            "exit_code": 1,
+            "duration_ms": int((time.monotonic() - start) * 1000),
+            "stderr": "",
+            "result": _error_envelope(str(request.get("module") or "module_daemon"), message),
+        }).encode()
+
+    def close(self) -> None:
+        with self._lock:
+            workers = list(self._all)
+            self._all.clear()
+        for worker in workers:
+            worker.stop()
+
+
+def serve_socket(socket_path: str, workers: int, preload: str) -> None:
+    """Serve requests on a Unix socket, each connection in its own thread, through a WorkerPool."""
+    pool = WorkerPool(workers, preload)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    request = jsonio.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    response = jsonio.dumps(_bad_request(str(e))).encode()
+                else:
+                    response = pool.dispatch(request, self.connection)
+                    if response is None:
+                        return
+                    if request.get("op") == "stats":
+                        framed = jsonio.loads(response)
+                        framed.setdefault("stats", {})["pool"] = pool.stats()
+                        response = jsonio.dumps(framed).encode()
+                try:
+                    self.wfile.write(response + b"\n")
+                except OSError:
+                    return
+
+    path = Path(socket_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.is_socket():
+        path.unlink()
+
+    try:
+        with socketserver.ThreadingUnixStreamServer(str(path), Handler) as server:
+            server.daemon_threads = True
+            os.chmod(path, 0o660)
+            logger.info("Listening on %s with %d workers", path, workers)
+            try:
+                server.serve_forever()
+            finally:
+                path.unlink(missing_ok=True)
+    finally:
+        pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="module_daemon",
+        description="Serve tactical module invocations from a warm interpreter.",
+    )
+    parser.add_argument(
+        "--socket",
+        default="",
+        help="Unix socket path to listen on (default: serve stdin/stdout)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Worker processes behind --socket (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--preload",
+        default="all",
+        help="Comma-separated modules to import at startup, 'all' or 'none' (default: all)",
+    )
+    opts = parser.parse_args()
+
+    if opts.socket:
+        # The dispatcher imports no modules; each worker preloads its own
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        serve_socket(opts.socket, max(1, opts.workers), opts.preload)
+        return
+
+    # Keep the real stdout for protocol frames; anything else written to
+    # fd 1 (module prints at import, C extensions) goes to stderr.
+    protocol = io.TextIOWrapper(os.fdopen(os.dup(1), "wb"), encoding="utf-8", write_through=True)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    registry = ModuleRegistry()
+    if opts.preload == "all":
+        registry.preload(registry.available())
+    elif opts.preload != "none":
+        registry.preload([n.strip() for n in opts.preload.split(",") if n.strip()])
+
+    # SIGINT drains the running module, SIGTERM stops its tools and exits
+    install_signal_handlers()
+    serve_stream(registry, sys.stdin, protocol)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Adaptive timeouts and ETAs learned from past module_runs durations.
+
+Every module gets the same fixed timeout (--timeout 120, DEFAULT_TIMEOUT_MS
+in module_runner.ts) whether it is scanning one host or a /16, so large
+jobs are cut off and small ones hang for minutes when a tool wedges.
+module_runs already records how long each run took; this module turns
+that history into a duration distribution per module and coarse input
+size, and derives a timeout and ETA from it:
+
+    size feature   from                                       e.g.
+    seconds        --duration (capture-bound modules)         seconds:16
+    mhz            --freq-start/--freq-end span                mhz:1024
+    probes         hosts (--target/--range CIDR) × --ports     probes:262144
+    hosts          --target/--range/--targets/--host           hosts:256
+    ports          --ports / --top-ports                      ports:1024
+    bytes          --file/--image/--input-file/--pcap-file…    bytes:1048576
+
+Sizes are bucketed to the next power of two. The estimate comes from the
+run's own bucket when it has MIN_SAMPLES successful runs, else from the
+nearest buckets of the same feature scaled linearly by size, else from
+all of the module's runs; with no history the fixed default stands.
+Failed runs are left out: they end early or at the old timeout, which
+says nothing about how long the work takes. Runs that core/retention.py
+has rolled out of module_runs still count: when the remaining raw history
+is too thin, the module's daily p50/p95 in module_run_stats_daily are
+averaged (weighted by successful runs) with it. TacticalModule stores the
+feature with each row (module_runs.input_size) so file sizes are those
+at run time; rows without it (module_runner.ts, older rows) are keyed
+from their args.
+
+    --timeout auto / ARGOS_ADAPTIVE_TIMEOUT=1   module applies the estimate
+    --runner-timeout auto                        module_runner.ts does too
+    "timeout": "auto"                            per job in core/scheduler.py
+
+The --ndjson header and the scheduler's job records carry the estimate
+(p50/p95/ETA) so callers can show progress. From the command line:
+
+    python3 tactical/modules/core/estimator.py port_scanner --target 10.0.0.0/24
+    python3 tactical/modules/core/estimator.py port_scanner --elapsed 40 -- --target 10.0.0.5
+"""
+
+import argparse
+import contextlib
+import io
+import ipaddress
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+MODULES_DIR = Path(__file__).resolve().parent.parent
+if str(MODULES_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULES_DIR))
+
+DEFAULT_TIMEOUT_S = 120
+MIN_SAMPLES = 5
+HISTORY_LIMIT = 500  # most recent successful runs per module
+MARGIN = 1.5  # timeout = p95 × MARGIN + SLACK_S
+SLACK_S = 10
+MIN_TIMEOUT_S = 30
+MAX_TIMEOUT_S = 6 * 3600
+ROLLUP_DAYS = 90  # most recent rolled-up days per module
+HISTORY_TTL = 60.0  # seconds a module's history is reused (daemon workers)
+BUSY_TIMEOUT_MS = 5000
+
+_HOST_KEYS = ("range", "target", "targets", "host")
+_FILE_KEYS = (
+    "file", "image", "input_file", "pcap_file", "read_file", "apk",
+    "hash_file", "wordlist", "password_file", "users_file",
+)
+
+_history: dict[tuple[str, str], tuple[float, list[tuple[str | None, str | None, int]]]] = {}
+_rollups: dict[tuple[str, str], tuple[float, list[tuple[int, float, float, int | None]]]] = {}
+_history_lock = threading.Lock()
+_parsers: dict[str, argparse.ArgumentParser | None] = {}
+
+
+def adaptive_enabled() -> bool:
+    """True when ARGOS_ADAPTIVE_TIMEOUT asks every run to use the learned timeout."""
+    return os.environ.get("ARGOS_ADAPTIVE_TIMEOUT", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+# ── Input size ─────────────────────────────────────────────────────
+
+
+def _module_parser(module: str) -> argparse.ArgumentParser | None:
+    """The module's own argparse parser, so argv gets the defaults it would run with."""
+    if module not in _parsers:
+        from core.daemon import ModuleRegistry
+
+        try:
+            _parsers[module] = ModuleRegistry().get(module)().parser
+        except LookupError:
+            _parsers[module] = None
+    return _parsers[module]
+
+
+def normalise_args(args: Any, module: str | None = None) -> dict[str, Any]:
+    """
+    Module args as a dict keyed like argparse dests, from a Namespace,
+    a vars() dict, an argv list (module_runner.ts rows, scheduler jobs)
+    or their JSON. An argv list is parsed with module's parser when it
+    is given, so defaults the module fills in (--top-ports 1000,
+    --duration 15) count toward the size like they do for its own rows.
+    """
+    if isinstance(args, (str, bytes)):
+        try:
+            args = json.loads(args)
+        except ValueError:
+            return {}
+    if isinstance(args, argparse.Namespace):
+        return vars(args)
+    if isinstance(args, dict):
+        return args
+    if not isinstance(args, list):
+        return {}
+
+    argv = [str(a) for a in args]
+    parser = _module_parser(module) if module else None
+    if parser is not None:
+        try:
+            with contextlib.redirect_stderr(io.StringIO()):
+                return vars(parser.parse_known_args(argv)[0])
+        except SystemExit:
+            pass  # missing required args; fall back to the raw flags
+
+    parsed: dict[str, Any] = {}
+    i = 0
+    while i < len(argv):
+        token = argv[i]
+        i += 1
+        if not token.startswith("--") or " " in token:
+            continue
+        key, eq, value = token[2:].partition("=")
+        key = key.replace("-", "_")
+        if eq:
+            parsed[key] = value
+        elif i < len(argv) and (not argv[i].startswith("--") or " " in argv[i]):
+            # "--ports '--top-ports 100'" keeps its value
+            parsed[key] = argv[i]
+            i += 1
+        else:
+            parsed[key] = True
+    return parsed
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _host_count(value: Any) -> int:
+    """Addresses named by a target spec: CIDR, a.b.c.d-e range, or a list."""
+    if not isinstance(value, str) or not value.strip():
+        return 0
+    total = 0
+    for part in value.replace(",", " ").split():
+        if "/" in part:
+            try:
+                total += ipaddress.ip_network(part, strict=False).num_addresses
+                continue
+            except ValueError:
+                pass
+        head, dash, tail = part.rpartition("-")
+        if dash and tail.isdigit() and head.count(".") == 3:
+            start = head.rsplit(".", 1)[-1]
+            if start.isdigit():
+                total += max(1, int(tail) - int(start) + 1)
+                continue
+        total += 1
+    return total
+
+
+def _port_count(ports: Any, top_ports: Any = None) -> int:
+    """Ports named by a spec such as "22,80,1000-2000", "T:22,U:53" or "--top-ports 100"."""
+    top = _number(top_ports)
+    if top:
+        return int(top)
+    if not isinstance(ports, str) or not ports.strip():
+        return 0
+    spec = ports.strip()
+    if spec.startswith("--top-ports"):
+        n = _number(spec.split()[-1])
+        return int(n) if n else 0
+    if spec == "-":
+        return 65535
+    total = 0
+    for part in spec.split(","):
+        part = part.split(":", 1)[-1].strip()
+        low, dash, high = part.partition("-")
+        if dash:
+            lo, hi = _number(low or 1), _number(high or 65535)
+            if lo is not None and hi is not None and hi >= lo:
+                total += int(hi - lo) + 1
+        elif _number(part) is not None:
+            total += 1
+    return total
+
+
+def input_size(args: Any, module: str | None = None) -> tuple[str, float] | None:
+    """The run's coarse size feature as (kind, amount), or None if it has none."""
+    a = normalise_args(args, module)
+
+    duration = _number(a.get("duration"))
+    if duration and duration > 0:
+        return ("seconds", duration)
+
+    start, end = _number(a.get("freq_start")), _number(a.get("freq_end"))
+    if start is not None and end is not None and end > start:
+        return ("mhz", (end - start) / 1e6)
+
+    hosts = max((_host_count(a.get(k)) for k in _HOST_KEYS), default=0)
+    ports = _port_count(a.get("ports"), a.get("top_ports"))
+    if hosts and ports:
+        return ("probes", hosts * ports)
+    if hosts > 1:
+        return ("hosts", hosts)
+    if ports:
+        return ("ports", ports)
+
+    for key in _FILE_KEYS:
+        path = a.get(key)
+        if isinstance(path, str) and path:
+            try:
+                return ("bytes", os.path.getsize(path))
+            except OSError:
+                continue
+
+    return ("hosts", hosts) if hosts else None
+
+
+def _bucket(amount: float) -> int:
+    return 1 if amount <= 1 else 2 ** math.ceil(math.log2(amount))
+
+
+def size_key(args: Any, module: str | None = None) -> str | None:
+    """Bucketed size feature, e.g. "hosts:256" — the module_runs.input_size value."""
+    size = input_size(args, module)
+    if size is None:
+        return None
+    kind, amount = size
+    return f"{kind}:{_bucket(amount)}"
+
+
+def _split_key(key: str) -> tuple[str, int]:
+    kind, _, amount = key.partition(":")
+    return kind, int(amount or 1)
+
+
+# ── Estimates ──────────────────────────────────────────────────────
+
+
+@dataclass
+class Estimate:
+    """Expected duration of one run and the timeout derived from it."""
+
+    module: str
+    input_size: str | None
+    source: str  # "bucket", "scaled", "module", "rollup" or "default"
+    samples: int
+    p50_ms: int | None
+    p95_ms: int | None
+    max_ms: int | None
+    timeout_s: int
+
+    def progress(self, elapsed_s: float) -> dict[str, Any]:
+        """
+        ETA and rough completion fraction after elapsed_s. Progress runs
+        against the median and is held below 1 until the run ends; a run
+        past its median is re-estimated against p95.
+        """
+        if self.p50_ms is None:
+            return {"elapsed_s": round(elapsed_s, 1), "eta_s": None, "progress": None}
+        expected = self.p50_ms / 1000
+        if elapsed_s > expected and self.p95_ms:
+            expected = max(expected, self.p95_ms / 1000)
+        return {
+            "elapsed_s": round(elapsed_s, 1),
+            "eta_s": round(max(0.0, expected - elapsed_s), 1),
+            "progress": round(min(0.99, elapsed_s / expected), 3) if expected > 0 else None,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _quantile(values: list[float], q: float) -> float:
+    """Nearest-rank quantile of an already sorted list."""
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+def suggest_timeout(p95_ms: float, floor_s: float = 0) -> int:
+    """Timeout for a run whose p95 duration is p95_ms, clamped to sane bounds."""
+    timeout = max(p95_ms / 1000 * MARGIN + SLACK_S, floor_s)
+    return int(min(MAX_TIMEOUT_S, max(MIN_TIMEOUT_S, math.ceil(timeout))))
+
+
+def _load_history(db_path: str, module: str) -> list[tuple[str | None, str | None, int]]:
+    """(input_size, args, duration_ms) of the module's recent successful runs."""
+    key = (db_path, module)
+    with _history_lock:
+        cached = _history.get(key)
+        if cached is not None and time.monotonic() - cached[0] < HISTORY_TTL:
+            return cached[1]
+
+    if not db_path or not os.path.exists(db_path):
+        return []
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(module_runs)")}
+            size_col = "input_size" if "input_size" in columns else "NULL"
+            rows = conn.execute(
+                f"SELECT {size_col}, args, duration_ms FROM module_runs "
+                "WHERE module_name = ? AND exit_code = 0 AND duration_ms > 0 "
+                "ORDER BY id DESC LIMIT ?",
+                (module, HISTORY_LIMIT),
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        rows = []
+
+    with _history_lock:
+        _history[key] = (time.monotonic(), rows)
+    return rows
+
+
+def _load_rollups(db_path: str, module: str) -> list[tuple[int, float, float, int | None]]:
+    """(successful runs, p50_ms, p95_ms, max_ms) per rolled-up day, newest first."""
+    key = (db_path, module)
+    with _history_lock:
+        cached = _rollups.get(key)
+        if cached is not None and time.monotonic() - cached[0] < HISTORY_TTL:
+            return cached[1]
+
+    if not db_path or not os.path.exists(db_path):
+        return []
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+        try:
+            rows = conn.execute(
+                "SELECT run_count - failure_count, p50_duration_ms, p95_duration_ms, max_duration_ms "
+                "FROM module_run_stats_daily "
+                "WHERE module_name = ? AND run_count > failure_count AND p50_duration_ms > 0 "
+                "ORDER BY day_timestamp DESC LIMIT ?",
+                (module, ROLLUP_DAYS),
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        rows = []  # no stats table yet (migration not applied)
+
+    with _history_lock:
+        _rollups[key] = (time.monotonic(), rows)
+    return rows
+
+
+def estimate(db_path: str, module: str, args: Any = None) -> Estimate:
+    """Estimate one run of module with args from its module_runs history."""
+    module = module.removesuffix(".py")
+    a = normalise_args(args, module)
+    key = size_key(a)
+    duration = _number(a.get("duration")) or 0
+    floor_s = duration + SLACK_S if duration > 0 else 0
+
+    samples: dict[str | None, list[float]] = {}
+    for stored, raw_args, duration_ms in _load_history(db_path, module):
+        samples.setdefault(stored or size_key(raw_args, module), []).append(float(duration_ms))
+
+    def result(source: str, durations: list[float]) -> Estimate:
+        durations.sort()
+        p95 = _quantile(durations, 0.95)
+        return Estimate(
+            module=module,
+            input_size=key,
+            source=source,
+            samples=len(durations),
+            p50_ms=int(_quantile(durations, 0.5)),
+            p95_ms=int(p95),
+            max_ms=int(durations[-1]),
+            timeout_s=suggest_timeout(p95, floor_s),
+        )
+
+    if key is not None:
+        # Nearest buckets first: fixed per-run overhead makes far ones scale badly
+        kind, amount = _split_key(key)
+        nearest = sorted(
+            (abs(math.log2(other_amount / amount)), other_amount, durations)
+            for other, durations in samples.items()
+            if other is not None
+            for other_kind, other_amount in [_split_key(other)]
+            if other_kind == kind
+        )
+        scaled: list[float] = []
+        for _, other_amount, durations in nearest:
+            scaled += [d * amount / other_amount for d in durations]
+            if len(scaled) >= MIN_SAMPLES:
+                return result("bucket" if other_amount == amount else "scaled", scaled)
+
+    everything = [d for durations in samples.values() for d in durations]
+    if len(everything) >= MIN_SAMPLES:
+        return result("module", everything)
+
+    # Older runs survive only as daily rollups: each day (and the raw runs
+    # left, as one more "day") contributes its p50/p95 weighted by runs
+    days = _load_rollups(db_path, module)
+    if days:
+        parts = [(float(n), float(p50), float(p95 or p50), mx) for n, p50, p95, mx in days]
+        if everything:
+            everything.sort()
+            parts.append((
+                float(len(everything)), _quantile(everything, 0.5),
+                _quantile(everything, 0.95), int(everything[-1]),
+            ))
+        runs = sum(n for n, _, _, _ in parts)
+        if runs >= MIN_SAMPLES:
+            p95 = sum(n * p for n, _, p, _ in parts) / runs
+            return Estimate(
+                module=module,
+                input_size=key,
+                source="rollup",
+                samples=int(runs),
+                p50_ms=int(sum(n * p for n, p, _, _ in parts) / runs),
+                p95_ms=int(p95),
+                max_ms=max((int(mx) for _, _, _, mx in parts if mx is not None), default=None),
+                timeout_s=suggest_timeout(p95, floor_s),
+            )
+
+    return Estimate(
+        module=module,
+        input_size=key,
+        source="default",
+        samples=len(everything),
+        p50_ms=None,
+        p95_ms=None,
+        max_ms=None,
+        timeout_s=int(max(DEFAULT_TIMEOUT_S, floor_s)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="module_estimator",
+        description="Estimate a module run's duration and timeout from module_runs history.",
+        allow_abbrev=False,
+    )
+    parser.add_argument("module", help="Module name, e.g. port_scanner")
+    parser.add_argument(
+        "--db-path",
+        default=str(MODULES_DIR.parent.parent / "rf_signals.db"),
+        help="Path to rf_signals.db (default: ../rf_signals.db)",
+    )
+    parser.add_argument("--elapsed", type=float, help="Seconds the run has been going; adds ETA/progress")
+    opts, module_args = parser.parse_known_args()
+    if module_args[:1] == ["--"]:
+        module_args = module_args[1:]
+
+    est = estimate(opts.db_path, opts.module, module_args)
+    out = est.to_dict()
+    if opts.elapsed is not None:
+        out.update(est.progress(opts.elapsed))
+    print(json.dumps(out))
+
+
+if __name__ == "__main__":
+    main()
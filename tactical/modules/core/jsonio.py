@@ -0,0 +1,122 @@
+"""
+JSON encode/decode with the fastest backend installed.
+
+Every envelope, --ndjson record and daemon frame goes through json.dumps,
+and wifi_recon, traffic_analyzer, re_analyzer and exploit_search decode
+multi-megabyte tool output with json.loads. orjson and msgspec do both
+several times faster than the stdlib; this module picks one at import:
+
+    ARGOS_JSON_BACKEND=orjson|msgspec|stdlib   force a backend
+    (unset)                                    orjson, then msgspec, then stdlib
+
+The fast paths keep stdlib semantics where callers depend on them:
+
+  - dumps() stringifies unknown types (default=str) and accepts non-str
+    dict keys; anything the backend rejects (ints over 64 bits, ...) is
+    re-encoded with the stdlib.
+  - loads() raises json.JSONDecodeError on bad input whichever backend is
+    active, so existing `except json.JSONDecodeError` blocks keep working;
+    input a fast backend refuses (NaN literals, huge ints) is retried with
+    the stdlib before giving up.
+
+Output is compact (no spaces after separators) on the fast backends, and
+msgspec renders datetimes as ISO 8601 rather than str().
+
+See tests/performance/json_bench.py for throughput on representative payloads.
+"""
+
+import json
+import os
+from typing import Any, Callable
+
+BACKENDS = ("orjson", "msgspec", "stdlib")
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, default=str)
+
+
+def _stdlib_loads(data: str | bytes) -> Any:
+    return json.loads(data)
+
+
+def _load_orjson() -> tuple[Callable[[Any], str], Callable[[str | bytes], Any]]:
+    import orjson
+
+    # Hand datetimes and dataclasses to default=str, as the stdlib does
+    option = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode()
+        except TypeError:
+            return _stdlib_dumps(obj)
+
+    def loads(data: str | bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return _stdlib_loads(data)
+
+    return dumps, loads
+
+
+def _load_msgspec() -> tuple[Callable[[Any], str], Callable[[str | bytes], Any]]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=str)
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any) -> str:
+        try:
+            return encoder.encode(obj).decode()
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            return _stdlib_dumps(obj)
+
+    def loads(data: str | bytes) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError:
+            return _stdlib_loads(data)
+
+    return dumps, loads
+
+
+_LOADERS = {"orjson": _load_orjson, "msgspec": _load_msgspec}
+
+
+def select_backend(name: str | None = None) -> str:
+    """
+    Switch the active backend and return its name.
+
+    name=None tries orjson, then msgspec, then falls back to the stdlib. A
+    named backend that is not installed also falls back to the stdlib.
+    """
+    global backend, dumps, loads
+    candidates = [name] if name else list(BACKENDS)
+    for candidate in candidates:
+        if candidate == "stdlib":
+            break
+        loader = _LOADERS.get(candidate)
+        if loader is None:
+            continue
+        try:
+            dumps, loads = loader()
+        except ImportError:
+            continue
+        backend = candidate
+        return backend
+    dumps, loads = _stdlib_dumps, _stdlib_loads
+    backend = "stdlib"
+    return backend
+
+
+backend: str = "stdlib"
+dumps: Callable[[Any], str] = _stdlib_dumps
+loads: Callable[[str | bytes], Any] = _stdlib_loads
+
+select_backend(os.environ.get("ARGOS_JSON_BACKEND") or None)
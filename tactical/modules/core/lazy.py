@@ -0,0 +1,73 @@
+"""
+Deferred imports for heavy third-party dependencies.
+
+A module that does `import requests` or `import dns.resolver` at top level
+pays for it on every start, including `--help`, argument errors and daemon
+preload, even though only run() needs it. lazy_import() returns a module
+stand-in that performs the real import on first attribute access, so call
+sites (`requests.get`, `dns.resolver.resolve`, `except paramiko.SSHException`)
+stay unchanged while the cost moves to the first point of use.
+
+A missing package still raises ImportError — just from run() rather than at
+import time, where run_collect() reports it like any other module error.
+"""
+
+import importlib
+import time
+import types
+from typing import Any
+
+# Every stand-in created in this process, for startup_report.py.
+_registry: list["LazyModule"] = []
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports `name` (and `submodules`) on first use."""
+
+    def __init__(self, name: str, submodules: tuple[str, ...] = ()) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_submodules"] = submodules
+        self.__dict__["_lazy_target"] = None
+        self.__dict__["_lazy_load_ms"] = None
+
+    def _lazy_load(self) -> types.ModuleType:
+        start = time.perf_counter()
+        target = importlib.import_module(self.__name__)
+        for sub in self._lazy_submodules:
+            importlib.import_module(f"{self.__name__}.{sub}")
+        self.__dict__["_lazy_target"] = target
+        self.__dict__["_lazy_load_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return target
+
+    def __getattr__(self, attr: str) -> Any:
+        target = self.__dict__["_lazy_target"] or self._lazy_load()
+        return getattr(target, attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_target"] else "deferred"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str, submodules: tuple[str, ...] = ()) -> Any:
+    """
+    Return a stand-in for `import name` that loads on first attribute access.
+
+    For packages used as `pkg.sub.attr` (dnspython), list the submodules so
+    they are imported together: lazy_import("dns", ("resolver", "query")).
+    """
+    module = LazyModule(name, submodules)
+    _registry.append(module)
+    return module
+
+
+def load_all() -> dict[str, float | None]:
+    """Force every deferred import; returns load time (ms) per module name."""
+    times: dict[str, float | None] = {}
+    for module in _registry:
+        try:
+            if module.__dict__["_lazy_target"] is None:
+                module._lazy_load()
+            times[module.__name__] = module.__dict__["_lazy_load_ms"]
+        except ImportError:
+            times[module.__name__] = None
+    return times
@@ -0,0 +1,231 @@
+"""
+Exclusive leases on shared radio hardware.
+
+spectrum_sweep, hackrf_capture and rf_replay share one HackRF One, and the
+WiFi modules share the monitor-mode adapter. Two concurrent users of the
+same device fail with "Resource busy" or silently return empty captures.
+A DeviceLease serialises them through an flock()ed file per device under
+$ARGOS_LOCK_DIR (default /run/argos/locks, created at boot from
+deployment/argos-tmpfiles.conf). Every run, whoever starts it, has to
+lock the same files, so a missing lock directory is an error rather than
+a reason to fall back to a private one:
+
+  - waiters queue in arrival order: each drops a ticket file into
+    <device>.queue/ and only tries the lock once every older ticket whose
+    process is still alive has gone,
+  - the holder's pid, module and start time are written into the lock
+    file, so a timed-out waiter can say who has the device,
+  - the kernel drops the flock when the holder exits, even on SIGKILL, so
+    a crashed module never wedges the device.
+
+wait_ms, queued_behind and held_ms are reported per lease in the run's
+`resources` block.
+"""
+
+import fcntl
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+DEFAULT_LOCK_DIR = "/run/argos/locks"
+
+# Poll interval while queued: starts short so back-to-back runs hand the
+# device over quickly, backs off to keep an hour-long wait cheap.
+_POLL_MIN = 0.05
+_POLL_MAX = 0.5
+
+_DEVICE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+# Linux IFNAMSIZ, same rule as TacticalModule.validate_interface()
+_IFACE_NAME = re.compile(r"^[a-zA-Z0-9_-]{1,15}$")
+
+
+def lock_dir() -> Path:
+    """$ARGOS_LOCK_DIR (created if needed) or /run/argos/locks; OSError if unusable."""
+    override = os.environ.get("ARGOS_LOCK_DIR")
+    path = Path(override or DEFAULT_LOCK_DIR)
+    if override:
+        path.mkdir(parents=True, exist_ok=True)
+    if not path.is_dir() or not os.access(path, os.W_OK | os.X_OK):
+        raise OSError(
+            f"Lock directory {path} is missing or not writable: install "
+            "deployment/argos-tmpfiles.conf (scripts/ops/install-services.sh) "
+            "or set ARGOS_LOCK_DIR"
+        )
+    return path
+
+
+def _shared(path: Path) -> None:
+    """Let runs as other users (root and the service user) use a lock file or queue dir we created."""
+    try:
+        os.chmod(path, 0o777 if path.is_dir() else 0o666)
+    except PermissionError:
+        pass  # created by another user, who already did this
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def wifi_adapter(interface: str) -> str:
+    """
+    Lease name for a wireless interface, keyed by its phy.
+
+    wlan1 and the wlan1mon monitor vif airmon-ng creates on top of it are
+    the same radio, so both map to "wifi-phy1". Falls back to the interface
+    name when sysfs has no phy80211 link (interface down or renamed).
+    Raises ValueError for anything that is not a plain interface name.
+    """
+    if not _IFACE_NAME.match(interface):
+        raise ValueError(f"Invalid interface name: {interface!r}")
+    try:
+        phy = (Path("/sys/class/net") / interface / "phy80211" / "name").read_text().strip()
+    except OSError:
+        phy = interface
+    return f"wifi-{phy}"
+
+
+class LeaseTimeout(Exception):
+    """The device was not free within the timeout."""
+
+    def __init__(self, device: str, waited_s: float, holder: dict[str, Any]) -> None:
+        self.device = device
+        self.waited_s = waited_s
+        self.holder = holder
+        who = f"{holder.get('module', '?')} (pid {holder.get('pid', '?')})" if holder else "another process"
+        super().__init__(f"{device} busy: held by {who}, gave up after {waited_s:.0f}s")
+
+
+class DeviceLease:
+    """
+    Context manager holding one device exclusively.
+
+        with DeviceLease("hackrf", owner="spectrum_sweep", timeout=600):
+            ...
+
+    timeout is how long to queue before raising LeaseTimeout; 0 means try
+    once without waiting.
+    """
+
+    def __init__(self, device: str, owner: str, timeout: float) -> None:
+        self.device = device
+        self.owner = owner
+        self.timeout = timeout
+        self.wait_ms = 0
+        self.queued_behind = 0
+        self._fd: int | None = None
+        self._acquired_at = 0.0
+        self._released_at = 0.0
+        safe = _DEVICE_CHARS.sub("_", device)
+        root = lock_dir()
+        self._lock_path = root / f"{safe}.lock"
+        self._queue_dir = root / f"{safe}.queue"
+
+    # ── Acquire / release ──────────────────────────────────────────
+
+    def acquire(self) -> "DeviceLease":
+        start = time.monotonic()
+        deadline = start + self.timeout
+        self._queue_dir.mkdir(exist_ok=True)
+        _shared(self._queue_dir)
+        ticket = self._queue_dir / f"{time.time_ns():020d}-{os.getpid()}-{id(self):x}"
+        ticket.touch()
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+        _shared(self._lock_path)
+        try:
+            self.queued_behind = self._ahead_of(ticket)
+            delay = _POLL_MIN
+            while True:
+                if self._ahead_of(ticket) == 0:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        pass
+                if time.monotonic() >= deadline:
+                    raise LeaseTimeout(self.device, time.monotonic() - start, self._read_holder(fd))
+                time.sleep(delay)
+                delay = min(delay * 2, _POLL_MAX)
+        except BaseException:
+            os.close(fd)
+            raise
+        finally:
+            ticket.unlink(missing_ok=True)
+
+        self._fd = fd
+        self._acquired_at = time.monotonic()
+        self.wait_ms = int((self._acquired_at - start) * 1000)
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, json.dumps({
+            "pid": os.getpid(),
+            "module": self.owner,
+            "since": time.time(),
+        }).encode(), 0)
+        return self
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            os.ftruncate(self._fd, 0)
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+            self._released_at = time.monotonic()
+
+    def __enter__(self) -> "DeviceLease":
+        return self.acquire()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+    # ── Metrics ────────────────────────────────────────────────────
+
+    @property
+    def held_ms(self) -> int:
+        if not self._acquired_at:
+            return 0
+        end = self._released_at or time.monotonic()
+        return int((end - self._acquired_at) * 1000)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "device": self.device,
+            "wait_ms": self.wait_ms,
+            "queued_behind": self.queued_behind,
+            "held_ms": self.held_ms,
+        }
+
+    # ── Internals ──────────────────────────────────────────────────
+
+    def _ahead_of(self, ticket: Path) -> int:
+        """Count live tickets older than ours, clearing ones left by dead processes."""
+        ahead = 0
+        for entry in sorted(self._queue_dir.iterdir()):
+            if entry.name >= ticket.name:
+                break
+            try:
+                pid = int(entry.name.split("-")[1])
+            except (IndexError, ValueError):
+                continue
+            if _pid_alive(pid):
+                ahead += 1
+            else:
+                entry.unlink(missing_ok=True)
+        return ahead
+
+    @staticmethod
+    def _read_holder(fd: int) -> dict[str, Any]:
+        try:
+            return json.loads(os.pread(fd, 4096, 0) or b"{}")
+        except (OSError, ValueError):
+            return {}
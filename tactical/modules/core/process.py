@@ -0,0 +1,267 @@
+"""
+Incremental subprocess output — stream a tool's stdout/stderr while it runs.
+
+run_tool_popen() buffers everything with communicate() until the capture
+window closes, so a 15-minute hackrf_sweep or tcpdump -v run holds its
+whole output in memory before the first line is parsed. ToolStream reads
+both pipes through a selector and yields each line (or raw chunk) as soon
+as the kernel hands it over, so parse state — not total output — bounds
+peak memory.
+
+It is also the one place tool process groups are supervised. Every tool
+the base class starts runs in its own session and is registered here
+while it runs, and install_signal_handlers() (called by
+TacticalModule.execute) maps the runner's signals onto those groups:
+
+    SIGINT   drain: forward SIGINT to each running tool so it flushes and
+             exits (SIGTERM/SIGKILL follow after INTERRUPT_GRACE); the
+             module carries on with the output read so far and reports
+             it as partial. A second SIGINT stops the module outright.
+    SIGTERM  stop: SIGTERM the tool groups, then exit, so no tool is left
+             orphaned in its own session.
+
+Whatever a tool wrote before it was stopped is always read to EOF, so a
+timed-out or interrupted sweep keeps its partial output.
+"""
+
+import codecs
+import os
+import selectors
+import signal
+import subprocess
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from core.usage import reap_with_usage
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+# Bytes requested per read() — large enough to drain a busy pipe quickly,
+# small enough that callbacks see data promptly.
+READ_CHUNK = 64 * 1024
+
+# Seconds between SIGTERM and SIGKILL once the duration expires.
+KILL_GRACE = 5.0
+
+# Seconds an interrupted tool gets to exit on SIGINT before SIGTERM.
+INTERRUPT_GRACE = 5.0
+
+# Streams currently being read, for the signal handlers
+_ACTIVE: set["ToolStream"] = set()
+_interrupted = False
+
+
+def interrupt_requested() -> bool:
+    """True once SIGINT asked this process to wrap up with partial results."""
+    return _interrupted
+
+
+def install_signal_handlers() -> None:
+    """Route SIGINT/SIGTERM to the running tools (see the module docstring). Main thread only."""
+    signal.signal(signal.SIGINT, _on_sigint)
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+
+def request_interrupt() -> None:
+    """Drain as a first SIGINT does: stop the running tools, keep their output."""
+    global _interrupted
+    _interrupted = True
+    for stream in list(_ACTIVE):
+        stream.interrupt()
+
+
+def reset_interrupt() -> None:
+    """Forget an earlier interrupt, before a long-lived worker's next run."""
+    global _interrupted
+    _interrupted = False
+
+
+def _on_sigint(signum: int, frame: Any) -> None:
+    if _interrupted:
+        raise KeyboardInterrupt
+    request_interrupt()
+
+
+def _on_sigterm(signum: int, frame: Any) -> None:
+    for stream in list(_ACTIVE):
+        stream.terminate()
+    raise SystemExit(128 + signum)
+
+
+class ToolStream:
+    """
+    Iterate (stream_name, payload) pairs from a running process.
+
+    stream_name is "stdout" or "stderr". In line mode payload is a str
+    without its trailing newline; in raw mode it is the bytes chunk as read.
+    The process group is sent SIGTERM when `duration` expires and SIGKILL
+    KILL_GRACE seconds later; interrupt() sends SIGINT first. After
+    iteration, `returncode`, `timed_out` and `interrupted` describe how
+    the process ended and `usage` holds its CPU, peak RSS and /proc io
+    counters (see core/usage.py); on_exit receives the same dict.
+    """
+
+    def __init__(
+        self,
+        proc: subprocess.Popen[bytes],
+        duration: float,
+        raw: bool = False,
+        on_exit: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        self.proc = proc
+        self.duration = duration
+        self.raw = raw
+        self.returncode: int | None = None
+        self.timed_out = False
+        self.interrupted = False
+        self.bytes_read = {STDOUT: 0, STDERR: 0}
+        self.usage: dict[str, Any] = {}
+        self._on_exit = on_exit
+        self._deadline = time.monotonic() + duration
+        self._kill_at: float | None = None
+        self._drained = False
+
+    def __iter__(self) -> Iterator[tuple[str, str | bytes]]:
+        sel = selectors.DefaultSelector()
+        decoders = {}
+        partial = {STDOUT: "", STDERR: ""}
+        for stream_name, pipe in ((STDOUT, self.proc.stdout), (STDERR, self.proc.stderr)):
+            if pipe is None:
+                continue
+            os.set_blocking(pipe.fileno(), False)
+            sel.register(pipe, selectors.EVENT_READ, stream_name)
+            decoders[stream_name] = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        self._deadline = time.monotonic() + self.duration
+        _ACTIVE.add(self)
+        if _interrupted:
+            self.interrupt()
+
+        try:
+            while sel.get_map():
+                now = time.monotonic()
+                if self._kill_at is None and now >= self._deadline:
+                    # An interrupted tool that ignored SIGINT is not a timeout
+                    self.timed_out = not self.interrupted
+                    self.terminate()
+                elif self._kill_at is not None and now >= self._kill_at:
+                    self._signal_group(signal.SIGKILL)
+                    # A grandchild outside the group may still hold the pipe
+                    # open; stop waiting on it after one more grace period.
+                    if now >= self._kill_at + KILL_GRACE:
+                        break
+
+                wake_at = self._deadline if self._kill_at is None else self._kill_at
+                timeout = max(0.0, min(wake_at - now, 0.5))
+                for key, _ in sel.select(timeout=timeout):
+                    stream_name = key.data
+                    try:
+                        chunk = os.read(key.fd, READ_CHUNK)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        sel.unregister(key.fileobj)
+                        if not self.raw:
+                            tail = partial[stream_name] + decoders[stream_name].decode(b"", final=True)
+                            partial[stream_name] = ""
+                            if tail:
+                                yield stream_name, tail.rstrip("\r")
+                        continue
+
+                    self.bytes_read[stream_name] += len(chunk)
+                    if self.raw:
+                        yield stream_name, chunk
+                        continue
+
+                    text = partial[stream_name] + decoders[stream_name].decode(chunk)
+                    lines = text.split("\n")
+                    partial[stream_name] = lines.pop()
+                    for line in lines:
+                        yield stream_name, line.rstrip("\r")
+            self._drained = True
+        finally:
+            _ACTIVE.discard(self)
+            sel.close()
+            self._reap()
+
+    def collect(self) -> tuple[str, str]:
+        """
+        Read to EOF and return (stdout, stderr) as text.
+
+        For raw streams; output up to a timeout or interrupt is kept.
+        Newlines are normalised as subprocess text mode would.
+        """
+        chunks: dict[str, list[bytes]] = {STDOUT: [], STDERR: []}
+        for stream_name, chunk in self:
+            chunks[stream_name].append(chunk)  # type: ignore[arg-type]
+        stdout, stderr = (
+            b"".join(chunks[name]).decode("utf-8", errors="replace")
+            .replace("\r\n", "\n").replace("\r", "\n")
+            for name in (STDOUT, STDERR)
+        )
+        return stdout, stderr
+
+    @property
+    def partial(self) -> bool:
+        """True when the tool was stopped rather than finishing on its own."""
+        return self.timed_out or self.interrupted
+
+    def interrupt(self) -> None:
+        """Ask the tool to wrap up (SIGINT), escalating after INTERRUPT_GRACE."""
+        if self.interrupted or self._kill_at is not None:
+            return
+        self.interrupted = True
+        self._signal_group(signal.SIGINT)
+        self._deadline = min(self._deadline, time.monotonic() + INTERRUPT_GRACE)
+
+    def terminate(self) -> None:
+        """SIGTERM the tool's group now; SIGKILL follows after KILL_GRACE."""
+        if self._kill_at is None:
+            self._signal_group(signal.SIGTERM)
+            self._kill_at = time.monotonic() + KILL_GRACE
+
+    def _signal_group(self, sig: signal.Signals) -> None:
+        """Signal the tool's whole process group (it was started in its own session)."""
+        try:
+            os.killpg(os.getpgid(self.proc.pid), sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _reap(self) -> None:
+        """Make sure the process is gone, then record its exit status and usage."""
+        for pipe in (self.proc.stdout, self.proc.stderr):
+            if pipe is not None:
+                pipe.close()
+        if self._drained and self._kill_at is None:
+            # Both pipes hit EOF: the tool is normally exiting, so let it
+            # finish within its duration rather than signalling it
+            while not self._exited(min(0.5, max(0.0, self._deadline - time.monotonic()))):
+                if time.monotonic() >= self._deadline:
+                    self.timed_out = not self.interrupted
+                    break
+        if not self._exited(0):
+            self._signal_group(signal.SIGTERM)
+            if not self._exited(KILL_GRACE):
+                self._signal_group(signal.SIGKILL)
+        self.usage = reap_with_usage(self.proc)
+        self.returncode = self.proc.returncode
+        if self._on_exit is not None:
+            self._on_exit(self.usage)
+
+    def _exited(self, timeout: float) -> bool:
+        """Wait up to timeout for exit without reaping (so /proc/<pid>/io stays readable)."""
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        while True:
+            try:
+                info = os.waitid(os.P_PID, self.proc.pid, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+            except ChildProcessError:
+                return True
+            if info is not None:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
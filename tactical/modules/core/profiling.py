@@ -0,0 +1,201 @@
+"""
+On-demand profiling of a module run, switched on by environment variable.
+
+Finding out why a wifi_recon or spectrum_sweep run is slow used to mean
+editing the module. With ARGOS_PROFILE set, TacticalModule.run_collect()
+profiles the run and writes the result next to the run's output artifacts
+(<artifact root>/profiles/, see core/artifacts.py):
+
+    ARGOS_PROFILE=cpu     cProfile          <module>-<run_id>.pstats
+    ARGOS_PROFILE=alloc   tracemalloc       <module>-<run_id>.tracemalloc
+    ARGOS_PROFILE=pyspy   py-spy sampling   <module>-<run_id>.speedscope.json
+                          (needs the py-spy binary and ptrace rights; it also
+                          sees native frames and the tool subprocesses)
+
+Each profile gets a `.txt` top-N summary alongside it (ARGOS_PROFILE_TOP,
+default 20): functions by cumulative time for cpu; for alloc the traced
+peak plus the allocation sites still live when the run ends (caches,
+module-level state — what a long-lived daemon accumulates). The
+envelope's `profile` block carries the paths and the top-N list;
+module_runs.profile_path links the row to the profile.
+
+    python3 -m pstats <file>.pstats
+    python3 -c "import tracemalloc; s = tracemalloc.Snapshot.load('<file>.tracemalloc')"
+    speedscope <file>.speedscope.json
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import shutil
+import signal
+import subprocess
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("profiling")
+
+MODES = ("cpu", "alloc", "pyspy")
+DEFAULT_TOP = 20
+
+# Frames kept per allocation; deeper costs more memory while tracing
+_TRACE_FRAMES = 10
+_PYSPY_RATE = 100  # samples/s
+_PYSPY_STOP_TIMEOUT = 10  # seconds for py-spy to write its output
+
+
+def profile_mode() -> str | None:
+    """The ARGOS_PROFILE mode, or None when profiling is off or the value is unknown."""
+    mode = os.environ.get("ARGOS_PROFILE", "").strip().lower()
+    if not mode:
+        return None
+    if mode not in MODES:
+        logger.warning("Ignoring ARGOS_PROFILE=%s (expected one of %s)", mode, ", ".join(MODES))
+        return None
+    return mode
+
+
+def profile_dir(db_path: str) -> Path:
+    """$ARGOS_PROFILE_DIR, or profiles/ under the DB's artifact root."""
+    override = os.environ.get("ARGOS_PROFILE_DIR")
+    if override:
+        return Path(override)
+
+    from core.artifacts import default_root
+
+    return default_root(db_path) / "profiles"
+
+
+def _top_n() -> int:
+    try:
+        return max(1, int(os.environ.get("ARGOS_PROFILE_TOP", DEFAULT_TOP)))
+    except ValueError:
+        return DEFAULT_TOP
+
+
+class RunProfiler:
+    """Profile one run: start(), run the module, stop() -> envelope block."""
+
+    _SUFFIX = {"cpu": ".pstats", "alloc": ".tracemalloc", "pyspy": ".speedscope.json"}
+
+    def __init__(self, mode: str, out_dir: Path, stem: str) -> None:
+        self.mode = mode
+        self.path = out_dir / f"{stem}{self._SUFFIX[mode]}"
+        self.summary_path = out_dir / f"{stem}.txt"
+        self.top = _top_n()
+        self._profile: cProfile.Profile | None = None
+        self._pyspy: subprocess.Popen[bytes] | None = None
+        self._tracing_was_on = False
+
+    def start(self) -> bool:
+        """Begin profiling. Returns False (and logs why) if it could not start."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning("No profile directory %s: %s", self.path.parent, e)
+            return False
+
+        if self.mode == "cpu":
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError as e:  # another profiler is already active
+                logger.warning("cProfile unavailable: %s", e)
+                return False
+        elif self.mode == "alloc":
+            self._tracing_was_on = tracemalloc.is_tracing()
+            if not self._tracing_was_on:
+                tracemalloc.start(_TRACE_FRAMES)
+            tracemalloc.reset_peak()
+        else:
+            pyspy = shutil.which("py-spy")
+            if pyspy is None:
+                logger.warning("ARGOS_PROFILE=pyspy but py-spy is not installed")
+                return False
+            self._pyspy = subprocess.Popen(
+                [pyspy, "record", "--pid", str(os.getpid()), "--rate", str(_PYSPY_RATE),
+                 "--subprocesses", "--format", "speedscope", "--output", str(self.path)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+        return True
+
+    def stop(self) -> dict[str, Any]:
+        """Stop profiling, write the profile and summary, return the envelope block."""
+        block: dict[str, Any] = {"mode": self.mode, "path": str(self.path), "summary": str(self.summary_path)}
+        try:
+            if self.mode == "cpu":
+                block["top"] = self._stop_cpu()
+            elif self.mode == "alloc":
+                block.update(self._stop_alloc())
+            else:
+                self._stop_pyspy()
+        except (OSError, RuntimeError) as e:
+            logger.warning("Failed to write %s profile: %s", self.mode, e)
+            block["error"] = str(e)
+        return block
+
+    # ── Per mode ───────────────────────────────────────────────────
+
+    def _stop_cpu(self) -> list[dict[str, Any]]:
+        assert self._profile is not None
+        self._profile.disable()
+        self._profile.dump_stats(str(self.path))
+
+        text = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=text).sort_stats(pstats.SortKey.CUMULATIVE)
+        stats.print_stats(self.top)
+        self.summary_path.write_text(text.getvalue())
+
+        top = []
+        for func in stats.fcn_list[:self.top]:
+            _, ncalls, tottime, cumtime, _ = stats.stats[func]
+            filename, line, name = func
+            top.append({
+                "function": f"{filename}:{line}({name})",
+                "calls": ncalls,
+                "tottime_ms": round(tottime * 1000, 2),
+                "cumtime_ms": round(cumtime * 1000, 2),
+            })
+        return top
+
+    def _stop_alloc(self) -> dict[str, Any]:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not self._tracing_was_on:
+            tracemalloc.stop()
+        snapshot.dump(str(self.path))
+
+        stats = snapshot.statistics("lineno")[:self.top]
+        lines = [f"peak traced: {peak / 1024:.1f} KiB", f"top {len(stats)} allocation sites by size:"]
+        top = []
+        for stat in stats:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}")
+            top.append({
+                "location": f"{frame.filename}:{frame.lineno}",
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+            })
+        self.summary_path.write_text("\n".join(lines) + "\n")
+        return {"peak_kb": peak // 1024, "top": top}
+
+    def _stop_pyspy(self) -> None:
+        assert self._pyspy is not None
+        # py-spy writes its output when interrupted
+        self._pyspy.send_signal(signal.SIGINT)
+        try:
+            _, stderr = self._pyspy.communicate(timeout=_PYSPY_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self._pyspy.kill()
+            self._pyspy.communicate()
+            raise RuntimeError("py-spy did not finish writing its profile")
+        if not self.path.exists():
+            raise RuntimeError(f"py-spy wrote no profile: {stderr.decode(errors='replace')[-300:]}")
+        self.summary_path.write_text(
+            f"py-spy speedscope profile: {self.path}\n"
+            "Open it at https://www.speedscope.app or with `speedscope <file>`.\n"
+        )
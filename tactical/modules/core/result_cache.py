@@ -0,0 +1,146 @@
+"""
+Result cache for deterministic offline modules.
+
+exploit_search, binary_analyzer, re_analyzer, disk_analyzer, file_carver and
+traffic_analyzer --input-file re-run their external tool on every call even
+when nothing about the input changed. Modules opt in by setting cache_ttl;
+successful results are then stored under a key built from:
+
+  - the module name,
+  - canonicalised vars(args) (minus runner plumbing such as --db-path),
+  - a fingerprint (size, mtime, SHA-256) of every input file the module
+    names via cache_inputs().
+
+Entries live as small JSON files under $ARGOS_CACHE_DIR (default
+<db dir>/module_cache/). Reads touch the entry so eviction is LRU by
+mtime once the directory exceeds MAX_BYTES; expired entries are dropped
+on read.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+MAX_BYTES = 64 * 1024 * 1024
+
+# Inputs up to this size are hashed in full; larger disk images and
+# captures hash SAMPLE_BYTES from the start, middle and end instead so a
+# lookup never re-reads gigabytes (size + mtime_ns still change on edit).
+FULL_HASH_LIMIT = 64 * 1024 * 1024
+SAMPLE_BYTES = 1024 * 1024
+
+# Args that never change what a module computes.
+IGNORED_ARGS = frozenset({"db_path", "timeout", "json", "no_cache", "lock_timeout", "ndjson"})
+
+
+def default_root(db_path: str) -> Path:
+    """Cache directory for a DB: $ARGOS_CACHE_DIR or <db dir>/module_cache."""
+    override = os.environ.get("ARGOS_CACHE_DIR")
+    if override:
+        return Path(override)
+    return Path(db_path or ".").resolve().parent / "module_cache"
+
+
+def fingerprint_file(path: str) -> dict[str, Any]:
+    """Identify a file's content cheaply enough to do on every lookup."""
+    p = Path(path)
+    st = p.stat()
+    if p.is_dir():
+        # Directory inputs (file_carver --input-dir) are keyed by their
+        # listing, not content — good enough to catch added/removed files.
+        names = sorted(
+            (str(c.relative_to(p)), c.stat().st_size, c.stat().st_mtime_ns)
+            for c in p.rglob("*") if c.is_file()
+        )
+        digest = hashlib.sha256(json.dumps(names).encode()).hexdigest()
+        return {"path": str(p.resolve()), "dir": True, "sha256": digest}
+
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        if st.st_size <= FULL_HASH_LIMIT:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        else:
+            for offset in (0, st.st_size // 2, st.st_size - SAMPLE_BYTES):
+                f.seek(offset)
+                h.update(f.read(SAMPLE_BYTES))
+    return {
+        "path": str(p.resolve()),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": h.hexdigest(),
+    }
+
+
+def cache_key(module: str, args: dict[str, Any], inputs: list[str]) -> str:
+    """Stable key for one invocation."""
+    material = {
+        "module": module,
+        "args": {k: v for k, v in sorted(args.items()) if k not in IGNORED_ARGS},
+        "inputs": [fingerprint_file(p) for p in sorted(inputs)],
+    }
+    blob = json.dumps(material, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class ResultCache:
+    """Directory of JSON result entries with TTL and LRU size eviction."""
+
+    def __init__(self, root: Path, max_bytes: int = MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def get(self, key: str, ttl: int) -> dict[str, Any] | None:
+        """Return the cached entry for key, or None if missing or older than ttl."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created", 0) > ttl:
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        """Store a successful result's data and evict down to max_bytes."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry = {"created": time.time(), "data": data}
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.root.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Retention for module_runs — daily rollups, compressed archives, pruning.
+
+module_runs only grows: every run keeps its args, stdout/stderr previews
+and resource usage, and over a multi-week exercise dashboard queries over
+recent activity slow down with it. This rolls old runs out of the table
+one UTC day at a time, following the signal_stats_hourly pattern
+(migration 001):
+
+  1. the day's rows, each with its module_run_spans, are appended to
+     <archive root>/module_runs/YYYY-MM-DD.jsonl.gz (one gzip member per
+     pass, so a day rolled twice still reads as one file);
+  2. one row per module goes into module_run_stats_daily: run and failure
+     counts, failure rate, avg/p50/p95/max duration and the archive path
+     (20261017_create_module_run_stats_daily.sql);
+  3. the rolled rows and their spans are deleted.
+
+All three happen inside one BEGIN IMMEDIATE transaction, so writers wait
+rather than add rows to a day mid-rollup, and a failure leaves the rows in
+place. Days are picked two ways:
+
+    --max-age-days N    every day older than the last N full days
+    --max-db-mb M       then oldest days first until the DB's used pages
+                        fit in M MB, never touching the last --keep-days
+
+A run is a failure when its exit code is not 0. Rolling a day that already
+has a rollup (rows logged late) merges into it; counts stay exact, and the
+percentiles become a run-weighted mean of the two passes. Artifacts
+(core/artifacts.py) are content-addressed and shared between runs, so they
+are left where they are; archived rows keep their keys.
+
+    python3 tactical/modules/core/retention.py --max-age-days 14
+    python3 tactical/modules/core/retention.py --max-db-mb 512 --vacuum
+"""
+
+import argparse
+import contextlib
+import gzip
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+MODULES_DIR = Path(__file__).resolve().parent.parent
+if str(MODULES_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULES_DIR))
+
+from core import jsonio  # noqa: E402
+
+DAY_S = 86400
+DEFAULT_MAX_AGE_DAYS = 14
+DEFAULT_KEEP_DAYS = 1  # size pruning never rolls today
+DEFAULT_STATS_DAYS = 365
+BUSY_TIMEOUT_MS = 5000
+_GZIP_LEVEL = 6  # archives are written off the hot path; favour ratio
+
+STATS_TABLE = "module_run_stats_daily"
+
+_STATS_COLUMNS = (
+    "day_timestamp", "module_name", "run_count", "failure_count", "failure_rate",
+    "avg_duration_ms", "p50_duration_ms", "p95_duration_ms", "max_duration_ms", "archive_path",
+)
+
+
+def _weighted(column: str) -> str:
+    t = STATS_TABLE
+    return (
+        f"{column} = CASE WHEN {t}.{column} IS NULL THEN excluded.{column}"
+        f" WHEN excluded.{column} IS NULL THEN {t}.{column}"
+        f" ELSE ({t}.{column} * {t}.run_count + excluded.{column} * excluded.run_count)"
+        f" / ({t}.run_count + excluded.run_count) END"
+    )
+
+
+# SET expressions all see the old row, so the sums below are consistent
+_UPSERT_STATS = (
+    f"INSERT INTO {STATS_TABLE} ({', '.join(_STATS_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _STATS_COLUMNS)}) "
+    f"ON CONFLICT(day_timestamp, module_name) DO UPDATE SET "
+    f"run_count = {STATS_TABLE}.run_count + excluded.run_count, "
+    f"failure_count = {STATS_TABLE}.failure_count + excluded.failure_count, "
+    f"failure_rate = CAST({STATS_TABLE}.failure_count + excluded.failure_count AS REAL)"
+    f" / ({STATS_TABLE}.run_count + excluded.run_count), "
+    f"{_weighted('avg_duration_ms')}, {_weighted('p50_duration_ms')}, {_weighted('p95_duration_ms')}, "
+    f"max_duration_ms = MAX(COALESCE({STATS_TABLE}.max_duration_ms, excluded.max_duration_ms),"
+    f" COALESCE(excluded.max_duration_ms, {STATS_TABLE}.max_duration_ms)), "
+    f"archive_path = excluded.archive_path"
+)
+
+
+def archive_root(db_path: str) -> Path:
+    """Archive directory for a DB: $ARGOS_ARCHIVE_DIR or <db dir>/module_archive."""
+    override = os.environ.get("ARGOS_ARCHIVE_DIR")
+    if override:
+        return Path(override)
+    return Path(db_path).resolve().parent / "module_archive"
+
+
+def _day(ts: float) -> int:
+    return int(ts) - int(ts) % DAY_S
+
+
+def _quantile(values: list[float], q: float) -> float:
+    """Nearest-rank quantile of an already sorted list."""
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,),
+    ).fetchone() is not None
+
+
+def used_bytes(conn: sqlite3.Connection) -> int:
+    """Bytes in use by the DB: allocated pages minus the freelist."""
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return (page_count - freelist) * page_size
+
+
+# ── Rollup ─────────────────────────────────────────────────────────
+
+
+def summarise(day: int, rows: list[dict[str, Any]], archive_path: str | None) -> list[tuple[Any, ...]]:
+    """module_run_stats_daily rows (in _STATS_COLUMNS order) for one day's runs."""
+    by_module: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        by_module.setdefault(row["module_name"], []).append(row)
+
+    stats = []
+    for module, runs in sorted(by_module.items()):
+        failures = sum(1 for r in runs if r.get("exit_code") != 0)
+        durations = sorted(r["duration_ms"] for r in runs if r.get("duration_ms") is not None)
+        stats.append((
+            day, module, len(runs), failures, failures / len(runs),
+            sum(durations) / len(durations) if durations else None,
+            _quantile(durations, 0.50) if durations else None,
+            _quantile(durations, 0.95) if durations else None,
+            durations[-1] if durations else None,
+            archive_path,
+        ))
+    return stats
+
+
+def _day_rows(conn: sqlite3.Connection, day: int, spans: bool) -> list[dict[str, Any]]:
+    rows = [
+        dict(r) for r in conn.execute(
+            "SELECT * FROM module_runs WHERE ran_at >= ? AND ran_at < ? ORDER BY id",
+            (day, day + DAY_S),
+        )
+    ]
+    if spans and rows and "run_id" in rows[0]:
+        by_run: dict[str, list[dict[str, Any]]] = {}
+        for span in conn.execute(
+            "SELECT s.* FROM module_run_spans s JOIN module_runs r ON r.run_id = s.run_id "
+            "WHERE r.ran_at >= ? AND r.ran_at < ? ORDER BY s.id",
+            (day, day + DAY_S),
+        ):
+            by_run.setdefault(span["run_id"], []).append(dict(span))
+        for row in rows:
+            row["spans"] = by_run.get(row["run_id"], []) if row["run_id"] else []
+    return rows
+
+
+def write_archive(root: Path, day: int, rows: list[dict[str, Any]]) -> Path:
+    """Append rows as one gzip member to the day's JSONL archive and fsync it."""
+    path = root / "module_runs" / f"{time.strftime('%Y-%m-%d', time.gmtime(day))}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab", compresslevel=_GZIP_LEVEL, mtime=0) as gz:
+            for row in rows:
+                gz.write(jsonio.dumps(row).encode("utf-8"))
+                gz.write(b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    return path
+
+
+def read_archive(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Yield the module_runs rows (with "spans") stored in an archive file."""
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield jsonio.loads(line)
+
+
+def rollup_day(conn: sqlite3.Connection, day: int, root: Path) -> dict[str, Any] | None:
+    """Archive, aggregate and delete one UTC day of module_runs; None if it had no rows."""
+    spans = _has_table(conn, "module_run_spans")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = _day_rows(conn, day, spans)
+        if not rows:
+            conn.rollback()
+            return None
+        path = write_archive(root, day, rows)
+        stats = summarise(day, rows, str(path))
+        conn.executemany(_UPSERT_STATS, stats)
+        if spans and "run_id" in rows[0]:
+            conn.execute(
+                "DELETE FROM module_run_spans WHERE run_id IN "
+                "(SELECT run_id FROM module_runs WHERE ran_at >= ? AND ran_at < ? AND run_id IS NOT NULL)",
+                (day, day + DAY_S),
+            )
+        conn.execute("DELETE FROM module_runs WHERE ran_at >= ? AND ran_at < ?", (day, day + DAY_S))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return {"day": day, "runs": len(rows), "modules": len(stats), "archive": str(path)}
+
+
+def _oldest_day(conn: sqlite3.Connection, since: int = 0) -> int | None:
+    ts = conn.execute("SELECT MIN(ran_at) FROM module_runs WHERE ran_at >= ?", (since,)).fetchone()[0]
+    return None if ts is None else _day(ts)
+
+
+# ── Retention pass ─────────────────────────────────────────────────
+
+
+def apply_retention(
+    db_path: str,
+    max_age_days: int | None = DEFAULT_MAX_AGE_DAYS,
+    max_db_mb: float | None = None,
+    keep_days: int = DEFAULT_KEEP_DAYS,
+    stats_days: int | None = DEFAULT_STATS_DAYS,
+    vacuum: bool = False,
+    now: float | None = None,
+) -> dict[str, Any]:
+    """
+    Roll up and prune module_runs by age, then by size budget. Returns a
+    report of the days rolled, bytes in use before and after, and whether
+    the budget could be met without touching the last keep_days days.
+    """
+    now = time.time() if now is None else now
+    today = _day(now)
+    root = archive_root(db_path)
+    if not os.path.exists(db_path):
+        raise RuntimeError(f"{db_path} does not exist")
+    # Autocommit: rollup_day() manages its own transactions
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    with contextlib.closing(conn):
+        if not _has_table(conn, STATS_TABLE):
+            raise RuntimeError(f"{db_path} has no {STATS_TABLE} table (run migrations)")
+
+        report: dict[str, Any] = {"db_bytes_before": used_bytes(conn), "rolled": []}
+
+        if max_age_days is not None:
+            cutoff = today - max_age_days * DAY_S
+            day = _oldest_day(conn)
+            while day is not None and day < cutoff:
+                if rolled := rollup_day(conn, day, root):
+                    report["rolled"].append({**rolled, "reason": "age"})
+                day = _oldest_day(conn, day + DAY_S)
+
+        report["over_budget"] = False
+        if max_db_mb is not None:
+            budget = int(max_db_mb * 1024 * 1024)
+            floor = today - (max(keep_days, 1) - 1) * DAY_S
+            while used_bytes(conn) > budget:
+                day = _oldest_day(conn)
+                if day is None or day >= floor:
+                    report["over_budget"] = True
+                    break
+                if rolled := rollup_day(conn, day, root):
+                    report["rolled"].append({**rolled, "reason": "size"})
+
+        if stats_days is not None:
+            report["stats_pruned"] = conn.execute(
+                f"DELETE FROM {STATS_TABLE} WHERE day_timestamp < ?", (today - stats_days * DAY_S,),
+            ).rowcount
+
+        # Deleted pages only go back to the filesystem on a vacuum
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            conn.execute("PRAGMA incremental_vacuum")
+        elif vacuum and report["rolled"]:
+            conn.execute("VACUUM")
+
+        report["db_bytes_after"] = used_bytes(conn)
+        report["runs_archived"] = sum(r["runs"] for r in report["rolled"])
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="module_retention",
+        description="Roll old module_runs into daily per-module stats, archive and prune them.",
+    )
+    parser.add_argument(
+        "--db-path",
+        default=str(MODULES_DIR.parent.parent / "rf_signals.db"),
+        help="Path to rf_signals.db (default: ../rf_signals.db)",
+    )
+    parser.add_argument(
+        "--max-age-days", type=int, default=DEFAULT_MAX_AGE_DAYS,
+        help=f"Roll up days older than the last N full days (default: {DEFAULT_MAX_AGE_DAYS}; -1 disables)",
+    )
+    parser.add_argument("--max-db-mb", type=float, help="Then roll up oldest days until the DB uses at most M MB")
+    parser.add_argument(
+        "--keep-days", type=int, default=DEFAULT_KEEP_DAYS,
+        help=f"Days (including today) size pruning never touches (default: {DEFAULT_KEEP_DAYS})",
+    )
+    parser.add_argument(
+        "--stats-days", type=int, default=DEFAULT_STATS_DAYS,
+        help=f"Delete daily stats older than N days (default: {DEFAULT_STATS_DAYS}; -1 keeps them)",
+    )
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to return freed space to the filesystem")
+    opts = parser.parse_args()
+
+    try:
+        report = apply_retention(
+            opts.db_path,
+            max_age_days=None if opts.max_age_days < 0 else opts.max_age_days,
+            max_db_mb=opts.max_db_mb,
+            keep_days=opts.keep_days,
+            stats_days=None if opts.stats_days < 0 else opts.stats_days,
+            vacuum=opts.vacuum,
+        )
+    except (RuntimeError, sqlite3.Error, OSError) as e:
+        print(json.dumps({"success": False, "error": str(e)}))
+        sys.exit(1)
+    print(json.dumps({"success": True, **report}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""
+Bulk ingest of module findings into rf_signals.db devices/signals/networks.
+
+wifi_recon, net_discover, packet_manipulator arp-scan, nbtscan_scanner and
+spectrum_sweep find emitters and hosts but only printed them, so nothing
+they saw reached the tables the map reads unless TS code re-inserted it
+row by row. They now hand their results to an RFIngest, which writes a
+whole run's observations in one transaction with executemany() upserts:
+
+    ingest = self.rf_ingest(args)        # None with --no-ingest
+    if ingest is not None:
+        ingest.ingest(devices=[...], signals=[...], networks=[...])
+        ingest.record_hosts(hosts)       # LAN hosts keyed by MAC
+
+Rows are plain dicts (see ingest() for the keys). Timestamps may be unix
+seconds or milliseconds; the tables store milliseconds. Upserts merge the
+way signal-repository.ts does: first_seen/last_seen widen, freq_min/max
+widen, avg_power is averaged with the stored value, metadata is merged
+key by key (json_patch) and a known type or manufacturer is never
+replaced by an unknown one. Signals are keyed by signal_id, by default
+"<source>:<device_id>:<timestamp>", so re-running a module does not
+duplicate them. Every signal's device is upserted too.
+
+signals.latitude/longitude are NOT NULL. A signal without coordinates is
+placed at the sensor: $ARGOS_POSITION ("lat,lon[,alt]") or the current
+gpsd fix ($ARGOS_GPSD, default localhost:2947). Without either it is
+skipped and counted; its device is still recorded. Like campaign state,
+ingest never fails the module's run: errors are logged and counted.
+"""
+
+import contextlib
+import json
+import logging
+import math
+import os
+import socket
+import sqlite3
+import time
+from collections.abc import Iterable
+from typing import Any
+
+logger = logging.getLogger("rf_ingest")
+
+BUSY_TIMEOUT_MS = 5000
+GPSD_TIMEOUT = 2.0  # seconds to wait for a fix
+
+# Ranges DbSignalSchema (src/lib/schemas/database.ts) accepts
+POWER_RANGE = (-120.0, 0.0)
+FREQ_RANGE_MHZ = (1.0, 6000.0)
+
+_DEVICE_COLUMNS = (
+    "device_id", "type", "manufacturer", "first_seen", "last_seen",
+    "avg_power", "freq_min", "freq_max", "metadata",
+)
+_SIGNAL_COLUMNS = (
+    "signal_id", "device_id", "timestamp", "latitude", "longitude", "altitude",
+    "power", "frequency", "bandwidth", "modulation", "source", "metadata",
+)
+_NETWORK_COLUMNS = (
+    "network_id", "name", "type", "encryption", "channel", "first_seen",
+    "last_seen", "center_lat", "center_lon", "radius",
+)
+
+
+def _insert(table: str, columns: tuple[str, ...]) -> str:
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)}) "
+    )
+
+
+def _min(table: str, column: str, fn: str = "MIN") -> str:
+    return (
+        f"{column} = {fn}(COALESCE({table}.{column}, excluded.{column}),"
+        f" COALESCE(excluded.{column}, {table}.{column}))"
+    )
+
+
+_UPSERT_DEVICE = _insert("devices", _DEVICE_COLUMNS) + (
+    "ON CONFLICT(device_id) DO UPDATE SET "
+    "type = CASE WHEN devices.type IN ('', 'unknown') THEN excluded.type ELSE devices.type END, "
+    "manufacturer = COALESCE(NULLIF(excluded.manufacturer, ''), devices.manufacturer), "
+    f"{_min('devices', 'first_seen')}, {_min('devices', 'last_seen', 'MAX')}, "
+    "avg_power = CASE WHEN excluded.avg_power IS NULL THEN devices.avg_power"
+    " WHEN devices.avg_power IS NULL THEN excluded.avg_power"
+    " ELSE (devices.avg_power + excluded.avg_power) / 2 END, "
+    f"{_min('devices', 'freq_min')}, {_min('devices', 'freq_max', 'MAX')}, "
+    "metadata = CASE WHEN excluded.metadata IS NULL THEN devices.metadata"
+    " WHEN json_valid(devices.metadata) THEN json_patch(devices.metadata, excluded.metadata)"
+    " ELSE excluded.metadata END"
+)
+
+_INSERT_SIGNAL = _insert("signals", _SIGNAL_COLUMNS) + "ON CONFLICT(signal_id) DO NOTHING"
+
+_UPSERT_NETWORK = _insert("networks", _NETWORK_COLUMNS) + (
+    "ON CONFLICT(network_id) DO UPDATE SET "
+    "name = COALESCE(NULLIF(excluded.name, ''), networks.name), "
+    "encryption = COALESCE(NULLIF(excluded.encryption, ''), networks.encryption), "
+    "channel = COALESCE(excluded.channel, networks.channel), "
+    f"{_min('networks', 'first_seen')}, {_min('networks', 'last_seen', 'MAX')}, "
+    "center_lat = COALESCE(excluded.center_lat, networks.center_lat), "
+    "center_lon = COALESCE(excluded.center_lon, networks.center_lon), "
+    "radius = COALESCE(excluded.radius, networks.radius)"
+)
+
+_missing_warned: set[str] = set()
+_position: tuple[float, float, float] | None = None
+_position_resolved = False
+
+
+# ── Helpers ────────────────────────────────────────────────────────
+
+
+def to_ms(value: Any, default: int | None = None) -> int | None:
+    """Unix seconds or milliseconds (int, float or numeric str) as milliseconds."""
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(ts) or ts <= 0:
+        return default
+    return int(ts * 1000) if ts < 1e11 else int(ts)
+
+
+def _number(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _channel(value: Any) -> int | None:
+    number = _number(value)
+    return int(number) if number is not None and number > 0 else None
+
+
+def _device_key(value: Any) -> str | None:
+    """device_id as stored: MAC addresses upper-cased, as Kismet reports them."""
+    if value in (None, ""):
+        return None
+    key = str(value).strip()
+    if len(key) == 17 and key.count(":") == 5:
+        return key.upper()
+    return key
+
+
+def _json(metadata: Any) -> str | None:
+    """Metadata as a JSON object, dropping empty values (json_patch would delete them)."""
+    if not metadata:
+        return None
+    if isinstance(metadata, str):
+        return metadata
+    cleaned = {k: v for k, v in metadata.items() if v not in (None, "", [], {})}
+    return json.dumps(cleaned, default=str) if cleaned else None
+
+
+def synthetic_device_id(kind: str, frequency_mhz: float, power_dbm: float) -> str:
+    """Device id for an emitter with no hardware address; matches geo.ts generateDeviceId()."""
+    return f"{kind}_{math.floor(frequency_mhz)}_{math.floor(power_dbm / 10) * 10}"
+
+
+def _gpsd_fix(host: str, port: int) -> tuple[float, float, float] | None:
+    deadline = time.monotonic() + GPSD_TIMEOUT
+    with socket.create_connection((host, port), timeout=GPSD_TIMEOUT) as sock:
+        sock.sendall(b'?WATCH={"enable":true,"json":true}\n')
+        buf = b""
+        while time.monotonic() < deadline:
+            sock.settimeout(max(0.05, deadline - time.monotonic()))
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                with contextlib.suppress(ValueError):
+                    msg = json.loads(line)
+                    if msg.get("class") == "TPV" and msg.get("mode", 0) >= 2 and "lat" in msg and "lon" in msg:
+                        return float(msg["lat"]), float(msg["lon"]), float(msg.get("alt") or 0)
+    return None
+
+
+def sensor_position() -> tuple[float, float, float] | None:
+    """(lat, lon, alt) of this sensor: $ARGOS_POSITION, else gpsd's fix; resolved once."""
+    global _position, _position_resolved
+    if _position_resolved:
+        return _position
+    _position_resolved = True
+
+    env = os.environ.get("ARGOS_POSITION", "")
+    if env:
+        parts = [_number(p) for p in env.split(",")]
+        if len(parts) >= 2 and None not in parts[:2]:
+            _position = (parts[0], parts[1], parts[2] if len(parts) > 2 and parts[2] is not None else 0.0)
+            return _position
+        logger.warning("Ignoring malformed ARGOS_POSITION %r (want lat,lon[,alt])", env)
+
+    host, _, port = os.environ.get("ARGOS_GPSD", "localhost:2947").partition(":")
+    try:
+        _position = _gpsd_fix(host, int(port or 2947))
+    except (OSError, ValueError) as e:
+        logger.debug("No gpsd fix from %s: %s", host, e)
+    return _position
+
+
+# ── Ingest ─────────────────────────────────────────────────────────
+
+
+class RFIngest:
+    """Batch upserts of one module's observations into rf_signals.db."""
+
+    def __init__(self, db_path: str, source: str) -> None:
+        self.db_path = db_path
+        self.source = source
+
+    def _device_rows(self, devices: Iterable[dict[str, Any]], now: int) -> dict[str, dict[str, Any]]:
+        """Merge device dicts by device_id so each is upserted once per batch."""
+        merged: dict[str, dict[str, Any]] = {}
+        for d in devices:
+            device_id = _device_key(d.get("device_id") or d.get("mac"))
+            if device_id is None:
+                continue
+            seen = to_ms(d.get("last_seen") or d.get("timestamp"), now)
+            power = _number(d.get("avg_power", d.get("power")))
+            freq = _number(d.get("frequency"))
+            row = merged.get(device_id)
+            if row is None:
+                merged[device_id] = {
+                    "device_id": device_id,
+                    "type": d.get("type") or "unknown",
+                    "manufacturer": d.get("manufacturer") or d.get("vendor") or None,
+                    "first_seen": to_ms(d.get("first_seen"), seen),
+                    "last_seen": seen,
+                    "powers": [power] if power is not None else [],
+                    "freq_min": _number(d.get("freq_min")) or freq,
+                    "freq_max": _number(d.get("freq_max")) or freq,
+                    "metadata": dict(d.get("metadata") or {}),
+                }
+                continue
+            if row["type"] == "unknown" and d.get("type"):
+                row["type"] = d["type"]
+            row["manufacturer"] = row["manufacturer"] or d.get("manufacturer") or d.get("vendor") or None
+            row["first_seen"] = min(row["first_seen"], to_ms(d.get("first_seen"), seen))
+            row["last_seen"] = max(row["last_seen"], seen)
+            if power is not None:
+                row["powers"].append(power)
+            if freq is not None:
+                row["freq_min"] = min(row["freq_min"] or freq, freq)
+                row["freq_max"] = max(row["freq_max"] or freq, freq)
+            row["metadata"].update(d.get("metadata") or {})
+        return merged
+
+    def ingest(
+        self,
+        devices: Iterable[dict[str, Any]] = (),
+        signals: Iterable[dict[str, Any]] = (),
+        networks: Iterable[dict[str, Any]] = (),
+        sensor_fallback: bool = True,
+    ) -> dict[str, int]:
+        """
+        Upsert observations in one transaction and return per-table counts
+        of rows written (signals already stored are not counted).
+
+        devices:  device_id|mac, type, manufacturer|vendor, first_seen,
+                  last_seen|timestamp, avg_power|power (dBm), frequency |
+                  freq_min/freq_max (MHz), metadata (dict)
+        signals:  device_id|mac, frequency (MHz), power (dBm), timestamp,
+                  latitude, longitude, altitude, bandwidth, modulation,
+                  signal_id, type (of its device), metadata
+        networks: network_id|bssid, name|ssid, type (default wifi),
+                  encryption, channel, first_seen, last_seen, center_lat,
+                  center_lon, radius
+
+        With sensor_fallback=False, signals without coordinates are
+        skipped rather than placed at the sensor (for observations whose
+        time, and so the sensor's position then, is not now).
+        """
+        now = int(time.time() * 1000)
+        devices = list(devices)
+        counts = {"devices": 0, "signals": 0, "networks": 0, "skipped": 0}
+
+        signal_params = []
+        for s in signals:
+            freq, power = _number(s.get("frequency")), _number(s.get("power"))
+            if (freq is None or power is None
+                    or not FREQ_RANGE_MHZ[0] <= freq <= FREQ_RANGE_MHZ[1]
+                    or not POWER_RANGE[0] <= power <= POWER_RANGE[1]):
+                counts["skipped"] += 1
+                continue
+            ts = to_ms(s.get("timestamp"), now)
+            device_id = _device_key(s.get("device_id") or s.get("mac"))
+            if device_id is not None:
+                devices.append({
+                    "device_id": device_id, "type": s.get("type"), "timestamp": ts,
+                    "power": power, "frequency": freq,
+                })
+            lat, lon = _number(s.get("latitude")), _number(s.get("longitude"))
+            alt = _number(s.get("altitude")) or 0.0
+            if (lat is None or lon is None) and sensor_fallback and (pos := sensor_position()):
+                lat, lon, alt = pos
+            if lat is None or lon is None:
+                counts["skipped"] += 1
+                continue
+            signal_params.append((
+                s.get("signal_id") or f"{self.source}:{device_id or freq}:{ts}",
+                device_id, ts, lat, lon, alt, power, freq,
+                _number(s.get("bandwidth")), s.get("modulation") or None,
+                self.source, _json(s.get("metadata")),
+            ))
+
+        device_params = [
+            (
+                row["device_id"], row["type"], row["manufacturer"], row["first_seen"], row["last_seen"],
+                sum(row["powers"]) / len(row["powers"]) if row["powers"] else None,
+                row["freq_min"], row["freq_max"], _json(row["metadata"]),
+            )
+            for row in self._device_rows(devices, now).values()
+        ]
+
+        network_params = []
+        for n in networks:
+            network_id = _device_key(n.get("network_id") or n.get("bssid"))
+            if network_id is None:
+                continue
+            seen = to_ms(n.get("last_seen"), now)
+            network_params.append((
+                network_id, n.get("name") or n.get("ssid") or None, n.get("type") or "wifi",
+                n.get("encryption") or None, _channel(n.get("channel")),
+                to_ms(n.get("first_seen"), seen), seen,
+                _number(n.get("center_lat")), _number(n.get("center_lon")), _number(n.get("radius")),
+            ))
+
+        if not (device_params or signal_params or network_params):
+            return counts
+        table = "devices"
+        try:
+            with contextlib.closing(sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000)) as conn:
+                with conn:
+                    # Devices first: signals reference them
+                    for table, sql, params in (
+                        ("devices", _UPSERT_DEVICE, device_params),
+                        ("signals", _INSERT_SIGNAL, signal_params),
+                        ("networks", _UPSERT_NETWORK, network_params),
+                    ):
+                        if params:
+                            counts[table] = conn.executemany(sql, params).rowcount
+        except sqlite3.Error as e:
+            self._failed(table, e)
+            return {"devices": 0, "signals": 0, "networks": 0,
+                    "skipped": counts["skipped"] + len(device_params) + len(signal_params) + len(network_params)}
+        logger.info(
+            "Ingested %d devices, %d signals, %d networks into %s",
+            counts["devices"], counts["signals"], counts["networks"], self.db_path,
+        )
+        return counts
+
+    def record_hosts(self, hosts: Iterable[dict[str, Any]], device_type: str = "host") -> dict[str, int]:
+        """Upsert discovered LAN hosts ({ip, mac, vendor?, hostname?, netbios_name?}) as devices."""
+        return self.ingest(devices=(
+            {
+                "mac": h["mac"],
+                "type": device_type,
+                "vendor": h.get("vendor"),
+                "metadata": {
+                    "ip": h.get("ip"),
+                    "hostname": h.get("hostname"),
+                    "netbios_name": h.get("netbios_name"),
+                    "source": self.source,
+                },
+            }
+            for h in hosts if h.get("mac")
+        ))
+
+    def _failed(self, table: str, exc: sqlite3.Error) -> None:
+        if "no such table" not in str(exc):
+            logger.warning("RF ingest into %s failed: %s", table, exc)
+        elif table not in _missing_warned:
+            _missing_warned.add(table)
+            logger.warning("%s has no %s table; findings not ingested", self.db_path, table)
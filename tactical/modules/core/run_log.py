@@ -0,0 +1,339 @@
+"""
+Batched module_runs writer — one WAL connection per process and DB file.
+
+TacticalModule.log_run() used to open a fresh sqlite3 connection for every
+INSERT and commit it on its own, which collides with the dashboard reading
+rf_signals.db and pays a full fsync per row. RunLogWriter keeps a single
+connection on a background thread (journal_mode=WAL, synchronous=NORMAL),
+queues rows from any thread and writes them in batched transactions.
+
+Rows are flushed every FLUSH_INTERVAL seconds or BATCH_SIZE rows, whichever
+comes first, and on interpreter exit. If the queue is full (the DB is
+wedged) rows are dropped rather than blocking the module; stats() reports
+flush latency and dropped-row counts.
+
+Rows for module_run_spans (per-phase timings, core/spans.py) go through
+the same writer and transactions, keyed by module_runs.run_id.
+
+One run, one row. module_runner.ts logs every run it starts, and most
+modules log their own richer row too, so each run used to land twice
+through two connections. The runner now passes its run_id down
+(ARGOS_RUN_ID, or "run_id" in a daemon request) and, for a spawned
+module, a pipe on ARGOS_RUN_LOG_FD: TacticalModule.execute() hands that
+to use_runner_pipe() and rows go to the runner instead of the DB, which
+merges them with its own by run_id and writes them in one transaction.
+Where rows are written here (daemon, scheduler, standalone runs) and
+module_runs.run_id is unique (20261017_unique_module_run_id.sql), an
+insert for a run_id that is already there merges into that row, with
+this side's non-NULL fields taking precedence over the runner's.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from core import jsonio
+
+logger = logging.getLogger("run_log")
+
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 0.5  # seconds
+MAX_QUEUE = 1000
+BUSY_TIMEOUT_MS = 5000
+EXIT_FLUSH_TIMEOUT = 5.0  # seconds
+
+# Columns a row may carry. Ones added by later migrations
+# (20261017_add_module_run_*.sql) are skipped on DBs that lack them.
+_COLUMNS = (
+    "engagement_id", "module_name", "args", "exit_code", "stdout", "stderr",
+    "duration_ms", "stdout_artifact", "stderr_artifact", "resources", "run_id",
+    "profile_path", "input_size",
+)
+_SPAN_COLUMNS = ("run_id", "module_name", "name", "start_ms", "duration_ms", "depth")
+
+TABLES: dict[str, tuple[str, ...]] = {
+    "module_runs": _COLUMNS,
+    "module_run_spans": _SPAN_COLUMNS,
+}
+
+
+def _insert_sql(table: str, columns: tuple[str, ...], merge_on: str | None = None) -> str:
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+    if merge_on is None:
+        return sql
+    updates = ", ".join(f"{c} = COALESCE(excluded.{c}, {table}.{c})" for c in columns if c != merge_on)
+    return f"{sql} ON CONFLICT ({merge_on}) DO UPDATE SET {updates}"
+
+
+def _unique_run_id(conn: sqlite3.Connection) -> bool:
+    """True when module_runs.run_id has a unique index, so rows can merge on it."""
+    for index in conn.execute("PRAGMA index_list(module_runs)"):
+        if index[2] and [c[2] for c in conn.execute(f"PRAGMA index_info({index[1]})")] == ["run_id"]:
+            return True
+    return False
+
+
+class RunLogWriter:
+    """Queue module_runs rows and write them in batches from one connection."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=MAX_QUEUE)
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "queued": 0,
+            "written": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+        self._columns: dict[str, tuple[str, ...]] = dict(TABLES)
+        self._merge_on: dict[str, str] = {}
+        self._thread = threading.Thread(
+            target=self._run, name=f"run-log:{db_path}", daemon=True,
+        )
+        self._thread.start()
+
+    # ── Producer side ──────────────────────────────────────────────
+
+    def submit(self, row: dict[str, Any], table: str = "module_runs") -> bool:
+        """Queue one row for table (see TABLES). Returns False (and counts a drop) if the queue is full."""
+        try:
+            self._queue.put_nowait((table, row))
+        except queue.Full:
+            self._count("dropped", 1)
+            logger.warning("%s queue full, dropped row for %s", table, row.get("module_name"))
+            return False
+        self._count("queued", 1)
+        return True
+
+    def flush(self, timeout: float = EXIT_FLUSH_TIMEOUT) -> bool:
+        """Block until every row queued so far is written. Returns False on timeout."""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = EXIT_FLUSH_TIMEOUT) -> None:
+        """Flush pending rows and stop the writer thread."""
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        stats = self.stats()
+        if stats["queued"]:
+            logger.debug(
+                "module_runs writer: %d written in %d flushes (max %.1fms), %d dropped",
+                stats["written"], stats["flushes"], stats["max_flush_ms"], stats["dropped"],
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Counters plus flush latency (ms) since the writer started."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        total_ms = stats.pop("total_flush_ms")
+        stats["avg_flush_ms"] = round(total_ms / stats["flushes"], 2) if stats["flushes"] else 0.0
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def _count(self, key: str, n: int) -> None:
+        with self._stats_lock:
+            self._stats[key] += n
+
+    # ── Writer thread ──────────────────────────────────────────────
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        for table, columns in TABLES.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            self._columns[table] = tuple(c for c in columns if c in existing)
+            missing = [c for c in columns if c not in existing]
+            if not existing:
+                logger.info("No %s table (run migrations); not logging to it", table)
+            elif missing:
+                logger.info("%s lacks %s (run migrations); not logging them", table, ", ".join(missing))
+        if "run_id" in self._columns["module_runs"] and _unique_run_id(conn):
+            self._merge_on["module_runs"] = "run_id"
+        return conn
+
+    def _run(self) -> None:
+        conn: sqlite3.Connection | None = None
+        try:
+            while not (self._stop.is_set() and self._queue.empty()):
+                try:
+                    first = self._queue.get(timeout=FLUSH_INTERVAL)
+                except queue.Empty:
+                    continue
+
+                batch = [first]
+                while len(batch) < BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                by_table: dict[str, list[dict[str, Any]]] = {}
+                for item in batch:
+                    if isinstance(item, tuple):
+                        by_table.setdefault(item[0], []).append(item[1])
+                waiters = [item for item in batch if isinstance(item, threading.Event)]
+                if by_table:
+                    if conn is None:
+                        conn = self._connect_or_none()
+                    self._write(conn, by_table)
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _connect_or_none(self) -> sqlite3.Connection | None:
+        try:
+            return self._connect()
+        except sqlite3.Error as e:
+            logger.warning("Failed to open %s for module_runs: %s", self.db_path, e)
+            return None
+
+    def _write(self, conn: sqlite3.Connection | None, by_table: dict[str, list[dict[str, Any]]]) -> None:
+        count = sum(len(rows) for rows in by_table.values())
+        if conn is None:
+            self._count("dropped", count)
+            return
+
+        start = time.monotonic()
+        written = skipped = 0
+        try:
+            with conn:
+                for table, rows in by_table.items():
+                    columns = self._columns.get(table)
+                    if not columns:
+                        skipped += len(rows)
+                        continue
+                    conn.executemany(
+                        _insert_sql(table, columns, self._merge_on.get(table)),
+                        [tuple(row.get(c) for c in columns) for row in rows],
+                    )
+                    written += len(rows)
+        except sqlite3.Error as e:
+            self._count("dropped", count)
+            logger.warning("Failed to log %d row(s) to DB: %s", count, e)
+            return
+        if skipped:
+            self._count("dropped", skipped)
+
+        elapsed_ms = (time.monotonic() - start) * 1000
+        with self._stats_lock:
+            self._stats["written"] += written
+            self._stats["flushes"] += 1
+            self._stats["last_flush_ms"] = round(elapsed_ms, 2)
+            self._stats["max_flush_ms"] = round(max(self._stats["max_flush_ms"], elapsed_ms), 2)
+            self._stats["total_flush_ms"] += elapsed_ms
+
+
+# ── Hand-off to module_runner.ts ───────────────────────────────────
+
+
+class RunnerPipe:
+    """
+    Writer-compatible sink that sends rows to the module_runner.ts that
+    spawned this process, one JSON line per row on an inherited pipe.
+    """
+
+    def __init__(self, fd: int, db_path: str) -> None:
+        self.fd = fd
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._stats = {"queued": 0, "written": 0, "dropped": 0}
+
+    def submit(self, row: dict[str, Any], table: str = "module_runs") -> bool:
+        line = (jsonio.dumps({"db": self.db_path, "table": table, "row": row}) + "\n").encode()
+        with self._lock:
+            self._stats["queued"] += 1
+            try:
+                view = memoryview(line)
+                while view:
+                    view = view[os.write(self.fd, view):]
+            except OSError as e:
+                self._stats["dropped"] += 1
+                logger.warning("Runner log pipe closed, dropped row for %s: %s", row.get("module_name"), e)
+                return False
+            self._stats["written"] += 1
+        return True
+
+    def flush(self, timeout: float = EXIT_FLUSH_TIMEOUT) -> bool:
+        return True
+
+    def close(self, timeout: float = EXIT_FLUSH_TIMEOUT) -> None:
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "pending": 0, "runner_fd": self.fd}
+
+
+_runner_fd: int | None = None
+
+
+def use_runner_pipe(fd: int) -> bool:
+    """
+    Send every row from this process to the runner's pipe on fd instead of
+    the DB. Returns False (rows keep going to the DB) if fd is not open.
+    """
+    global _runner_fd
+    try:
+        os.fstat(fd)
+    except OSError:
+        logger.debug("Runner log fd %d is not open; writing to the DB", fd)
+        return False
+    _runner_fd = fd
+    return True
+
+
+# ── Per-process registry ───────────────────────────────────────────
+
+_writers: dict[str, RunLogWriter | RunnerPipe] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_path: str) -> RunLogWriter | RunnerPipe:
+    """Return the process-wide writer for db_path, starting it on first use."""
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None:
+            if _runner_fd is not None:
+                writer = _writers[db_path] = RunnerPipe(_runner_fd, db_path)
+            else:
+                writer = _writers[db_path] = RunLogWriter(db_path)
+        return writer
+
+
+def all_stats() -> dict[str, dict[str, Any]]:
+    """Stats for every writer opened in this process, keyed by DB path."""
+    with _writers_lock:
+        return {path: w.stats() for path, w in _writers.items()}
+
+
+@atexit.register
+def _close_all() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
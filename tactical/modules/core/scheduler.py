@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Module job scheduler — run a list or DAG of module invocations in parallel.
+
+Workflows such as 02_network_survey and 11_forensic_analysis step through
+independent modules one at a time. The scheduler takes a plan of jobs,
+starts each as soon as its dependencies succeed, and keeps a bounded pool
+busy while capping how many jobs of each resource class run at once:
+
+    hackrf    one HackRF One, shared by every SDR module
+    monitor   one monitor-mode adapter (Alfa), shared by WiFi modules
+    cpu       local analysis (binaries, disk images, pcaps)
+    network   scans and remote enumeration
+
+Plan (JSON file or stdin):
+
+    {
+      "name": "network survey 10.0.0.0/24",
+      "campaign_id": 3,                         # optional; created if absent
+      "max_workers": 6,                         # optional
+      "limits": {"network": 4},                 # optional, merged with DEFAULT_LIMITS
+      "jobs": [
+        {"id": "arp", "module": "net_discover", "args": ["--range", "10.0.0.0/24"]},
+        {"id": "ssl", "module": "ssl_scanner", "args": ["--host", "10.0.0.1"],
+         "after": ["arp"], "resource": "network", "timeout": 600},
+        {"id": "ports", "module": "port_scanner", "args": ["--target", "10.0.0.1"],
+         "after": ["arp"], "timeout": "auto"}
+      ]
+    }
+
+Each job runs as its own `python3 <module>.py` process, exactly as
+module_runner.ts spawns it, with ARGOS_ENGAGEMENT_ID set so its module_runs
+row links to the engagement and its findings land in the campaign's
+shared host/service state (core/state_store.py). Every job is recorded in
+`engagements` (planned → active → success/failure/aborted), and results stream to
+stdout as one JSON line per finished job, followed by a summary line.
+A job whose dependency did not succeed is aborted without running.
+Each job's record carries its learned duration `estimate` (p50/p95 of
+past runs on similar-sized input, core/estimator.py); with "timeout":
+"auto" the job and the module's tools are limited by it instead of a
+fixed number.
+Class limits only pace this plan; the modules' own device leases
+(core/locks.py) also serialise against runs started elsewhere.
+
+Usage:
+    python3 tactical/modules/core/scheduler.py plan.json
+    python3 tactical/modules/core/scheduler.py - < plan.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+MODULES_DIR = Path(__file__).resolve().parent.parent
+if str(MODULES_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULES_DIR))
+
+from core import jsonio  # noqa: E402
+
+logger = logging.getLogger("scheduler")
+
+DEFAULT_LIMITS = {
+    "hackrf": 1,
+    "monitor": 1,
+    "cpu": max(1, (os.cpu_count() or 2) - 1),
+    "network": 4,
+}
+
+# Resource class for modules that are not plain network tools. Jobs can
+# override this with "resource". Classed by what a module holds while it
+# runs, not by its subject: gsm_decoder decodes a recorded .cfile (cpu)
+# and wifi_recon only reads the Kismet DB (default class), so neither
+# waits on the HackRF or the monitor adapter.
+MODULE_RESOURCES = {
+    "spectrum_sweep": "hackrf",
+    "hackrf_capture": "hackrf",
+    "rf_replay": "hackrf",
+    "wifi_capture": "monitor",
+    "wifi_deauth": "monitor",
+    "wifi_handshake": "monitor",
+    "wifi_rogue_ap": "monitor",
+    "wps_attacker": "monitor",
+    "binary_analyzer": "cpu",
+    "re_analyzer": "cpu",
+    "disk_analyzer": "cpu",
+    "file_carver": "cpu",
+    "android_decompiler": "cpu",
+    "hash_cracker": "cpu",
+    "wifi_decrypt": "cpu",
+    "gsm_decoder": "cpu",
+    "traffic_analyzer": "cpu",
+}
+
+DEFAULT_JOB_TIMEOUT = 3600
+# Seconds a timed-out job gets after SIGTERM to stop its tools and exit
+# before SIGKILL (covers the tools' own SIGTERM→SIGKILL grace)
+JOB_KILL_GRACE = 15
+# Headroom over an adaptive job's learned timeout, so the module's own
+# (equal) tool timeout fires first and it still reports a result
+ADAPTIVE_JOB_SLACK = 60
+
+_RESULT_PREVIEW_CHARS = 100_000
+
+
+@dataclass
+class Job:
+    """One module invocation in a plan."""
+
+    id: str
+    module: str
+    args: list[str]
+    after: list[str] = field(default_factory=list)
+    resource: str = "network"
+    timeout: int = DEFAULT_JOB_TIMEOUT
+    adaptive: bool = False
+    engagement_id: int | None = None
+    estimate: dict[str, Any] | None = None
+
+    @classmethod
+    def from_spec(cls, spec: dict[str, Any]) -> "Job":
+        module = str(spec["module"]).removesuffix(".py")
+        adaptive = spec.get("timeout") == "auto"
+        return cls(
+            id=str(spec.get("id") or module),
+            module=module,
+            args=[str(a) for a in spec.get("args", [])],
+            after=[str(d) for d in spec.get("after", [])],
+            resource=str(spec.get("resource") or MODULE_RESOURCES.get(module, "network")),
+            timeout=DEFAULT_JOB_TIMEOUT if adaptive else int(spec.get("timeout") or DEFAULT_JOB_TIMEOUT),
+            adaptive=adaptive,
+        )
+
+
+def load_plan(spec: dict[str, Any]) -> list[Job]:
+    """Build jobs from a plan, rejecting unknown modules, dependencies and cycles."""
+    jobs = [Job.from_spec(s) for s in spec.get("jobs", [])]
+    by_id: dict[str, Job] = {}
+    for job in jobs:
+        if job.id in by_id:
+            raise ValueError(f"Duplicate job id: {job.id}")
+        if not (MODULES_DIR / f"{job.module}.py").exists() or job.module == "base_module":
+            raise ValueError(f"Job {job.id}: module not found: {job.module}")
+        by_id[job.id] = job
+    for job in jobs:
+        missing = [d for d in job.after if d not in by_id]
+        if missing:
+            raise ValueError(f"Job {job.id}: unknown dependencies {missing}")
+
+    # Kahn's algorithm — anything left over sits on a cycle.
+    indegree = {job.id: len(job.after) for job in jobs}
+    ready = [jid for jid, n in indegree.items() if n == 0]
+    seen = 0
+    while ready:
+        jid = ready.pop()
+        seen += 1
+        for job in jobs:
+            if jid in job.after:
+                indegree[job.id] -= 1
+                if indegree[job.id] == 0:
+                    ready.append(job.id)
+    if seen != len(jobs):
+        raise ValueError("Plan has a dependency cycle")
+    return jobs
+
+
+def estimate_jobs(jobs: list[Job], db_path: str) -> int | None:
+    """
+    Attach each job's duration estimate, applying it as the timeout of
+    "auto" jobs. Returns the plan's ETA in ms — the longest chain of
+    median durations through the dependency graph, ignoring class limits
+    — or None when some job has no history.
+    """
+    from core.estimator import estimate
+
+    finish: dict[str, int] = {}
+    complete = True
+    for job in jobs:
+        est = estimate(db_path, job.module, job.args)
+        job.estimate = est.to_dict()
+        if job.adaptive:
+            # An explicit --timeout in the job's args wins over the estimate
+            explicit = _module_timeout(job.args)
+            job.timeout = (explicit or est.timeout_s) + ADAPTIVE_JOB_SLACK
+        complete = complete and est.p50_ms is not None
+
+    by_id = {job.id: job for job in jobs}
+
+    def finish_ms(job: Job) -> int:
+        if job.id not in finish:
+            start = max((finish_ms(by_id[d]) for d in job.after), default=0)
+            finish[job.id] = start + ((job.estimate or {}).get("p50_ms") or 0)
+        return finish[job.id]
+
+    eta = max((finish_ms(job) for job in jobs), default=0)
+    return eta if complete else None
+
+
+class EngagementLog:
+    """Records scheduled jobs as rows in the engagements table."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if db_path and Path(db_path).exists():
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA busy_timeout=5000")
+        else:
+            logger.warning("DB not found at %s, engagements will not be recorded", db_path)
+
+    def ensure_campaign(self, campaign_id: int | None, name: str) -> int | None:
+        if self._conn is None or campaign_id is not None:
+            return campaign_id
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO campaigns (name, target_description) VALUES (?, ?)",
+                (name, "Created by module scheduler"),
+            )
+        return cur.lastrowid
+
+    def plan(self, campaign_id: int | None, job: Job) -> None:
+        if self._conn is None or campaign_id is None:
+            return
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO engagements (campaign_id, module_name, target, parameters, status) "
+                "VALUES (?, ?, ?, ?, 'planned')",
+                (campaign_id, job.module, _target_of(job.args), json.dumps({"id": job.id, "args": job.args})),
+            )
+        job.engagement_id = cur.lastrowid
+
+    def update(self, job: Job, **fields: Any) -> None:
+        if self._conn is None or job.engagement_id is None:
+            return
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE engagements SET {columns} WHERE id = ?",
+                (*fields.values(), job.engagement_id),
+            )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+
+def _module_timeout(args: list[str]) -> int | None:
+    """The job's own --timeout N / --timeout=N in seconds (last one wins, as in argparse)."""
+    value = None
+    for i, arg in enumerate(args):
+        if arg == "--timeout" and i + 1 < len(args):
+            value = args[i + 1]
+        elif arg.startswith("--timeout="):
+            value = arg.partition("=")[2]
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _target_of(args: list[str]) -> str | None:
+    """Best-effort target for the engagements row (value after a target-ish flag)."""
+    for flag in ("--target", "--host", "--range", "--domain", "--url", "--file", "--image", "--input-file"):
+        if flag in args:
+            idx = args.index(flag)
+            if idx + 1 < len(args):
+                return args[idx + 1]
+    return None
+
+
+def run_job(job: Job, db_path: str) -> dict[str, Any]:
+    """Run one module in a child interpreter and return its result record."""
+    argv = [sys.executable, str(MODULES_DIR / f"{job.module}.py"), *job.args]
+    if db_path and "--db-path" not in job.args:
+        argv += ["--db-path", db_path]
+    env = dict(os.environ)
+    if job.engagement_id is not None:
+        env["ARGOS_ENGAGEMENT_ID"] = str(job.engagement_id)
+    if job.adaptive:
+        env["ARGOS_ADAPTIVE_TIMEOUT"] = "1"
+
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        cwd=MODULES_DIR, env=env,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=job.timeout)
+        exit_code = proc.returncode
+    except subprocess.TimeoutExpired:
+        # SIGTERM first: the module's handler (core/process.py) stops the
+        # tool process groups it started. A bare SIGKILL would leave
+        # hackrf_sweep, airodump and friends running in their own sessions,
+        # still holding the HackRF or adapter the next job leases.
+        proc.terminate()
+        try:
+            stdout, _ = proc.communicate(timeout=JOB_KILL_GRACE)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            stdout, _ = proc.communicate()
+        exit_code = 124
+        stderr = f"Job timed out after {job.timeout}s"
+
+    try:
+        result = jsonio.loads(stdout.strip().splitlines()[-1]) if stdout.strip() else None
+    except ValueError:
+        result = None
+    if not isinstance(result, dict):
+        result = {
+            "status": "error",
+            "module": job.module,
+            "message": stderr.strip().splitlines()[-1] if stderr.strip() else f"exit {exit_code}",
+        }
+    return {
+        "job": job.id,
+        "module": job.module,
+        "resource": job.resource,
+        "engagement_id": job.engagement_id,
+        "exit_code": exit_code,
+        "duration_ms": int((time.monotonic() - start) * 1000),
+        "estimate": job.estimate,
+        "result": result,
+    }
+
+
+class Scheduler:
+    """Dispatch ready jobs onto a worker pool within per-class limits."""
+
+    def __init__(
+        self,
+        jobs: list[Job],
+        db_path: str,
+        max_workers: int | None = None,
+        limits: dict[str, int] | None = None,
+        engagements: EngagementLog | None = None,
+    ) -> None:
+        self.jobs = {job.id: job for job in jobs}
+        self.db_path = db_path
+        # A class limited to 0 would never drain, so the floor is one slot.
+        self.limits = {k: max(1, int(v)) for k, v in {**DEFAULT_LIMITS, **(limits or {})}.items()}
+        self.max_workers = max_workers or sum(self.limits.values())
+        self.engagements = engagements
+
+    def run(self, on_result: Callable[[dict[str, Any]], None]) -> dict[str, Any]:
+        """Run every job, calling on_result as each finishes; returns a summary."""
+        pending = dict(self.jobs)
+        outcome: dict[str, str] = {}
+        running: dict[Future[dict[str, Any]], Job] = {}
+        in_use = {name: 0 for name in self.limits}
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for job in list(pending.values()):
+                    failed = [d for d in job.after if outcome.get(d) not in (None, "success")]
+                    if failed:
+                        del pending[job.id]
+                        outcome[job.id] = "aborted"
+                        record = self._aborted(job, failed)
+                        on_result(record)
+                        continue
+                    if any(d not in outcome for d in job.after):
+                        continue
+                    if len(running) >= self.max_workers:
+                        break
+                    if in_use.get(job.resource, 0) >= self.limits.get(job.resource, 1):
+                        continue
+                    del pending[job.id]
+                    in_use[job.resource] = in_use.get(job.resource, 0) + 1
+                    self._mark(job, status="active", started_at=int(time.time()))
+                    running[pool.submit(run_job, job, self.db_path)] = job
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    in_use[job.resource] -= 1
+                    record = future.result()
+                    ok = record["exit_code"] == 0 and record["result"].get("status") == "success"
+                    outcome[job.id] = "success" if ok else "failure"
+                    self._mark(
+                        job,
+                        status=outcome[job.id],
+                        completed_at=int(time.time()),
+                        result=jsonio.dumps(record["result"])[:_RESULT_PREVIEW_CHARS],
+                        error_message=None if ok else str(record["result"].get("message", ""))[:1000],
+                    )
+                    on_result(record)
+
+        counts: dict[str, int] = {}
+        for status in outcome.values():
+            counts[status] = counts.get(status, 0) + 1
+        return {
+            "summary": True,
+            "jobs": len(self.jobs),
+            **counts,
+            "wall_ms": int((time.monotonic() - start) * 1000),
+        }
+
+    def _aborted(self, job: Job, failed: list[str]) -> dict[str, Any]:
+        message = f"Dependency did not succeed: {', '.join(failed)}"
+        self._mark(job, status="aborted", completed_at=int(time.time()), error_message=message)
+        return {
+            "job": job.id,
+            "module": job.module,
+            "resource": job.resource,
+            "engagement_id": job.engagement_id,
+            "exit_code": None,
+            "duration_ms": 0,
+            "result": {"status": "error", "module": job.module, "message": message},
+        }
+
+    def _mark(self, job: Job, **fields: Any) -> None:
+        if self.engagements is not None:
+            self.engagements.update(job, **fields)
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
+        datefmt="%H:%M:%S",
+        stream=sys.stderr,
+    )
+    parser = argparse.ArgumentParser(
+        prog="module_scheduler",
+        description="Run a plan of tactical module invocations in parallel.",
+    )
+    parser.add_argument("plan", help="Plan JSON file, or - for stdin")
+    parser.add_argument(
+        "--db-path",
+        default=str(MODULES_DIR.parent.parent / "rf_signals.db"),
+        help="Path to rf_signals.db (default: ../rf_signals.db)",
+    )
+    parser.add_argument("--max-workers", type=int, default=0, help="Override the plan's pool size")
+    opts = parser.parse_args()
+
+    try:
+        spec = json.load(sys.stdin if opts.plan == "-" else open(opts.plan))
+        jobs = load_plan(spec)
+    except (OSError, ValueError, KeyError) as e:
+        print(json.dumps({"status": "error", "message": f"Invalid plan: {e}"}))
+        sys.exit(2)
+
+    eta_ms = estimate_jobs(jobs, opts.db_path)
+    if eta_ms is not None:
+        logger.info("Plan ETA ~%ds (longest chain of median job durations)", eta_ms // 1000)
+
+    engagements = EngagementLog(opts.db_path)
+    campaign_id = engagements.ensure_campaign(
+        spec.get("campaign_id"), spec.get("name") or "Scheduled module plan",
+    )
+    for job in jobs:
+        engagements.plan(campaign_id, job)
+
+    def emit(record: dict[str, Any]) -> None:
+        sys.stdout.write(jsonio.dumps(record) + "\n")
+        sys.stdout.flush()
+
+    scheduler = Scheduler(
+        jobs,
+        opts.db_path,
+        max_workers=opts.max_workers or spec.get("max_workers"),
+        limits=spec.get("limits"),
+        engagements=engagements,
+    )
+    try:
+        summary = scheduler.run(emit)
+    finally:
+        engagements.close()
+    emit({**summary, "campaign_id": campaign_id})
+    sys.exit(0 if summary.get("success", 0) == len(jobs) else 1)
+
+
+if __name__ == "__main__":
+    main()
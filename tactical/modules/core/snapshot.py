@@ -0,0 +1,246 @@
+"""
+Point-in-time read-only views of live SQLite databases.
+
+wifi_recon used to open the live Kismet .kismet file and rf_signals.db
+with mode=ro while Kismet and the Node server were writing them. On a
+rollback-journal DB a reader's SHARED lock holds off every writer's commit
+for as long as the query runs, so a long scan stalls capture; and a writer
+mid-commit makes the reader retry or fail with "database is locked".
+open_snapshot() gives analysis code a consistent view that neither side
+waits on:
+
+    wal   the source is in WAL mode: a read-only connection pinned to one
+          read transaction. Writers carry on appending to the WAL; the
+          reader keeps seeing the DB as it was when the snapshot opened.
+    copy  anything else: the SQLite backup API copies the DB a few pages
+          at a time (writers get in between steps) into a file under the
+          snapshot directory, and the caller reads the copy.
+    auto  wal when the file header says WAL, copy otherwise (default).
+
+Copies go to $ARGOS_SNAPSHOT_DIR, else /dev/shm/argos-snapshots (tmpfs),
+else the temp dir. tmpfs is RAM, so only a DB under TMPFS_MAX_BYTES and a
+quarter of MemAvailable is copied there; larger ones go to the temp dir
+on disk. With cache_ttl > 0 a copy is kept and reused by later runs while
+it is younger than cache_ttl, or for as long as the source (and its -wal)
+has not changed; otherwise it is deleted on close. A DB that fits nowhere is
+read in place, as before, with a warning.
+
+    with open_snapshot(path, cache_ttl=30) as conn:
+        conn.execute(...)
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+logger = logging.getLogger("snapshot")
+
+MODES = ("auto", "wal", "copy")
+BUSY_TIMEOUT_MS = 5000
+TMPFS_DIR = Path("/dev/shm")
+# Keep this much of the snapshot filesystem free after a copy
+FREE_MARGIN_BYTES = 64 * 1024 * 1024
+# Largest DB copied to tmpfs, and the share of MemAvailable it may take
+TMPFS_MAX_BYTES = 128 * 1024 * 1024
+TMPFS_MEM_FRACTION = 0.25
+# Backup step size, and how long a stepped copy may take (every write to
+# the source restarts it) before it falls back to one step under a single
+# read lock
+COPY_STEP_PAGES = 256
+COPY_STEP_BUDGET_S = 2.0
+COPY_BUSY_SLEEP = 0.01  # seconds between steps while a writer holds the lock
+
+_WAL_VERSION = 2  # header bytes 18/19 (file format write/read version)
+
+
+def snapshot_dir(size: int = 0) -> Path:
+    """
+    Where a copy of size bytes goes: $ARGOS_SNAPSHOT_DIR, tmpfs if present
+    and the copy is small enough to hold in RAM, else the temp dir.
+    """
+    override = os.environ.get("ARGOS_SNAPSHOT_DIR")
+    if override:
+        return Path(override)
+    if TMPFS_DIR.is_dir() and os.access(TMPFS_DIR, os.W_OK) and _fits_in_ram(size):
+        return TMPFS_DIR / "argos-snapshots"
+    return Path(tempfile.gettempdir()) / "argos-snapshots"
+
+
+def _mem_available() -> int | None:
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _fits_in_ram(size: int) -> bool:
+    if size > TMPFS_MAX_BYTES:
+        return False
+    available = _mem_available()
+    return available is None or size < available * TMPFS_MEM_FRACTION
+
+
+def is_wal(db_path: str) -> bool:
+    """True when the DB file's header marks it as WAL mode."""
+    try:
+        with open(db_path, "rb") as f:
+            header = f.read(20)
+    except OSError:
+        return False
+    return len(header) == 20 and header[18] == _WAL_VERSION and header[19] == _WAL_VERSION
+
+
+def _signature(db_path: str) -> list[int]:
+    """(mtime_ns, size) of the DB and its -wal: changes whenever a write lands."""
+    sig: list[int] = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            sig += [0, 0]
+        else:
+            sig += [st.st_mtime_ns, st.st_size]
+    return sig
+
+
+def _connect_ro(path: str) -> sqlite3.Connection:
+    # Autocommit, so the read transaction is the one we BEGIN ourselves
+    return sqlite3.connect(
+        f"file:{path}?mode=ro", uri=True,
+        timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None,
+    )
+
+
+# ── Modes ──────────────────────────────────────────────────────────
+
+
+def _wal_snapshot(db_path: str) -> sqlite3.Connection:
+    conn = _connect_ro(db_path)
+    try:
+        conn.execute("BEGIN")
+        # The snapshot is taken at the first read, not at BEGIN
+        conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+class _OverBudget(Exception):
+    pass
+
+
+def _backup(db_path: str, tmp: str, pages: int) -> None:
+    deadline = time.monotonic() + COPY_STEP_BUDGET_S
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        if time.monotonic() > deadline:
+            raise _OverBudget
+
+    with contextlib.closing(_connect_ro(db_path)) as src, \
+            contextlib.closing(sqlite3.connect(tmp)) as dst:
+        src.backup(dst, pages=pages, progress=progress if pages > 0 else None, sleep=COPY_BUSY_SLEEP)
+        # Readers of the copy never need a journal
+        dst.execute("PRAGMA journal_mode=DELETE")
+
+
+def _copy(db_path: str, target: Path) -> None:
+    """Back up db_path into target atomically (write a temp file, then rename)."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-", suffix=".db")
+    os.close(fd)
+    try:
+        try:
+            # In steps, so writers are held off for one step at a time
+            _backup(db_path, tmp, COPY_STEP_PAGES)
+        except _OverBudget:
+            # Steady writes keep restarting it: finish under one read lock
+            logger.debug("Stepped snapshot of %s overran; copying in one step", db_path)
+            _backup(db_path, tmp, -1)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _size(db_path: str) -> int:
+    return sum(_signature(db_path)[1::2])
+
+
+def _fits(db_path: str, directory: Path) -> bool:
+    size = _size(db_path)
+    probe = directory if directory.exists() else directory.parent
+    try:
+        free = shutil.disk_usage(probe).free
+    except OSError:
+        return False
+    return size + FREE_MARGIN_BYTES < free
+
+
+def _copy_snapshot(db_path: str, directory: Path, cache_ttl: float) -> tuple[sqlite3.Connection, Path | None]:
+    """Connection to a copy of db_path, plus the copy to delete on close (None if cached)."""
+    key = hashlib.sha1(os.path.realpath(db_path).encode()).hexdigest()[:16]
+    name = Path(db_path).stem
+
+    if cache_ttl > 0:
+        target = directory / f"{name}-{key}.db"
+        meta = target.with_suffix(".json")
+        sig = _signature(db_path)
+        try:
+            cached = json.loads(meta.read_text())
+            fresh = time.time() - cached["created"] < cache_ttl
+            if target.exists() and (fresh or cached["signature"] == sig):
+                logger.debug("Reusing snapshot %s of %s", target, db_path)
+                return _connect_ro(str(target)), None
+        except (OSError, ValueError, KeyError):
+            pass
+        _copy(db_path, target)
+        meta.write_text(json.dumps({"source": db_path, "signature": sig, "created": time.time()}))
+        return _connect_ro(str(target)), None
+
+    target = directory / f"{name}-{key}-{os.getpid()}-{time.monotonic_ns()}.db"
+    _copy(db_path, target)
+    return _connect_ro(str(target)), target
+
+
+# ── Public API ─────────────────────────────────────────────────────
+
+
+@contextlib.contextmanager
+def open_snapshot(db_path: str, mode: str = "auto", cache_ttl: float = 0) -> Iterator[sqlite3.Connection]:
+    """
+    Read-only connection to a consistent snapshot of db_path (see module
+    docstring for the modes). Closed, and an uncached copy deleted, on exit.
+    """
+    if mode not in MODES:
+        raise ValueError(f"snapshot mode must be one of {MODES}, got {mode!r}")
+    if mode == "auto":
+        mode = "wal" if is_wal(db_path) else "copy"
+
+    cleanup: Path | None = None
+    directory = snapshot_dir(_size(db_path))
+    if mode == "wal":
+        conn = _wal_snapshot(db_path)
+    elif _fits(db_path, directory):
+        conn, cleanup = _copy_snapshot(db_path, directory, cache_ttl)
+    else:
+        logger.warning("%s is too large to snapshot in %s; reading it in place", db_path, directory)
+        conn = _connect_ro(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+        if cleanup is not None:
+            cleanup.unlink(missing_ok=True)
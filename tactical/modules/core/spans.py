@@ -0,0 +1,145 @@
+"""
+Per-phase timings for one module run.
+
+When a module is slow, `resources.wall_ms` says how slow but not where the
+time went: process spawn, the external tool, Python parsing, JSON
+serialisation or log_run(). A SpanRecorder collects named spans that
+TacticalModule opens around those phases, and modules around their own:
+
+    with self.span("parse"):
+        entries = self._parse_nmap_xml(stdout)
+
+summary() becomes the envelope's `timings`:
+
+    {"total_ms": 1840.2,
+     "phases": {"spawn": 3.1, "tool": 1702.4, "parse": 96.0, "serialise": 4.2},
+     "unaccounted_ms": 34.5,
+     "spans": [{"name": "spawn", "start_ms": 1.2, "ms": 3.1, "depth": 0}, ...]}
+
+phases sums every span and add() per name; nested spans overlap their
+parent, so phases may add up to more than total_ms. unaccounted_ms is
+the time outside any top-level span (argument handling, module glue).
+
+Spans may be opened from several threads (AsyncTacticalModule collects
+tool output on worker threads); nesting depth is tracked per thread and
+concurrent spans simply overlap, like nested ones.
+
+ARGOS_TIMINGS controls recording:
+
+    (unset), 1, on   timings in the envelope (default)
+    0, off           disabled: span() hands back one shared no-op context
+    db               also write the spans to module_run_spans (migration
+                     20261017_add_module_run_spans.sql), keyed by run_id
+"""
+
+import contextlib
+import os
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+# Spans kept individually per run; phase totals keep counting past it
+MAX_SPANS = 256
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+def timings_mode() -> str:
+    """"off", "on" or "db" from ARGOS_TIMINGS."""
+    value = os.environ.get("ARGOS_TIMINGS", "").strip().lower()
+    if value in ("0", "off", "false", "no"):
+        return "off"
+    if value == "db":
+        return "db"
+    return "on"
+
+
+class SpanRecorder:
+    """Named, possibly nested timing spans relative to the start of a run."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: list[dict[str, Any]] = []
+        self.phases: dict[str, float] = {}
+        self.dropped = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._top_level = 0.0
+
+    @property
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    @_depth.setter
+    def _depth(self, value: int) -> None:
+        self._local.depth = value
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        depth = self._depth
+        self._depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._depth = depth
+            self._record(name, start, end - start, depth)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a phase without a span (many tiny writes, e.g. NDJSON records)."""
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+            if self._depth == 0:
+                self._top_level += seconds
+
+    def add_span(self, name: str, start: float, seconds: float) -> None:
+        """Record a span timed elsewhere (start is a perf_counter() value)."""
+        self._record(name, start, seconds, self._depth)
+
+    def _record(self, name: str, start: float, seconds: float, depth: int) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+            if depth == 0:
+                self._top_level += seconds
+            if len(self.spans) < MAX_SPANS:
+                self.spans.append({
+                    "name": name,
+                    "start_ms": round((start - self.started) * 1000, 2),
+                    "ms": round(seconds * 1000, 2),
+                    "depth": depth,
+                })
+            else:
+                self.dropped += 1
+
+    def summary(self) -> dict[str, Any]:
+        total = time.perf_counter() - self.started
+        summary: dict[str, Any] = {
+            "total_ms": round(total * 1000, 2),
+            "phases": {name: round(s * 1000, 2) for name, s in self.phases.items()},
+            "unaccounted_ms": round(max(0.0, total - self._top_level) * 1000, 2),
+            "spans": list(self.spans),
+        }
+        if self.dropped:
+            summary["spans_dropped"] = self.dropped
+        return summary
+
+    def rows(self, run_id: str, module_name: str) -> list[dict[str, Any]]:
+        """module_run_spans rows for the spans recorded so far."""
+        return [
+            {
+                "run_id": run_id,
+                "module_name": module_name,
+                "name": s["name"],
+                "start_ms": s["start_ms"],
+                "duration_ms": s["ms"],
+                "depth": s["depth"],
+            }
+            for s in self.spans
+        ]
+
+
+def no_span() -> contextlib.AbstractContextManager[None]:
+    """The shared no-op context span() returns when timings are off."""
+    return _NO_SPAN
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Module cold-start report — `python -X importtime`, summarised per module.
+
+For each module this spawns a fresh interpreter (as module_runner.ts does),
+imports the module under -X importtime, then forces its lazy_import()
+stand-ins, and reports:
+
+  - cold_start_ms: wall time of the whole interpreter run
+  - import_ms:     cumulative import time paid at module load
+  - deferred_ms:   import time moved into run() by lazy_import()
+  - top_imports:   heaviest packages (self time) paid at load
+
+Usage:
+    python3 tactical/modules/core/startup_report.py                 # all modules
+    python3 tactical/modules/core/startup_report.py dns_scanner ssh_bruter --top 10
+
+Prints a JSON report to stdout, slowest modules first.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+MODULES_DIR = Path(__file__).resolve().parent.parent
+
+_MARKER = "@@argos-deferred@@"
+
+_SNIPPET = (
+    "import sys\n"
+    "import {module}\n"
+    "sys.stderr.write('{marker}\\n')\n"
+    "from core.lazy import load_all\n"
+    "load_all()\n"
+)
+
+
+def _parse_importtime(lines: list[str]) -> list[tuple[str, int, int]]:
+    """Parse `import time: self | cumulative | name` lines into (name, self_us, cum_us)."""
+    rows = []
+    for line in lines:
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            rows.append((parts[2].rstrip(), int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue
+    return rows
+
+
+def _top_level_ms(rows: list[tuple[str, int, int]]) -> float:
+    """Sum cumulative time of imports triggered directly (not nested in another)."""
+    # importtime indents nested packages; a top-level entry has exactly one
+    # leading space after the separator.
+    total_us = sum(cum for name, _, cum in rows if not name.startswith("  "))
+    return round(total_us / 1000, 2)
+
+
+def profile_module(module: str, top: int) -> dict[str, Any]:
+    """Spawn one cold interpreter for module and summarise its import cost."""
+    snippet = _SNIPPET.format(module=module, marker=_MARKER)
+    start = time.monotonic()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=MODULES_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    cold_start_ms = round((time.monotonic() - start) * 1000, 2)
+
+    lines = proc.stderr.splitlines()
+    split = lines.index(_MARKER) if _MARKER in lines else len(lines)
+    eager = _parse_importtime(lines[:split])
+    deferred = _parse_importtime(lines[split + 1:])
+
+    report: dict[str, Any] = {
+        "module": module,
+        "cold_start_ms": cold_start_ms,
+        "import_ms": _top_level_ms(eager),
+        "deferred_ms": _top_level_ms(deferred),
+        "top_imports": [
+            {"package": name.strip(), "self_ms": round(self_us / 1000, 2)}
+            for name, self_us, _ in sorted(eager, key=lambda r: r[1], reverse=True)[:top]
+        ],
+    }
+    if proc.returncode != 0:
+        errors = [line for line in lines if not line.startswith("import time:")]
+        report["error"] = errors[-1] if errors else f"exit {proc.returncode}"
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="startup_report",
+        description="Summarise per-module cold-start import time.",
+    )
+    parser.add_argument("modules", nargs="*", help="Modules to profile (default: all)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports to list (default: 5)")
+    opts = parser.parse_args()
+
+    modules = opts.modules or sorted(
+        p.stem for p in MODULES_DIR.glob("*.py") if p.stem != "base_module"
+    )
+    reports = [profile_module(m, opts.top) for m in modules]
+    reports.sort(key=lambda r: r["cold_start_ms"], reverse=True)
+    print(json.dumps({"modules": reports}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Campaign-scoped shared state — the hosts, services and devices modules find.
+
+net_discover, nbtscan_scanner, packet_manipulator arp-scan, port_scanner
+and mass_scanner used to rediscover the same hosts on every run, with
+nothing linking their results except raw module_runs.stdout. They now
+upsert what they find into campaign_hosts / campaign_services /
+campaign_devices (migration 20261017_create_campaign_state.sql), keyed by
+the campaign the run belongs to, and later modules read it back through
+the unique indexes instead of scanning again:
+
+    state = self.campaign_state(args)        # None outside a campaign
+    if state is not None:
+        state.record_hosts(hosts, source=self.name)
+        skip = state.known_ports(target)     # service rows with a version
+
+The campaign comes from --campaign-id, $ARGOS_CAMPAIGN_ID, or the
+campaign of $ARGOS_ENGAGEMENT_ID (set per job by core/scheduler.py).
+Upserts only ever fill in: a field a module did not report (None or "")
+keeps its stored value, last_seen moves forward and `sources` collects
+every module that reported the row. On a DB without the tables the store
+logs once and does nothing.
+"""
+
+import contextlib
+import logging
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+logger = logging.getLogger("state_store")
+
+BUSY_TIMEOUT_MS = 5000
+
+# table -> (conflict key, updatable fields, defaults for NOT NULL fields)
+_TABLES: dict[str, tuple[tuple[str, ...], tuple[str, ...], dict[str, Any]]] = {
+    "campaign_hosts": (
+        ("ip",),
+        ("mac", "vendor", "hostname", "netbios_name", "os", "status"),
+        {"status": "up"},
+    ),
+    "campaign_services": (
+        ("ip", "port", "protocol"),
+        ("state", "service", "version", "banner"),
+        {"protocol": "tcp", "state": "open"},
+    ),
+    "campaign_devices": (
+        ("mac",),
+        ("vendor", "last_ip"),
+        {},
+    ),
+}
+
+_missing_warned: set[str] = set()
+
+
+def _upsert_sql(table: str) -> str:
+    keys, fields, _ = _TABLES[table]
+    columns = ("campaign_id", *keys, *fields, "sources", "first_seen", "last_seen")
+    updates = [f"{f} = COALESCE(NULLIF(excluded.{f}, ''), {table}.{f})" for f in fields]
+    updates.append(
+        f"sources = CASE"
+        f" WHEN {table}.sources = '' THEN excluded.sources"
+        f" WHEN instr(',' || {table}.sources || ',', ',' || excluded.sources || ',') > 0 THEN {table}.sources"
+        f" ELSE {table}.sources || ',' || excluded.sources END"
+    )
+    updates.append(f"last_seen = MAX({table}.last_seen, excluded.last_seen)")
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT (campaign_id, {', '.join(keys)}) DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+def resolve_campaign(db_path: str, campaign_id: int | None = None) -> int | None:
+    """The campaign for this run: explicit id, $ARGOS_CAMPAIGN_ID, or via $ARGOS_ENGAGEMENT_ID."""
+    if campaign_id is not None:
+        return campaign_id
+    env = os.environ.get("ARGOS_CAMPAIGN_ID", "")
+    if env.isdigit():
+        return int(env)
+    engagement = os.environ.get("ARGOS_ENGAGEMENT_ID", "")
+    if not engagement.isdigit() or not os.path.exists(db_path):
+        return None
+    try:
+        with contextlib.closing(sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)) as conn:
+            row = conn.execute(
+                "SELECT campaign_id FROM engagements WHERE id = ?", (int(engagement),),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.debug("Cannot resolve campaign for engagement %s: %s", engagement, e)
+        return None
+    return row[0] if row else None
+
+
+class CampaignState:
+    """Upsert and query one campaign's hosts, services and devices."""
+
+    def __init__(self, db_path: str, campaign_id: int) -> None:
+        self.db_path = db_path
+        self.campaign_id = campaign_id
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """One short transaction; committed on success, always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _failed(self, table: str, exc: sqlite3.Error) -> None:
+        """Log a failed read/write; sharing state must never fail the module's run."""
+        if "no such table" not in str(exc):
+            logger.warning("Campaign state %s: %s", table, exc)
+        elif table not in _missing_warned:
+            _missing_warned.add(table)
+            logger.warning("%s has no %s table; campaign state not shared (run migrations)", self.db_path, table)
+
+    # ── Writes ─────────────────────────────────────────────────────
+
+    def _upsert(self, table: str, rows: Iterable[dict[str, Any]], source: str) -> int:
+        keys, fields, defaults = _TABLES[table]
+        now = int(time.time())
+        params = []
+        for row in rows:
+            row = {**defaults, **{k: v for k, v in row.items() if v not in (None, "")}}
+            if "mac" in row:
+                row["mac"] = str(row["mac"]).lower()
+            if any(row.get(k) in (None, "") for k in keys):
+                continue
+            params.append((
+                self.campaign_id,
+                *(row[k] for k in keys),
+                *(row.get(f) for f in fields),
+                source, now, now,
+            ))
+        if not params:
+            return 0
+        try:
+            with self._connect() as conn:
+                conn.executemany(_upsert_sql(table), params)
+        except sqlite3.Error as e:
+            self._failed(table, e)
+            return 0
+        return len(params)
+
+    def upsert_hosts(self, hosts: Iterable[dict[str, Any]], source: str) -> int:
+        """Upsert {ip, mac?, vendor?, hostname?, netbios_name?, os?, status?} rows."""
+        return self._upsert("campaign_hosts", hosts, source)
+
+    def upsert_services(self, services: Iterable[dict[str, Any]], source: str) -> int:
+        """Upsert {ip, port, protocol?, state?, service?, version?, banner?} rows."""
+        return self._upsert("campaign_services", services, source)
+
+    def upsert_devices(self, devices: Iterable[dict[str, Any]], source: str) -> int:
+        """Upsert {mac, vendor?, last_ip?} rows."""
+        return self._upsert("campaign_devices", devices, source)
+
+    def record_hosts(self, hosts: list[dict[str, Any]], source: str) -> None:
+        """Upsert discovered hosts, plus a device row for each one with a MAC."""
+        self.upsert_hosts(hosts, source)
+        self.upsert_devices(
+            ({"mac": h["mac"], "vendor": h.get("vendor"), "last_ip": h.get("ip")}
+             for h in hosts if h.get("mac")),
+            source,
+        )
+
+    # ── Reads ──────────────────────────────────────────────────────
+
+    def _query(self, table: str, sql: str, params: tuple[Any, ...]) -> list[dict[str, Any]]:
+        try:
+            with self._connect() as conn:
+                return [dict(r) for r in conn.execute(sql, params)]
+        except sqlite3.Error as e:
+            self._failed(table, e)
+            return []
+
+    def hosts(self, since: int | None = None) -> list[dict[str, Any]]:
+        """Hosts seen in this campaign (since a unix time, if given), newest first."""
+        return self._query(
+            "campaign_hosts",
+            "SELECT * FROM campaign_hosts WHERE campaign_id = ? AND last_seen >= ? ORDER BY last_seen DESC",
+            (self.campaign_id, since or 0),
+        )
+
+    def host(self, ip: str) -> dict[str, Any] | None:
+        rows = self._query(
+            "campaign_hosts",
+            "SELECT * FROM campaign_hosts WHERE campaign_id = ? AND ip = ?",
+            (self.campaign_id, ip),
+        )
+        return rows[0] if rows else None
+
+    def services(self, ip: str | None = None, state: str | None = "open") -> list[dict[str, Any]]:
+        """Services for one host (ip or hostname) or the whole campaign."""
+        sql = "SELECT * FROM campaign_services WHERE campaign_id = ?"
+        params: list[Any] = [self.campaign_id]
+        if ip is not None:
+            sql += " AND ip IN (?, (SELECT ip FROM campaign_hosts WHERE campaign_id = ? AND hostname = ?))"
+            params += [ip, self.campaign_id, ip]
+        if state is not None:
+            sql += " AND state = ?"
+            params.append(state)
+        return self._query("campaign_services", sql + " ORDER BY ip, port", tuple(params))
+
+    def known_ports(self, ip: str) -> list[dict[str, Any]]:
+        """Service rows already fingerprinted on ip (or hostname): open with a version."""
+        return [s for s in self.services(ip) if s["version"]]
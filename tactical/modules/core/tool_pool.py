@@ -0,0 +1,313 @@
+"""
+Warm tool sessions — keep one long-lived tool process per input.
+
+re_analyzer starts a fresh r2 and re-runs `aa` for every query on the same
+binary, and osint_framework relaunches recon-ng (and its module index) for
+every listing. A ToolSession keeps the tool running and feeds it one
+command at a time, r2pipe-style, so the load-and-analyse cost is paid once
+per input instead of once per query:
+
+  - R2Session:      `r2 -q0 <file>`; every reply is terminated by a NUL byte
+  - MarkerSession:  any line-oriented REPL; after each command a marker
+                    command echoes a unique token that ends the reply
+
+Sessions live in a process-wide ToolPool keyed by tool + input identity
+(path, size, mtime), so under the module daemon or any run_collect()
+driver consecutive queries on the same binary or workspace reuse one
+process. Idle sessions are closed after IDLE_TTL seconds, the least
+recently used one when MAX_SESSIONS is exceeded, and all of them at exit.
+A single CLI run gets a session that lives for that run only.
+"""
+
+import atexit
+import os
+import re
+import selectors
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+MAX_SESSIONS = 4
+IDLE_TTL = 300.0
+
+_READ_CHUNK = 64 * 1024
+
+
+class ToolSessionError(Exception):
+    """The session died, timed out or produced an unframed reply."""
+
+
+def input_identity(path: str) -> tuple[str, int, int]:
+    """Pool key component for an input file: a changed file gets a new session."""
+    st = os.stat(path)
+    return (str(Path(path).resolve()), st.st_size, st.st_mtime_ns)
+
+
+class ToolSession:
+    """A long-lived tool process spoken to over stdin/stdout."""
+
+    def __init__(
+        self,
+        argv: list[str],
+        env: dict[str, str] | None = None,
+        merge_stderr: bool = True,
+    ) -> None:
+        self.argv = argv
+        self.proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if merge_stderr else subprocess.DEVNULL,
+            bufsize=0,
+            env=env,
+            start_new_session=True,
+        )
+        os.set_blocking(self.proc.stdout.fileno(), False)
+        self._buf = b""
+        self.started_at = time.monotonic()
+        self.last_used = self.started_at
+        self.commands = 0
+        # Per-session scratch for callers (e.g. "analysed" flags)
+        self.state: dict[str, Any] = {}
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def cmd(self, command: str, timeout: float = 60) -> str:
+        """Send one command and return its reply."""
+        if not self.alive():
+            raise ToolSessionError(f"{self.argv[0]} session has exited ({self.proc.returncode})")
+        try:
+            self._send(command)
+            reply = self._read_reply(timeout)
+        except OSError as exc:
+            self.close()
+            raise ToolSessionError(f"{self.argv[0]} session I/O failed: {exc}") from exc
+        except BaseException:
+            # Timed out or interrupted mid-reply: the framing is lost for good
+            self.close()
+            raise
+        self.commands += 1
+        self.last_used = time.monotonic()
+        return reply
+
+    def close(self) -> None:
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        if self.proc.stdout:
+            self.proc.stdout.close()
+
+    # ── Framing (overridden per protocol) ──────────────────────────
+
+    def _send(self, command: str) -> None:
+        self.proc.stdin.write(command.encode() + b"\n")
+        self.proc.stdin.flush()
+
+    def _read_reply(self, timeout: float) -> str:
+        raise NotImplementedError
+
+    def _read_until(self, terminator: bytes, timeout: float) -> bytes:
+        """Read stdout until terminator; returns everything before it."""
+        deadline = time.monotonic() + timeout
+        with selectors.DefaultSelector() as sel:
+            sel.register(self.proc.stdout, selectors.EVENT_READ)
+            while terminator not in self._buf:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ToolSessionError(f"{self.argv[0]} reply timed out after {timeout}s")
+                if not sel.select(timeout=min(remaining, 0.5)):
+                    continue
+                try:
+                    chunk = os.read(self.proc.stdout.fileno(), _READ_CHUNK)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    raise ToolSessionError(f"{self.argv[0]} closed its output")
+                self._buf += chunk
+        reply, _, self._buf = self._buf.partition(terminator)
+        return reply
+
+
+class R2Session(ToolSession):
+    """radare2 in r2pipe mode (-q0): NUL-terminated replies."""
+
+    def __init__(self, path: str, options: list[str] | None = None, startup_timeout: float = 60) -> None:
+        argv = ["r2", "-q0"]
+        for opt in options or []:
+            argv += ["-e", opt]
+        # Warnings on stderr would corrupt the JSON replies
+        super().__init__(argv + [path], merge_stderr=False)
+        # r2 writes one NUL once the file is loaded
+        try:
+            self._read_until(b"\x00", startup_timeout)
+        except ToolSessionError:
+            self.close()
+            raise
+
+    def _read_reply(self, timeout: float) -> str:
+        return self._read_until(b"\x00", timeout).decode(errors="replace")
+
+
+class MarkerSession(ToolSession):
+    """
+    Line-oriented REPL framed by an echoed marker.
+
+    marker_cmd is formatted with {marker}; its output must contain the
+    marker (recon-ng: "shell echo {marker}"). prompt_re is stripped from
+    replies.
+    """
+
+    def __init__(
+        self,
+        argv: list[str],
+        marker_cmd: str,
+        prompt_re: str = "",
+        startup_timeout: float = 60,
+    ) -> None:
+        super().__init__(argv)
+        self.marker_cmd = marker_cmd
+        self.prompt_re = re.compile(prompt_re) if prompt_re else None
+        # Swallow the banner/start-up output
+        try:
+            self.cmd("", timeout=startup_timeout)
+        except ToolSessionError:
+            self.close()
+            raise
+        self.commands = 0
+
+    def _send(self, command: str) -> None:
+        self._marker = f"__ARGOS_{uuid.uuid4().hex}__"
+        lines = ([command] if command else []) + [self.marker_cmd.format(marker=self._marker)]
+        self.proc.stdin.write("".join(f"{line}\n" for line in lines).encode())
+        self.proc.stdin.flush()
+
+    def _read_reply(self, timeout: float) -> str:
+        reply = self._read_until(self._marker.encode(), timeout).decode(errors="replace")
+        # Drop the rest of the marker line
+        self._buf = self._buf.partition(b"\n")[2]
+        if self.prompt_re:
+            reply = self.prompt_re.sub("", reply)
+        return reply
+
+
+class ToolPool:
+    """Process-wide set of live sessions with idle and LRU eviction."""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, idle_ttl: float = IDLE_TTL) -> None:
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._sessions: dict[tuple[Any, ...], ToolSession] = {}
+        self._lock = threading.Lock()
+        self._creating: dict[tuple[Any, ...], threading.Lock] = {}
+        self.created = 0
+        self.reused = 0
+
+    def session(self, key: tuple[Any, ...], factory: Callable[[], ToolSession]) -> ToolSession:
+        """
+        Return the live session for key, starting one with factory() if needed.
+
+        Callers racing on one key share a creation lock, so only the first
+        starts a process and the rest get its session. Other keys are not
+        held up while a slow tool (r2 `aa`, recon-ng) starts.
+        """
+        with self._lock:
+            self._evict_idle()
+            session = self._live(key)
+            if session is not None:
+                return session
+            creating = self._creating.setdefault(key, threading.Lock())
+
+        with creating:
+            with self._lock:
+                session = self._live(key)
+                if session is not None:
+                    return session
+            try:
+                session = factory()
+            finally:
+                with self._lock:
+                    if self._creating.get(key) is creating:
+                        del self._creating[key]
+            with self._lock:
+                # A caller that got a fresh creation lock (after a failed
+                # factory) may have won meanwhile: keep one session per key
+                existing = self._live(key)
+                if existing is not None:
+                    session.close()
+                    return existing
+                while len(self._sessions) >= self.max_sessions:
+                    oldest = min(self._sessions, key=lambda k: self._sessions[k].last_used)
+                    self._sessions.pop(oldest).close()
+                self._sessions[key] = session
+                self.created += 1
+            return session
+
+    def _live(self, key: tuple[Any, ...]) -> ToolSession | None:
+        """The pooled session for key if it is still running (dropping a dead one). Holds _lock."""
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+        if not session.alive():
+            session.close()
+            del self._sessions[key]
+            return None
+        self.reused += 1
+        session.last_used = time.monotonic()
+        return session
+
+    def discard(self, key: tuple[Any, ...]) -> None:
+        with self._lock:
+            session = self._sessions.pop(key, None)
+        if session is not None:
+            session.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "live": [
+                    {
+                        "tool": s.argv[0],
+                        "key": [str(part) for part in key],
+                        "commands": s.commands,
+                        "age_s": round(now - s.started_at, 1),
+                        "idle_s": round(now - s.last_used, 1),
+                    }
+                    for key, s in self._sessions.items()
+                ],
+            }
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, s in self._sessions.items() if now - s.last_used > self.idle_ttl]:
+            self._sessions.pop(key).close()
+
+
+_pool = ToolPool()
+
+
+def get_pool() -> ToolPool:
+    return _pool
+
+
+atexit.register(_pool.close_all)
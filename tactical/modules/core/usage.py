@@ -0,0 +1,88 @@
+"""
+Resource accounting for module runs and the tools they wrap.
+
+Two levels:
+
+  - run level: getrusage(RUSAGE_SELF / RUSAGE_CHILDREN) deltas across
+    run(), giving Python-side CPU, CPU of every reaped child, storage I/O
+    (ru_inblock/ru_oublock, 512-byte blocks) and peak RSS.
+  - tool level: for processes we reap ourselves (ToolStream), wait for exit
+    without reaping (waitid WNOWAIT), read /proc/<pid>/io while the zombie
+    still holds its counters, then reap with wait4() for that child's own
+    rusage.
+
+RUSAGE_CHILDREN's ru_maxrss is the largest child ever reaped by this
+process, not a per-run delta; in the long-lived module daemon it only
+reflects a run if that run set a new high-water mark.
+"""
+
+import os
+import resource
+import subprocess
+from typing import Any
+
+_BLOCK = 512  # ru_inblock/ru_oublock unit
+
+
+def snapshot() -> dict[str, resource.struct_rusage]:
+    """Current rusage for this process and its reaped children."""
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF),
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN),
+    }
+
+
+def _rusage_delta(start: resource.struct_rusage, end: resource.struct_rusage) -> dict[str, Any]:
+    return {
+        "cpu_user_ms": round((end.ru_utime - start.ru_utime) * 1000, 1),
+        "cpu_sys_ms": round((end.ru_stime - start.ru_stime) * 1000, 1),
+        "peak_rss_kb": end.ru_maxrss,
+        "read_bytes": (end.ru_inblock - start.ru_inblock) * _BLOCK,
+        "write_bytes": (end.ru_oublock - start.ru_oublock) * _BLOCK,
+    }
+
+
+def usage_since(start: dict[str, resource.struct_rusage]) -> dict[str, Any]:
+    """Resource use since a snapshot(), split into module (self) and tools (children)."""
+    end = snapshot()
+    return {
+        "module": _rusage_delta(start["self"], end["self"]),
+        "children": _rusage_delta(start["children"], end["children"]),
+    }
+
+
+def read_proc_io(pid: int) -> dict[str, int]:
+    """Parse /proc/<pid>/io (empty if unavailable — non-Linux or not permitted)."""
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return {}
+    keys = ("rchar", "wchar", "read_bytes", "write_bytes")
+    return {k: int(fields[k]) for k in keys if k in fields}
+
+
+def reap_with_usage(proc: subprocess.Popen[Any]) -> dict[str, Any]:
+    """
+    Wait for proc to exit, capture its /proc io counters and rusage, and reap it.
+
+    Sets proc.returncode so Popen does not try to wait again. Returns {}
+    if the process was already reaped elsewhere.
+    """
+    if proc.returncode is not None:
+        return {}
+    try:
+        os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+        io = read_proc_io(proc.pid)
+        _, status, ru = os.wait4(proc.pid, 0)
+    except ChildProcessError:
+        proc.wait()
+        return {}
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "pid": proc.pid,
+        "cpu_user_ms": round(ru.ru_utime * 1000, 1),
+        "cpu_sys_ms": round(ru.ru_stime * 1000, 1),
+        "peak_rss_kb": ru.ru_maxrss,
+        **io,
+    }
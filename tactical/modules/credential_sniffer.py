@@ -23,6 +23,9 @@ _CLEARTEXT_PROTOCOLS = frozenset({
     "napster", "postgresdb", "oracle", "sybase",
 })
 
+# dsniff's block separator
+_SEPARATOR_RE = re.compile(r"-{10,}")
+
 
 class CredentialSniffer(TacticalModule):
     """Sniff cleartext credentials from live network traffic using dsniff."""
@@ -122,51 +125,88 @@ class CredentialSniffer(TacticalModule):
         combined = (stdout + "\n" + stderr).strip()
 
         # Split on dsniff's separator lines
-        blocks = re.split(r"-{10,}", combined)
-
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
-
-            # Parse the header line: timestamp tcp src -> dst (proto)
-            header_match = re.search(
-                r"(\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2})\s+"
-                r"tcp\s+([\d.]+):(\d+)\s+->\s+([\d.]+):(\d+)"
-                r"(?:\s+\((\w+)\))?",
-                block,
-                re.IGNORECASE,
-            )
-            if not header_match:
-                continue
-
-            timestamp = header_match.group(1)
-            src_ip = header_match.group(2)
-            src_port = int(header_match.group(3))
-            dst_ip = header_match.group(4)
-            dst_port = int(header_match.group(5))
-            protocol = (header_match.group(6) or self._guess_protocol(dst_port)).upper()
-
-            # Remaining content after header is the credential payload
-            payload = block[header_match.end():].strip()
-            if not payload:
-                continue
-
-            credential = self._extract_credential(protocol, payload, dst_port)
-            credentials.append({
-                "timestamp": timestamp,
-                "protocol": protocol,
-                "src_ip": src_ip,
-                "src_port": src_port,
-                "dst_ip": dst_ip,
-                "dst_port": dst_port,
-                "username": credential.get("username", ""),
-                "password": credential.get("password", ""),
-                "raw_payload": payload[:500],
-            })
+        for block in _SEPARATOR_RE.split(combined):
+            credential = self._parse_block(block)
+            if credential is not None:
+                credentials.append(credential)
 
         return credentials
 
+    def _parse_block(self, block: str) -> dict[str, Any] | None:
+        """Parse one separator-delimited dsniff block (None if it holds no credential)."""
+        block = block.strip()
+        if not block:
+            return None
+
+        # Parse the header line: timestamp tcp src -> dst (proto)
+        header_match = re.search(
+            r"(\d{2}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2})\s+"
+            r"tcp\s+([\d.]+):(\d+)\s+->\s+([\d.]+):(\d+)"
+            r"(?:\s+\((\w+)\))?",
+            block,
+            re.IGNORECASE,
+        )
+        if not header_match:
+            return None
+
+        timestamp = header_match.group(1)
+        src_ip = header_match.group(2)
+        src_port = int(header_match.group(3))
+        dst_ip = header_match.group(4)
+        dst_port = int(header_match.group(5))
+        protocol = (header_match.group(6) or self._guess_protocol(dst_port)).upper()
+
+        # Remaining content after header is the credential payload
+        payload = block[header_match.end():].strip()
+        if not payload:
+            return None
+
+        credential = self._extract_credential(protocol, payload, dst_port)
+        return {
+            "timestamp": timestamp,
+            "protocol": protocol,
+            "src_ip": src_ip,
+            "src_port": src_port,
+            "dst_ip": dst_ip,
+            "dst_port": dst_port,
+            "username": credential.get("username", ""),
+            "password": credential.get("password", ""),
+            "raw_payload": payload[:500],
+        }
+
+    def _sniff_live(self, dsniff_args: list[str], duration: int) -> list[dict[str, Any]]:
+        """
+        Run dsniff on a live interface, parsing each block as soon as its
+        closing separator arrives so a long capture holds one block, not
+        the whole session, in memory.
+        """
+        credentials: list[dict[str, Any]] = []
+        pending: dict[str, list[str]] = {"stdout": [], "stderr": []}
+
+        def feed(stream_name: str, line: str) -> None:
+            current = pending[stream_name]
+            parts = _SEPARATOR_RE.split(line)
+            current.append(parts[0])
+            for part in parts[1:]:
+                finish(current)
+                current = pending[stream_name] = [part]
+
+        def finish(lines: list[str]) -> None:
+            credential = self._parse_block("\n".join(lines))
+            if credential is not None:
+                credentials.append(credential)
+
+        self.run_tool_stream(
+            "dsniff",
+            dsniff_args,
+            on_stdout=lambda line: feed("stdout", line),
+            on_stderr=lambda line: feed("stderr", line),
+            duration=duration,
+        )
+        for lines in pending.values():
+            finish(lines)
+        return credentials
+
     def _extract_credential(
         self, protocol: str, payload: str, port: int
     ) -> dict[str, str]:
@@ -255,13 +295,9 @@ class CredentialSniffer(TacticalModule):
 
         if args.read_file:
             result = self.run_tool("dsniff", dsniff_args, timeout=args.timeout)
-            stdout, stderr = result.stdout, result.stderr
+            credentials = self._parse_dsniff_output(result.stdout, result.stderr)
         else:
-            stdout, stderr = self.run_tool_popen(
-                "dsniff", dsniff_args, duration=args.duration
-            )
-
-        credentials = self._parse_dsniff_output(stdout, stderr)
+            credentials = self._sniff_live(dsniff_args, args.duration)
         protocol_summary = self._build_summary(credentials)
 
         self.output_success({
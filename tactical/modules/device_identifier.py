@@ -14,13 +14,11 @@ import json
 import re
 import time
 
-import requests
-import urllib3
+from base_module import TacticalModule, lazy_import
 
-from base_module import TacticalModule
-
-# Suppress InsecureRequestWarning for self-signed certs
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Deferred: requests/urllib3 cost more to import than the rest of the module
+requests = lazy_import("requests")
+urllib3 = lazy_import("urllib3")
 
 # Device signatures: (pattern_in_body, pattern_in_headers, device_type, details_extractor)
 DEVICE_SIGNATURES = [
@@ -83,6 +81,9 @@ class DeviceIdentifier(TacticalModule):
         if not target.startswith(("http://", "https://")):
             target = f"https://{target}"
 
+        # Suppress InsecureRequestWarning for self-signed certs
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
         start = time.monotonic()
 
         try:
@@ -31,6 +31,9 @@ _MMLS_RE = re.compile(
     r"(?P<desc>.+)$"
 )
 
+# Entries kept in a plain JSON envelope; --ndjson streams all of them.
+_FLS_ENVELOPE_LIMIT = 500
+
 # fls output:  "r/r 12:  filename.txt"  or  "d/d 5:  dirname"
 _FLS_RE = re.compile(
     r"^(?P<type>[drv])/(?P<subtype>[drv\-])\s+(?P<deleted>\*\s+)?(?P<inode>\d+)(?:-\d+)?:\t(?P<name>.+)$"
@@ -49,6 +52,8 @@ class DiskAnalyzer(TacticalModule):
         "mmls (partitions), fls (files), img_stat (metadata), icat (extract file)."
     )
 
+    cache_ttl = 86400
+
     def _add_module_args(self) -> None:
         self.parser.add_argument(
             "--image",
@@ -154,29 +159,53 @@ class DiskAnalyzer(TacticalModule):
             cmd_args += ["-o", str(args.offset)]
         cmd_args.append(args.image)
 
-        result = self.run_tool("fls", cmd_args, timeout=args.timeout)
-        entries: list[dict[str, Any]] = []
-        for line in result.stdout.splitlines():
-            match = _FLS_RE.match(line.strip())
-            if match:
-                entries.append(
-                    {
-                        "type": "directory" if match.group("type") == "d" else "file",
-                        "inode": int(match.group("inode")),
-                        "name": match.group("name").strip(),
-                        "deleted": match.group("deleted") is not None,
-                    }
-                )
-        deleted_count = sum(1 for e in entries if e["deleted"])
+        # fls -r on a large image lists millions of entries: parse them as
+        # they arrive and, under --ndjson, stream every one instead of
+        # keeping the first _FLS_ENVELOPE_LIMIT.
+        entry_count = 0
+        deleted_count = 0
+        stream = self.stream_tool("fls", cmd_args, duration=args.timeout)
+        for stream_name, line in stream:
+            if stream_name != "stdout":
+                continue
+            entry = self._parse_fls_line(line)
+            if entry is None:
+                continue
+            entry_count += 1
+            deleted_count += entry["deleted"]
+            if self.streaming or entry_count <= _FLS_ENVELOPE_LIMIT:
+                self.emit_item("entries", entry)
+
+        if stream.timed_out:
+            self.output_error(
+                f"Tool timed out after {args.timeout}s: fls",
+                {"entries_parsed": entry_count},
+            )
+        if stream.interrupted:
+            # The envelope's `partial` block records the cut-off
+            self.logger.warning("fls interrupted after %d entries", entry_count)
         return {
             "tool": "fls",
             "image": args.image,
             "offset": args.offset,
-            "entry_count": len(entries),
+            "entry_count": entry_count,
             "deleted_count": deleted_count,
-            "entries": entries[:500],
-            "truncated": len(entries) > 500,
-            "return_code": result.returncode,
+            "truncated": not self.streaming and entry_count > _FLS_ENVELOPE_LIMIT,
+            "interrupted": stream.interrupted,
+            "return_code": stream.returncode,
+        }
+
+    @staticmethod
+    def _parse_fls_line(line: str) -> dict[str, Any] | None:
+        """Parse one fls line into an entry dict (None for non-entry lines)."""
+        match = _FLS_RE.match(line.strip())
+        if not match:
+            return None
+        return {
+            "type": "directory" if match.group("type") == "d" else "file",
+            "inode": int(match.group("inode")),
+            "name": match.group("name").strip(),
+            "deleted": match.group("deleted") is not None,
         }
 
     def _run_img_stat(self, args: argparse.Namespace) -> dict[str, Any]:
@@ -224,6 +253,10 @@ class DiskAnalyzer(TacticalModule):
             "return_code": result.returncode,
         }
 
+    def cache_inputs(self, args: argparse.Namespace) -> list[str] | None:
+        """Listings depend only on the image; icat --output-file writes to disk, so re-run it."""
+        return None if args.output_file else [args.image]
+
     def run(self, args: argparse.Namespace) -> None:
         """Dispatch to the appropriate SleuthKit tool."""
         self._validate_args(args)
@@ -7,22 +7,23 @@ CLI deps: none (pure dnspython)
 Karton dependency removed, base_module.py used instead.
 
 Checks for zone transfer (AXFR) vulnerability, enumerates nameservers,
-and collects DNS records.
+and collects DNS records. The record types are resolved concurrently with
+dns.asyncresolver while the zone transfer attempts run on a worker thread.
 """
 
+import asyncio
 import json
 import time
 
-import dns.exception
-import dns.query
-import dns.rdatatype
-import dns.resolver
-import dns.zone
+from base_module import AsyncTacticalModule, lazy_import
 
-from base_module import TacticalModule
+# Deferred until run(): dnspython is the bulk of this module's start-up time
+dns = lazy_import("dns", ("asyncresolver", "exception", "query", "rdatatype", "resolver", "zone"))
 
+RECORD_TYPES = ("A", "AAAA", "MX", "TXT", "CNAME", "SOA", "SRV")
 
-class DNSScanner(TacticalModule):
+
+class DNSScanner(AsyncTacticalModule):
     name = "dns_scanner"
     description = "DNS zone transfer detection and record analysis (Artemis-extracted)"
 
@@ -35,7 +36,7 @@ class DNSScanner(TacticalModule):
             help="Specific nameserver to query (default: auto-detect)",
         )
 
-    def run(self, args) -> None:
+    async def run_async(self, args) -> None:
         domain = args.domain.strip().rstrip(".")
 
         if not domain or len(domain) > 253:
@@ -48,7 +49,35 @@ class DNSScanner(TacticalModule):
         # Resolve nameservers
         nameservers = self._get_nameservers(domain, args.nameserver)
 
-        # Test zone transfer against each NS
+        # Zone transfer attempts block in dnspython, so they share the wait
+        # with the record queries from a worker thread
+        (zone_transfer_possible, zone_records, xfr_issues), records = await self.gather(
+            asyncio.to_thread(self._try_zone_transfers, domain, nameservers),
+            self._collect_records(domain),
+        )
+        issues.extend(xfr_issues)
+
+        duration_ms = int((time.monotonic() - start) * 1000)
+
+        self.log_run(
+            args.db_path, self.name,
+            json.dumps(vars(args), default=str),
+            0, "", "", duration_ms,
+        )
+
+        self.output_success({
+            "domain": domain,
+            "nameservers": nameservers,
+            "zone_transfer_possible": zone_transfer_possible,
+            "zone_records": zone_records[:200],
+            "records": records,
+            "issues": issues,
+            "duration_ms": duration_ms,
+        })
+
+    def _try_zone_transfers(self, domain: str, nameservers: list[str]) -> tuple[bool, list[dict], list[str]]:
+        """Attempt AXFR against each nameserver; returns (possible, zone records, issues)."""
+        issues: list[str] = []
         zone_transfer_possible = False
         zone_records: list[dict] = []
         for ns in nameservers:
@@ -78,26 +107,7 @@ class DNSScanner(TacticalModule):
                 self.logger.debug("Zone transfer failed on %s: %s", ns, e)
                 continue
 
-        # Collect standard records
-        records = self._collect_records(domain)
-
-        duration_ms = int((time.monotonic() - start) * 1000)
-
-        self.log_run(
-            args.db_path, self.name,
-            json.dumps(vars(args), default=str),
-            0, "", "", duration_ms,
-        )
-
-        self.output_success({
-            "domain": domain,
-            "nameservers": nameservers,
-            "zone_transfer_possible": zone_transfer_possible,
-            "zone_records": zone_records[:200],
-            "records": records,
-            "issues": issues,
-            "duration_ms": duration_ms,
-        })
+        return zone_transfer_possible, zone_records, issues
 
     def _get_nameservers(self, domain: str, explicit_ns: str | None) -> list[str]:
         """Get nameservers for the domain."""
@@ -121,27 +131,26 @@ class DNSScanner(TacticalModule):
             pass
         return None
 
-    def _collect_records(self, domain: str) -> list[dict]:
-        """Collect common DNS record types for the domain."""
-        records: list[dict] = []
-        record_types = ["A", "AAAA", "MX", "TXT", "CNAME", "SOA", "SRV"]
+    async def _collect_records(self, domain: str) -> list[dict]:
+        """Collect common DNS record types for the domain, all types at once."""
+        answers = await self.gather(
+            *(dns.asyncresolver.resolve(domain, rtype) for rtype in RECORD_TYPES),
+            return_exceptions=True,
+        )
 
-        for rtype in record_types:
-            try:
-                answers = dns.resolver.resolve(domain, rtype)
-                for rdata in answers:
-                    records.append({
-                        "type": rtype,
-                        "value": str(rdata),
-                        "ttl": answers.rrset.ttl if answers.rrset else 0,
-                    })
-            except (
-                dns.resolver.NXDOMAIN,
-                dns.resolver.NoAnswer,
-                dns.resolver.NoNameservers,
-                dns.exception.DNSException,
-            ):
+        records: list[dict] = []
+        for rtype, answer in zip(RECORD_TYPES, answers):
+            # NXDOMAIN, NoAnswer, NoNameservers, timeouts — all DNSException
+            if isinstance(answer, dns.exception.DNSException):
                 continue
+            if isinstance(answer, BaseException):
+                raise answer
+            for rdata in answer:
+                records.append({
+                    "type": rtype,
+                    "value": str(rdata),
+                    "ttl": answer.rrset.ttl if answer.rrset else 0,
+                })
 
         return records
 
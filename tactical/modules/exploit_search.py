@@ -13,9 +13,16 @@ Kali Linux includes it at /usr/bin/searchsploit.
 import argparse
 import json
 import re
+from pathlib import Path
 from typing import Any
 
-from base_module import TacticalModule
+from base_module import TacticalModule, json_loads
+
+# searchsploit's offline index — its contents are what a query result depends on
+_EXPLOITDB_INDEXES = (
+    "/usr/share/exploitdb/files_exploits.csv",
+    "/usr/share/exploitdb/files_shellcodes.csv",
+)
 
 
 class ExploitSearch(TacticalModule):
@@ -27,6 +34,8 @@ class ExploitSearch(TacticalModule):
         "Parses searchsploit JSON output into structured exploit entries."
     )
 
+    cache_ttl = 3600
+
     def _add_module_args(self) -> None:
         """Register exploit search arguments."""
         self.parser.add_argument(
@@ -147,7 +156,7 @@ class ExploitSearch(TacticalModule):
             return [], 0
 
         try:
-            data = json.loads(stdout)
+            data = json_loads(stdout)
         except json.JSONDecodeError as exc:
             self.logger.warning("JSON decode error from searchsploit: %s", exc)
             return [], 0
@@ -206,6 +215,12 @@ class ExploitSearch(TacticalModule):
                 unique.append(entry)
         return unique
 
+    # ── Result cache ─────────────────────────────────────────────────
+
+    def cache_inputs(self, args: argparse.Namespace) -> list[str] | None:
+        """Results change only when `searchsploit -u` updates the ExploitDB index files."""
+        return [p for p in _EXPLOITDB_INDEXES if Path(p).exists()]
+
     # ── Main run ─────────────────────────────────────────────────────
 
     def run(self, args: argparse.Namespace) -> None:
@@ -43,6 +43,8 @@ class FileCarver(TacticalModule):
         "from disk images or directories using bulk_extractor."
     )
 
+    cache_ttl = 86400
+
     def _add_module_args(self) -> None:
         group = self.parser.add_mutually_exclusive_group(required=True)
         group.add_argument(
@@ -145,6 +147,14 @@ class FileCarver(TacticalModule):
 
         return results
 
+    def cache_inputs(self, args: argparse.Namespace) -> list[str] | None:
+        """Carved features depend only on the input image or directory."""
+        return [args.input_file or args.input_dir]
+
+    def cache_hit_valid(self, args: argparse.Namespace, data: dict[str, Any]) -> bool:
+        """A cached summary is only useful while its feature files still exist."""
+        return Path(args.output_dir).is_dir()
+
     def run(self, args: argparse.Namespace) -> None:
         """Execute bulk_extractor and parse feature files."""
         self._validate_args(args)
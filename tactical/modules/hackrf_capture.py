@@ -18,6 +18,7 @@ class HackrfCapture(TacticalModule):
 
     name = "hackrf_capture"
     description = "Capture raw IQ samples from HackRF One at a specified frequency."
+    devices = ("hackrf",)
 
     def _add_module_args(self) -> None:
         self.parser.add_argument(
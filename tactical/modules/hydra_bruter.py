@@ -98,7 +98,7 @@ class HydraBruter(TacticalModule):
             hy_args.extend([args.target, service])
 
         start = time.monotonic()
-        result = self.run_tool("hydra", hy_args, timeout=args.timeout)
+        result = self.run_tool("hydra", hy_args, timeout=args.timeout, partial=True)
         duration_ms = int((time.monotonic() - start) * 1000)
 
         found = self._parse_output(result.stdout + result.stderr)
@@ -64,7 +64,16 @@ class MassScanner(TacticalModule):
         result = self.run_tool("masscan", mass_args, timeout=args.timeout)
         duration_ms = int((time.monotonic() - start) * 1000)
 
-        hosts = self._parse_json(result.stdout)
+        with self.span("parse"):
+            hosts = self._parse_json(result.stdout)
+
+        state = self.campaign_state(args)
+        if state is not None:
+            state.record_hosts([{"ip": h["ip"]} for h in hosts], source=self.name)
+            state.upsert_services(
+                ({"ip": h["ip"], **port} for h in hosts for port in h["ports"]),
+                source=self.name,
+            )
 
         self.log_run(
             args.db_path, self.name,
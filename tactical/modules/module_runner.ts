@@ -21,13 +21,53 @@
  *   5. Logs the execution to module_runs table in rf_signals.db
  *   6. Prints the module's JSON output to stdout
  *
+ * Step 5 is the single logging path for the run. The module gets this
+ * run's id (ARGOS_RUN_ID) and a pipe on fd 3 (ARGOS_RUN_LOG_FD) and sends
+ * its own module_runs / module_run_spans rows there instead of opening the
+ * DB; the runner merges them with its row by run_id — the module's fields
+ * win, the runner's fill the gaps — and writes everything in one
+ * transaction through prepared statements (run_log_writer.ts). Via the
+ * daemon the module writes its row itself and the runner's merges into it
+ * on the unique run_id (tactical/modules/core/run_log.py).
+ *
+ * With --runner-daemon <socket> (or ARGOS_MODULE_DAEMON set) step 2 is
+ * replaced by a request to a warm core/daemon.py worker, which skips
+ * interpreter startup and module imports. The ARGOS_* settings a spawned
+ * module would inherit travel with the request and are applied around
+ * it. If the socket is unavailable the runner falls back to spawning
+ * python3.
+ *
+ * With --ndjson (forwarded to the module) the module streams a header
+ * record, one {"type":"item"} record per result item and a trailing
+ * {"type":"summary"} envelope. The runner relays each line as it arrives
+ * instead of buffering stdout, so memory stays bounded by the longest
+ * line rather than MAX_OUTPUT_BYTES of total output; only the summary is
+ * kept for module_runs.
+ *
+ * A module that outlives its timeout is sent SIGINT first: it forwards the
+ * signal to its tools, builds its result from what they produced so far
+ * and prints that envelope, flagged with a `partial` block. SIGTERM
+ * follows after DRAIN_GRACE_MS and SIGKILL KILL_GRACE_MS later; an
+ * envelope printed before the module died is kept rather than discarded.
+ *
+ * With --runner-timeout auto (or ARGOS_ADAPTIVE_TIMEOUT=1 and no explicit
+ * timeout) the timeout is learned from past module_runs of the module on
+ * similar-sized input (core/estimator.py) rather than fixed, and the module
+ * is run with --timeout auto so its tools follow the same estimate. A
+ * --timeout the caller passed to the module is kept and sets the runner's
+ * timeout instead.
+ *
  * Exit codes mirror the module: 0 for success, 1 for error.
  */
 
-import Database from 'better-sqlite3';
-import { spawn } from 'child_process';
+import { type ChildProcess, type ChildProcessByStdio, spawn, spawnSync } from 'child_process';
+import { randomUUID } from 'crypto';
 import { existsSync, readdirSync } from 'fs';
+import { createConnection } from 'net';
 import { join, resolve } from 'path';
+import type { Readable } from 'stream';
+
+import { RunLogWriter } from './run_log_writer';
 
 // ── Constants ────────────────────────────────────────────────────────
 
@@ -35,8 +75,18 @@ const MODULES_DIR = resolve(import.meta.dirname ?? __dirname, '.');
 const PROJECT_ROOT = resolve(MODULES_DIR, '../..');
 const DEFAULT_DB_PATH = join(PROJECT_ROOT, 'rf_signals.db');
 const DEFAULT_TIMEOUT_MS = 120_000; // 2 minutes
+const DRAIN_GRACE_MS = 10_000; // SIGINT → SIGTERM on timeout
+const KILL_GRACE_MS = 5_000; // SIGTERM → SIGKILL
 const MAX_OUTPUT_BYTES = 10_000_000; // 10MB stdout cap
+const MAX_NDJSON_LINE_BYTES = 10_000_000; // per-record cap in --ndjson mode
+const MAX_LOG_RECORD_BYTES = 1_000_000; // per-row cap on the module's log pipe
+const LOG_PREVIEW_CHARS = 10_000; // stdout/stderr kept in the runner's own row
+const RUN_LOG_FD = 3;
+const ADAPTIVE_SLACK_MS = 60_000; // learned timeout → runner timeout headroom
+const ESTIMATE_TIMEOUT_MS = 10_000;
 const PYTHON = 'python3';
+const ESTIMATOR = join(MODULES_DIR, 'core', 'estimator.py');
+const DAEMON_SOCKET = process.env.ARGOS_MODULE_DAEMON ?? '';
 
 // ── Types ────────────────────────────────────────────────────────────
 
@@ -53,6 +103,15 @@ interface RunOutcome {
 	stderr: string;
 	durationMs: number;
 	parsed: ModuleResult | null;
+	/** Set for --ndjson runs: records were already relayed to stdout. */
+	streamed?: { items: number; summary: boolean };
+}
+
+/** Per-invocation state shared by the spawn, NDJSON and daemon paths. */
+interface RunContext {
+	runId: string;
+	engagementId: number | undefined;
+	runLog: RunLogWriter;
 }
 
 // ── Module resolution ────────────────────────────────────────────────
@@ -76,7 +135,67 @@ function resolveModule(name: string): string {
 
 // ── Module execution ─────────────────────────────────────────────────
 
-function runModule(modulePath: string, args: string[], timeoutMs: number): Promise<RunOutcome> {
+/**
+ * Arm the timeout for a spawned module: SIGINT (drain, keep partial
+ * results), then SIGTERM, then SIGKILL. Returns a function that cancels
+ * whatever is still pending once the child has exited.
+ */
+function superviseTimeout(child: ChildProcess, timeoutMs: number, onTimeout: () => void): () => void {
+	const timers: NodeJS.Timeout[] = [];
+	timers.push(
+		setTimeout(() => {
+			onTimeout();
+			child.kill('SIGINT');
+			timers.push(
+				setTimeout(() => {
+					child.kill('SIGTERM');
+					timers.push(setTimeout(() => child.kill('SIGKILL'), KILL_GRACE_MS));
+				}, DRAIN_GRACE_MS)
+			);
+		}, timeoutMs)
+	);
+	return () => timers.forEach(clearTimeout);
+}
+
+/**
+ * Spawn a module with this run's id and the log pipe on fd 3; rows it
+ * sends there are collected by ctx.runLog. The child's 'close' event
+ * waits for the pipe too, so every row is in before the run is logged.
+ */
+function spawnModule(
+	modulePath: string,
+	args: string[],
+	ctx: RunContext
+): ChildProcessByStdio<null, Readable, Readable> {
+	const child = spawn(PYTHON, [modulePath, ...args], {
+		stdio: ['ignore', 'pipe', 'pipe', 'pipe'],
+		env: {
+			...process.env,
+			ARGOS_RUN_ID: ctx.runId,
+			ARGOS_RUN_LOG_FD: String(RUN_LOG_FD),
+			...(ctx.engagementId !== undefined && { ARGOS_ENGAGEMENT_ID: String(ctx.engagementId) })
+		},
+		cwd: PROJECT_ROOT
+	});
+	const pipe = child.stdio[RUN_LOG_FD] as Readable | null;
+	if (pipe) {
+		const splitter = createLineSplitter((line) => ctx.runLog.accept(line), MAX_LOG_RECORD_BYTES);
+		pipe.on('data', (chunk: Buffer) => splitter.push(chunk));
+		pipe.on('end', () => {
+			const dropped = splitter.end();
+			if (dropped > 0) log(`Warning: dropped ${dropped} oversized run log record(s)`);
+		});
+	}
+	// The fd 3 pipe takes spawn() off its typed stdio overloads
+	return child as ChildProcessByStdio<null, Readable, Readable>;
+}
+
+function runModule(
+	modulePath: string,
+	args: string[],
+	timeoutMs: number,
+	ctx: RunContext
+): Promise<RunOutcome> {
 	return new Promise((resolvePromise) => {
 		const start = performance.now();
 		const stdoutChunks: Buffer[] = [];
@@ -84,18 +203,11 @@ function runModule(modulePath: string, args: string[], timeoutMs: number): Promi
 		let stdoutBytes = 0;
 		let killed = false;
 
-		const child = spawn(PYTHON, [modulePath, ...args], {
-			stdio: ['ignore', 'pipe', 'pipe'],
-			env: { ...process.env },
-			cwd: PROJECT_ROOT
-		});
+		const child = spawnModule(modulePath, args, ctx);
 
-		const timer = setTimeout(() => {
+		const cancelTimeout = superviseTimeout(child, timeoutMs, () => {
 			killed = true;
-			child.kill('SIGTERM');
-			// Force kill after 5s if SIGTERM doesn't work
-			setTimeout(() => child.kill('SIGKILL'), 5000);
-		}, timeoutMs);
+		});
 
 		child.stdout.on('data', (chunk: Buffer) => {
 			stdoutBytes += chunk.length;
@@ -111,23 +223,12 @@ function runModule(modulePath: string, args: string[], timeoutMs: number): Promi
 		});
 
 		child.on('close', (code) => {
-			clearTimeout(timer);
+			cancelTimeout();
 			const durationMs = Math.round(performance.now() - start);
 			const stdout = Buffer.concat(stdoutChunks).toString('utf-8').trim();
 			const stderr = Buffer.concat(stderrChunks).toString('utf-8').trim();
 
-			if (killed) {
-				resolvePromise({
-					exitCode: 1,
-					stdout: '',
-					stderr: `Module timed out after ${timeoutMs}ms\n${stderr}`,
-					durationMs,
-					parsed: null
-				});
-				return;
-			}
-
-			// Parse JSON from stdout
+			// Parse JSON from stdout — after a timeout this is the partial result, if any
 			let parsed: ModuleResult | null = null;
 			if (stdout) {
 				try {
@@ -137,6 +238,18 @@ function runModule(modulePath: string, args: string[], timeoutMs: number): Promi
 				}
 			}
 
+			if (killed) {
+				if (parsed) log(`Module timed out after ${timeoutMs}ms; keeping its partial result`);
+				resolvePromise({
+					exitCode: parsed ? (code ?? 1) : 1,
+					stdout: parsed ? stdout : '',
+					stderr: `Module timed out after ${timeoutMs}ms\n${stderr}`,
+					durationMs,
+					parsed
+				});
+				return;
+			}
+
 			resolvePromise({
 				exitCode: code ?? 1,
 				stdout,
@@ -147,7 +260,7 @@ function runModule(modulePath: string, args: string[], timeoutMs: number): Promi
 		});
 
 		child.on('error', (err) => {
-			clearTimeout(timer);
+			cancelTimeout();
 			const durationMs = Math.round(performance.now() - start);
 			resolvePromise({
 				exitCode: 1,
@@ -160,64 +273,347 @@ function runModule(modulePath: string, args: string[], timeoutMs: number): Promi
 	});
 }
 
-// ── DB logging ───────────────────────────────────────────────────────
+/**
+ * Split a byte stream into lines, dropping (and counting) any line longer
+ * than maxBytes so one runaway record cannot grow the buffer unbounded.
+ */
+function createLineSplitter(onLine: (line: string) => void, maxBytes: number) {
+	let pending: Buffer[] = [];
+	let pendingBytes = 0;
+	let overflow = false;
+	let dropped = 0;
+
+	const finishLine = (tail: Buffer): void => {
+		if (overflow) {
+			dropped++;
+		} else {
+			const line = Buffer.concat([...pending, tail]).toString('utf-8').trim();
+			if (line) onLine(line);
+		}
+		pending = [];
+		pendingBytes = 0;
+		overflow = false;
+	};
 
-function openDbIfReady(dbPath: string): Database.Database | null {
-	if (!existsSync(dbPath)) {
-		log(`DB not found at ${dbPath}, skipping log`);
-		return null;
-	}
+	return {
+		push(chunk: Buffer): void {
+			let start = 0;
+			let newline = chunk.indexOf(0x0a, start);
+			while (newline !== -1) {
+				finishLine(chunk.subarray(start, newline));
+				start = newline + 1;
+				newline = chunk.indexOf(0x0a, start);
+			}
+			if (start < chunk.length && !overflow) {
+				pendingBytes += chunk.length - start;
+				if (pendingBytes > maxBytes) {
+					overflow = true;
+					pending = [];
+				} else {
+					pending.push(chunk.subarray(start));
+				}
+			}
+		},
+		end(): number {
+			if (pendingBytes > 0 || overflow) finishLine(Buffer.alloc(0));
+			return dropped;
+		}
+	};
+}
+
+/**
+ * Run a module with --ndjson, relaying each record to stdout as it arrives.
+ * Item records are counted, not kept; the summary record becomes `parsed`.
+ */
+function runModuleNdjson(
+	modulePath: string,
+	args: string[],
+	timeoutMs: number,
+	ctx: RunContext
+): Promise<RunOutcome> {
+	return new Promise((resolvePromise) => {
+		const start = performance.now();
+		const stderrChunks: Buffer[] = [];
+		let summary: ModuleResult | null = null;
+		let summaryLine = '';
+		let items = 0;
+		let killed = false;
 
-	const db = new Database(dbPath);
-	db.pragma('journal_mode = WAL');
+		const child = spawnModule(modulePath, args, ctx);
 
-	const tableCheck = db
-		.prepare(`SELECT name FROM sqlite_master WHERE type='table' AND name='module_runs'`)
-		.get();
+		const cancelTimeout = superviseTimeout(child, timeoutMs, () => {
+			killed = true;
+		});
 
-	if (!tableCheck) {
-		log('module_runs table does not exist, skipping DB log');
-		db.close();
-		return null;
+		const splitter = createLineSplitter((line) => {
+			let record: { type?: string } & Record<string, unknown>;
+			try {
+				record = JSON.parse(line) as typeof record;
+			} catch {
+				log('Warning: dropped non-JSON line from --ndjson output');
+				return;
+			}
+			if (record.type === 'summary') {
+				const envelope: Record<string, unknown> = { ...record };
+				delete envelope.type;
+				summary = envelope as ModuleResult;
+				summaryLine = line;
+			} else if (record.type === 'item') {
+				items++;
+			}
+			process.stdout.write(line + '\n');
+		}, MAX_NDJSON_LINE_BYTES);
+
+		child.stdout.on('data', (chunk: Buffer) => splitter.push(chunk));
+
+		child.stderr.on('data', (chunk: Buffer) => {
+			stderrChunks.push(chunk);
+			process.stderr.write(chunk);
+		});
+
+		child.on('close', (code) => {
+			cancelTimeout();
+			const dropped = splitter.end();
+			if (dropped > 0) {
+				log(`Warning: dropped ${dropped} record(s) over ${MAX_NDJSON_LINE_BYTES} bytes`);
+			}
+			const stderr = Buffer.concat(stderrChunks).toString('utf-8').trim();
+			// A summary written while draining after SIGINT covers the items relayed so far
+			const kept = summary !== null;
+			if (killed && kept) log(`Module timed out after ${timeoutMs}ms; keeping its partial result`);
+			resolvePromise({
+				exitCode: killed && !kept ? 1 : (code ?? 1),
+				stdout: summaryLine,
+				stderr: killed ? `Module timed out after ${timeoutMs}ms\n${stderr}` : stderr,
+				durationMs: Math.round(performance.now() - start),
+				parsed: summary,
+				streamed: { items, summary: kept }
+			});
+		});
+
+		child.on('error', (err) => {
+			cancelTimeout();
+			resolvePromise({
+				exitCode: 1,
+				stdout: '',
+				stderr: `Failed to spawn: ${err.message}`,
+				durationMs: Math.round(performance.now() - start),
+				parsed: null,
+				streamed: { items: 0, summary: false }
+			});
+		});
+	});
+}
+
+// ── Daemon dispatch ──────────────────────────────────────────────────
+
+/** Runner-side plumbing a daemon worker must not see (it has no fd 3). */
+const RUNNER_ONLY_ENV = new Set(['ARGOS_MODULE_DAEMON', 'ARGOS_RUN_ID', 'ARGOS_RUN_LOG_FD']);
+
+/**
+ * The ARGOS_* settings a spawned module would inherit (engagement and
+ * campaign ids, ARGOS_PROFILE, ARGOS_TIMINGS, ...), for the daemon to
+ * apply around the request.
+ */
+function daemonEnv(ctx: RunContext): Record<string, string> {
+	const env: Record<string, string> = {};
+	for (const [key, value] of Object.entries(process.env)) {
+		if (key.startsWith('ARGOS_') && !RUNNER_ONLY_ENV.has(key) && value !== undefined) {
+			env[key] = value;
+		}
 	}
+	if (ctx.engagementId !== undefined) env.ARGOS_ENGAGEMENT_ID = String(ctx.engagementId);
+	return env;
+}
 
-	return db;
+interface DaemonResponse {
+	exit_code: number;
+	duration_ms: number;
+	stderr: string;
+	result: ModuleResult;
 }
 
-function logRunToDb(
-	dbPath: string,
+/**
+ * Run a module through the persistent daemon (tactical/modules/core/daemon.py).
+ * Resolves null when the daemon cannot be reached so the caller can spawn instead.
+ */
+function runModuleViaDaemon(
+	socketPath: string,
 	moduleName: string,
 	args: string[],
-	outcome: RunOutcome,
-	engagementId?: number
-): number | null {
+	timeoutMs: number,
+	ctx: RunContext
+): Promise<RunOutcome | null> {
+	return new Promise((resolvePromise) => {
+		const start = performance.now();
+		const chunks: Buffer[] = [];
+		let connected = false;
+		let settled = false;
+
+		const settle = (outcome: RunOutcome | null): void => {
+			if (settled) return;
+			settled = true;
+			clearTimeout(timer);
+			socket.destroy();
+			resolvePromise(outcome);
+		};
+
+		const socket = createConnection(socketPath, () => {
+			connected = true;
+			socket.write(
+				JSON.stringify({
+					id: process.pid,
+					module: moduleName,
+					args,
+					timeout_ms: timeoutMs,
+					run_id: ctx.runId,
+					env: daemonEnv(ctx)
+				}) + '\n'
+			);
+		});
+
+		// The daemon drains the module at timeout_ms and replaces a worker
+		// that is still busy DRAIN_GRACE_MS later; this is the backstop if it hangs.
+		const timer = setTimeout(() => {
+			settle({
+				exitCode: 1,
+				stdout: '',
+				stderr: `Module timed out after ${timeoutMs}ms (daemon)`,
+				durationMs: Math.round(performance.now() - start),
+				parsed: null
+			});
+		}, timeoutMs + DRAIN_GRACE_MS + KILL_GRACE_MS + 5000);
+
+		socket.on('data', (chunk: Buffer) => {
+			chunks.push(chunk);
+			const text = Buffer.concat(chunks).toString('utf-8');
+			const newline = text.indexOf('\n');
+			if (newline === -1) return;
+
+			let response: DaemonResponse;
+			try {
+				response = JSON.parse(text.slice(0, newline)) as DaemonResponse;
+			} catch {
+				settle({
+					exitCode: 1,
+					stdout: '',
+					stderr: 'Daemon response is not valid JSON',
+					durationMs: Math.round(performance.now() - start),
+					parsed: null
+				});
+				return;
+			}
+			if (response.stderr) process.stderr.write(response.stderr);
+			const stdout = JSON.stringify(response.result);
+			settle({
+				exitCode: response.exit_code,
+				stdout,
+				stderr: response.stderr.trim(),
+				durationMs: Math.round(performance.now() - start),
+				parsed: response.result
+			});
+		});
+
+		socket.on('error', (err) => {
+			if (!connected) {
+				log(`Daemon unavailable at ${socketPath} (${err.message}), spawning python3`);
+				settle(null);
+				return;
+			}
+			settle({
+				exitCode: 1,
+				stdout: '',
+				stderr: `Daemon connection failed: ${err.message}`,
+				durationMs: Math.round(performance.now() - start),
+				parsed: null
+			});
+		});
+
+		// Once the request is sent the module may already have run, so a
+		// dropped connection is reported rather than retried via spawn.
+		socket.on('end', () => {
+			settle({
+				exitCode: 1,
+				stdout: '',
+				stderr: 'Daemon closed the connection without a response',
+				durationMs: Math.round(performance.now() - start),
+				parsed: null
+			});
+		});
+	});
+}
+
+// ── Adaptive timeout ─────────────────────────────────────────────────
+
+interface Estimate {
+	input_size: string | null;
+	source: string;
+	samples: number;
+	p50_ms: number | null;
+	p95_ms: number | null;
+	timeout_s: number;
+}
+
+/**
+ * Ask core/estimator.py for this invocation's learned duration. Returns
+ * null (and the fixed default applies) if it cannot answer.
+ */
+function estimateRun(moduleName: string, args: string[], dbPath: string): Estimate | null {
+	const proc = spawnSync(PYTHON, [ESTIMATOR, moduleName, '--db-path', dbPath, '--', ...args], {
+		cwd: MODULES_DIR,
+		encoding: 'utf-8',
+		timeout: ESTIMATE_TIMEOUT_MS
+	});
 	try {
-		const db = openDbIfReady(dbPath);
-		if (!db) return null;
-
-		const stmt = db.prepare(`
-			INSERT INTO module_runs (engagement_id, module_name, args, exit_code, stdout, stderr, duration_ms)
-			VALUES (?, ?, ?, ?, ?, ?, ?)
-		`);
-
-		const result = stmt.run(
-			engagementId ?? null,
-			moduleName,
-			JSON.stringify(args),
-			outcome.exitCode,
-			outcome.stdout.slice(0, 10_000),
-			outcome.stderr.slice(0, 10_000),
-			outcome.durationMs
-		);
-
-		db.close();
-		return Number(result.lastInsertRowid);
-	} catch (err) {
-		log(`DB log failed: ${err instanceof Error ? err.message : String(err)}`);
+		return JSON.parse((proc.stdout ?? '').trim().split('\n').pop() ?? '') as Estimate;
+	} catch {
+		const reason = proc.error?.message ?? (proc.stderr ?? '').trim().split('\n').pop();
+		log(`Duration estimate unavailable: ${reason}`);
 		return null;
 	}
 }
 
+/**
+ * The module's own --timeout value (`--timeout N` or `--timeout=N`), or
+ * null if it has none. argparse keeps the last one given, so this does too.
+ */
+function moduleTimeoutArg(moduleArgs: string[]): string | null {
+	let value: string | null = null;
+	for (let i = 0; i < moduleArgs.length; i++) {
+		const arg = moduleArgs[i];
+		if (arg === '--timeout' && i + 1 < moduleArgs.length) value = moduleArgs[++i];
+		else if (arg.startsWith('--timeout=')) value = arg.slice('--timeout='.length);
+	}
+	return value;
+}
+
+/**
+ * Runner timeout for an adaptive run. The module gets --timeout auto
+ * unless the caller gave it an explicit timeout, which then also sets the
+ * runner's (plus the usual slack) so it is never cut short by an estimate.
+ */
+function adaptiveTimeoutMs(args: ParsedArgs, cleanName: string): number {
+	const explicit = moduleTimeoutArg(args.moduleArgs);
+	if (explicit === null) {
+		args.moduleArgs.push('--timeout', 'auto');
+	} else if (explicit !== 'auto') {
+		const seconds = parseIntSafe(explicit, 1, NaN);
+		if (Number.isNaN(seconds)) return args.timeoutMs;
+		log(`Module timeout given (${seconds}s); not using the learned estimate`);
+		return seconds * 1000 + ADAPTIVE_SLACK_MS;
+	}
+	const est = estimateRun(cleanName, args.moduleArgs, args.dbPath);
+	if (!est || est.p50_ms === null) {
+		log(`No run history for ${cleanName}; using the default timeout`);
+		return args.timeoutMs;
+	}
+	log(
+		`Estimated ${(est.p50_ms / 1000).toFixed(1)}s (p95 ${((est.p95_ms ?? 0) / 1000).toFixed(1)}s, ` +
+			`${est.samples} runs, ${est.input_size ?? 'any size'}); timeout ${est.timeout_s}s`
+	);
+	return est.timeout_s * 1000 + ADAPTIVE_SLACK_MS;
+}
+
 // ── Helpers ──────────────────────────────────────────────────────────
 
 function log(msg: string): void {
@@ -231,6 +627,16 @@ function emit(data: ModuleResult): void {
 	console.log(JSON.stringify(data));
 }
 
+/** Write one NDJSON record to stdout (--ndjson mode) */
+function emitRecord(record: Record<string, unknown>): void {
+	process.stdout.write(JSON.stringify(record) + '\n');
+}
+
+/** Last non-empty line of a tool's stderr (it usually ends in a newline) */
+function lastLine(text: string): string {
+	return text.trimEnd().split('\n').pop() ?? '';
+}
+
 function fatal(msg: string): never {
 	emit({
 		status: 'error',
@@ -260,8 +666,10 @@ Usage:
 
 Options:
   --runner-db-path <path>     Path to rf_signals.db (default: ./rf_signals.db)
-  --runner-timeout <ms>       Execution timeout in ms (default: 120000)
+  --runner-timeout <ms|auto>  Execution timeout in ms, or learned from past runs
+                              (default: 120000; auto if $ARGOS_ADAPTIVE_TIMEOUT=1)
   --runner-engagement <id>    Link this run to an engagement ID
+  --runner-daemon <socket>    Dispatch via a warm module daemon (default: $ARGOS_MODULE_DAEMON)
   --runner-help               Show this help message
 
 All other arguments are forwarded to the Python module.
@@ -278,7 +686,9 @@ interface ParsedArgs {
 	moduleArgs: string[];
 	dbPath: string;
 	timeoutMs: number;
+	adaptiveTimeout: boolean;
 	engagementId: number | undefined;
+	daemonSocket: string;
 }
 
 function parseIntSafe(value: string, min: number, fallback: number): number {
@@ -301,15 +711,25 @@ function extractRunnerFlags(argv: string[]): { flags: Record<string, string>; re
 	return { flags, rest };
 }
 
+function adaptiveFromEnv(): boolean {
+	return ['1', 'true', 'yes', 'on'].includes(
+		(process.env.ARGOS_ADAPTIVE_TIMEOUT ?? '').trim().toLowerCase()
+	);
+}
+
 function resolveRunnerConfig(flags: Record<string, string>) {
+	const timeout = flags['--runner-timeout'];
 	return {
 		dbPath: flags['--runner-db-path'] ?? DEFAULT_DB_PATH,
-		timeoutMs: flags['--runner-timeout']
-			? parseIntSafe(flags['--runner-timeout'], 1000, DEFAULT_TIMEOUT_MS)
-			: DEFAULT_TIMEOUT_MS,
+		timeoutMs:
+			timeout && timeout !== 'auto'
+				? parseIntSafe(timeout, 1000, DEFAULT_TIMEOUT_MS)
+				: DEFAULT_TIMEOUT_MS,
+		adaptiveTimeout: timeout === 'auto' || (!timeout && adaptiveFromEnv()),
 		engagementId: flags['--runner-engagement']
 			? parseIntSafe(flags['--runner-engagement'], 0, NaN) || undefined
-			: undefined
+			: undefined,
+		daemonSocket: flags['--runner-daemon'] ?? DAEMON_SOCKET
 	};
 }
 
@@ -327,6 +747,23 @@ function parseArgs(argv: string[]): ParsedArgs {
 // ── Output formatting ───────────────────────────────────────────────
 
 function emitOutcome(cleanName: string, outcome: RunOutcome): void {
+	if (outcome.streamed) {
+		// Header and items are already out; close the stream with a summary
+		// if the module died before writing its own.
+		if (!outcome.streamed.summary) {
+			emitRecord({
+				type: 'summary',
+				status: 'error',
+				module: cleanName,
+				timestamp: new Date().toISOString(),
+				message: outcome.stderr
+					? `Module failed: ${lastLine(outcome.stderr)}`
+					: `Module exited with code ${outcome.exitCode} and no summary`,
+				streamed_items: outcome.streamed.items
+			});
+		}
+		return;
+	}
 	if (outcome.parsed) {
 		emit(outcome.parsed);
 		return;
@@ -346,7 +783,7 @@ function emitOutcome(cleanName: string, outcome: RunOutcome): void {
 		module: cleanName,
 		timestamp: new Date().toISOString(),
 		message: outcome.stderr
-			? `Module failed: ${outcome.stderr.split('\n').pop()}`
+			? `Module failed: ${lastLine(outcome.stderr)}`
 			: `Module exited with code ${outcome.exitCode} and no output`
 	});
 }
@@ -358,13 +795,48 @@ async function executeModule(args: ParsedArgs): Promise<void> {
 	const cleanName = args.moduleName.replace(/\.py$/, '');
 
 	log(`Running module: ${cleanName}`);
+	if (args.adaptiveTimeout) args.timeoutMs = adaptiveTimeoutMs(args, cleanName);
 	log(`Args: ${args.moduleArgs.join(' ') || '(none)'}`);
 
-	const outcome = await runModule(modulePath, args.moduleArgs, args.timeoutMs);
+	const ndjson = args.moduleArgs.includes('--ndjson');
+	if (ndjson && args.daemonSocket) {
+		log('--ndjson streams from a spawned module; not using the daemon');
+	}
+
+	const ctx: RunContext = {
+		runId: randomUUID().replace(/-/g, ''),
+		engagementId: args.engagementId,
+		runLog: new RunLogWriter()
+	};
+	const viaDaemon =
+		args.daemonSocket && !ndjson
+			? await runModuleViaDaemon(
+					args.daemonSocket,
+					cleanName,
+					args.moduleArgs,
+					args.timeoutMs,
+					ctx
+				)
+			: null;
+	const outcome =
+		viaDaemon ??
+		(ndjson
+			? await runModuleNdjson(modulePath, args.moduleArgs, args.timeoutMs, ctx)
+			: await runModule(modulePath, args.moduleArgs, args.timeoutMs, ctx));
 	log(`Exit code: ${outcome.exitCode}, Duration: ${outcome.durationMs}ms`);
 
-	const runId = logRunToDb(args.dbPath, cleanName, args.moduleArgs, outcome, args.engagementId);
-	log(runId !== null ? `Logged to module_runs: id=${runId}` : 'DB log skipped');
+	ctx.runLog.addRunnerRow(args.dbPath, {
+		run_id: ctx.runId,
+		engagement_id: args.engagementId ?? null,
+		module_name: cleanName,
+		args: JSON.stringify(args.moduleArgs),
+		exit_code: outcome.exitCode,
+		stdout: outcome.stdout.slice(0, LOG_PREVIEW_CHARS),
+		stderr: outcome.stderr.slice(0, LOG_PREVIEW_CHARS),
+		duration_ms: outcome.durationMs
+	});
+	const written = ctx.runLog.flush();
+	log(written > 0 ? `Logged to module_runs: run_id=${ctx.runId}` : 'DB log skipped');
 
 	emitOutcome(cleanName, outcome);
 	process.exit(outcome.exitCode);
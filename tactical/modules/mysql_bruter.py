@@ -10,9 +10,9 @@ Karton dependency removed, base_module.py used instead.
 import json
 import time
 
-import pymysql
+from base_module import TacticalModule, lazy_import
 
-from base_module import TacticalModule
+pymysql = lazy_import("pymysql", ("err",))
 
 DEFAULT_CREDENTIALS = [
     ("root", ""),
@@ -18,6 +18,7 @@ from base_module import TacticalModule
 class NBTScanScanner(TacticalModule):
     name = "nbtscan_scanner"
     description = "NetBIOS name scanning via nbtscan"
+    ingests_rf = True
 
     def _add_module_args(self) -> None:
         self.parser.add_argument(
@@ -51,6 +52,13 @@ class NBTScanScanner(TacticalModule):
 
         hosts = self._parse_output(result.stdout)
 
+        state = self.campaign_state(args)
+        if state is not None:
+            state.record_hosts(hosts, source=self.name)
+        ingest = self.rf_ingest(args)
+        if ingest is not None:
+            ingest.record_hosts(hosts)
+
         self.log_run(
             args.db_path, self.name,
             json.dumps(vars(args), default=str),
@@ -19,6 +19,7 @@ from base_module import TacticalModule
 class NetDiscover(TacticalModule):
     name = "net_discover"
     description = "ARP-based network host discovery via netdiscover"
+    ingests_rf = True
 
     def _add_module_args(self) -> None:
         self.parser.add_argument(
@@ -82,6 +83,13 @@ class NetDiscover(TacticalModule):
         # Parse output
         hosts = self._parse_output(result.stdout)
 
+        state = self.campaign_state(args)
+        if state is not None:
+            state.record_hosts(hosts, source=self.name)
+        ingest = self.rf_ingest(args)
+        if ingest is not None:
+            ingest.record_hosts(hosts)
+
         self.log_run(
             args.db_path, self.name,
             json.dumps(vars(args), default=str),
@@ -6,6 +6,10 @@ CLI deps: recon-ng (installed on Kali)
 
 Dispatches recon-ng modules for OSINT data collection.
 Runs in non-interactive mode with resource script generation.
+
+Listings (--list-modules, --show) go to a pooled recon-ng session per
+workspace (core/tool_pool.py) instead of a fresh recon-ng each time, so
+the framework and its module index load once.
 """
 
 import json
@@ -15,6 +19,9 @@ import time
 
 from base_module import TacticalModule
 
+# recon-ng prompt, e.g. "[recon-ng][argos] > " or "[recon-ng][argos][bing_domain_web] > "
+_PROMPT_RE = r"\[recon-ng\](?:\[[^\]]*\])+ > "
+
 
 class OSINTFramework(TacticalModule):
     name = "osint_framework"
@@ -121,21 +128,42 @@ class OSINTFramework(TacticalModule):
             "duration_ms": duration_ms,
         })
 
-    def _list_modules(self, args) -> None:
-        """List available recon-ng modules."""
-        rc = "modules search\nexit\n"
+    def _query(self, args, command: str, timeout: int = 30) -> str:
+        """Run one recon-ng command in the workspace's pooled session, or via a resource script."""
+        from core.tool_pool import MarkerSession, ToolSessionError
+
+        session = self.tool_session(
+            ("recon-ng", args.workspace),
+            lambda: MarkerSession(
+                ["recon-ng", "-w", args.workspace],
+                marker_cmd="shell echo {marker}",
+                prompt_re=_PROMPT_RE,
+                startup_timeout=timeout,
+            ),
+        )
+        if session is not None:
+            try:
+                return session.cmd(command, timeout=timeout)
+            except ToolSessionError as exc:
+                self.logger.warning("recon-ng session failed (%s); using a resource script", exc)
+
         rc_file = tempfile.NamedTemporaryFile(mode="w", suffix=".rc", delete=False)
-        rc_file.write(rc)
+        rc_file.write(f"workspaces load {args.workspace}\n{command}\nexit\n")
         rc_file.close()
 
-        result = self.run_tool("recon-ng", ["-r", rc_file.name], timeout=30)
+        result = self.run_tool("recon-ng", ["-r", rc_file.name], timeout=timeout)
         try:
             os.unlink(rc_file.name)
         except OSError:
             pass
+        return result.stdout
+
+    def _list_modules(self, args) -> None:
+        """List available recon-ng modules."""
+        output = self._query(args, "modules search")
 
         modules: list[str] = []
-        for line in result.stdout.split("\n"):
+        for line in output.split("\n"):
             line = line.strip()
             if line.startswith("recon/") or line.startswith("discovery/") or line.startswith("reporting/"):
                 modules.append(line.split()[0])
@@ -144,21 +172,12 @@ class OSINTFramework(TacticalModule):
 
     def _show_data(self, args) -> None:
         """Show data from recon-ng workspace."""
-        rc = f"workspaces load {args.workspace}\nshow {args.show}\nexit\n"
-        rc_file = tempfile.NamedTemporaryFile(mode="w", suffix=".rc", delete=False)
-        rc_file.write(rc)
-        rc_file.close()
-
-        result = self.run_tool("recon-ng", ["-r", rc_file.name], timeout=30)
-        try:
-            os.unlink(rc_file.name)
-        except OSError:
-            pass
+        output = self._query(args, f"show {args.show}")
 
         self.output_success({
             "workspace": args.workspace,
             "table": args.show,
-            "data": result.stdout[:5000],
+            "data": output[:5000],
         })
 
     @staticmethod
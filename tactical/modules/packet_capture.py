@@ -151,10 +151,6 @@ class PacketCapture(TacticalModule):
 
         return stats
 
-    def _count_pcap_lines(self, stdout: str) -> int:
-        """Count non-empty output lines as a proxy for packet count."""
-        return sum(1 for line in stdout.splitlines() if line.strip())
-
     # ── Main run ────────────────────────────────────────────────────
 
     def run(self, args: argparse.Namespace) -> None:
@@ -166,13 +162,34 @@ class PacketCapture(TacticalModule):
             "Starting packet capture on %s for %ds", args.interface, args.duration
         )
 
-        stdout, stderr = self.run_tool_popen(
+        # Count and preview packet lines as tcpdump prints them; a long -v
+        # capture is never held in memory. The summary is in the last few
+        # stderr lines.
+        preview: list[str] = []
+        line_count = 0
+        stderr_tail: list[str] = []
+
+        def on_line(line: str) -> None:
+            nonlocal line_count
+            if not line.strip():
+                return
+            line_count += 1
+            if len(preview) < 20:
+                preview.append(line)
+
+        def on_stderr(line: str) -> None:
+            stderr_tail.append(line)
+            del stderr_tail[:-20]
+
+        self.run_tool_stream(
             "tcpdump",
             tcpdump_args,
+            on_stdout=on_line,
+            on_stderr=on_stderr,
             duration=args.duration,
         )
 
-        packet_stats = self._parse_packet_count(stderr)
+        packet_stats = self._parse_packet_count("\n".join(stderr_tail))
 
         result: dict = {
             "interface": args.interface,
@@ -191,9 +208,8 @@ class PacketCapture(TacticalModule):
             )
         else:
             # Provide a preview of captured output
-            lines = [line for line in stdout.splitlines() if line.strip()]
-            result["packet_preview"] = lines[:20]
-            result["preview_lines"] = len(lines)
+            result["packet_preview"] = preview
+            result["preview_lines"] = line_count
 
         self.output_success(result)
 
@@ -32,6 +32,7 @@ class PacketManipulator(TacticalModule):
         "arp-scan (discover hosts via ARP). "
         "Root required for craft and arp-scan."
     )
+    ingests_rf: bool = True
 
     def _add_module_args(self) -> None:
         """Register packet manipulator arguments."""
@@ -297,6 +298,12 @@ class PacketManipulator(TacticalModule):
             result = self._sniff_packets(args, scapy)
         else:  # arp-scan
             result = self._arp_scan(args, scapy)
+            state = self.campaign_state(args)
+            if state is not None:
+                state.record_hosts(result["hosts_found"], source=self.name)
+            ingest = self.rf_ingest(args)
+            if ingest is not None:
+                ingest.record_hosts(result["hosts_found"])
 
         self.output_success({"mode": args.mode, **result})
 
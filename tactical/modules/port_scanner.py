@@ -5,7 +5,9 @@ port_scanner — Port scanning and service fingerprinting via nmap.
 Source: Adapted from Artemis port_scanner.py (nmap replaces naabu).
 CLI deps: nmap (installed on Kali)
 
-Scans a target for open ports and identifies running services.
+Scans a target for open ports and identifies running services. Results go
+to the campaign's shared state (core/state_store.py); --skip-known leaves
+out ports an earlier scan in the campaign already fingerprinted.
 """
 
 import json
@@ -41,6 +43,11 @@ class PortScanner(TacticalModule):
             action="store_true",
             help="Fast mode: skip version detection, use T4 timing",
         )
+        self.parser.add_argument(
+            "--skip-known",
+            action="store_true",
+            help="Skip ports already fingerprinted on this target in the campaign (reported as known_ports)",
+        )
 
     def run(self, args) -> None:
         target = args.target
@@ -79,6 +86,14 @@ class PortScanner(TacticalModule):
         else:
             nmap_args.extend(["-p", port_spec])
 
+        state = self.campaign_state(args)
+        known: list[dict] = []
+        if args.skip_known and state is not None:
+            known = state.known_ports(target)
+            if known:
+                nmap_args.extend(["--exclude-ports", self._port_list(known)])
+                self.logger.info("Skipping %d already fingerprinted port(s)", len(known))
+
         nmap_args.append(target)
 
         # Execute
@@ -101,15 +116,64 @@ class PortScanner(TacticalModule):
             return
 
         # Parse XML output
-        ports = self._parse_nmap_xml(result.stdout)
+        with self.span("parse"):
+            ports = self._parse_nmap_xml(result.stdout)
+            host = self._parse_nmap_host(result.stdout)
 
-        self.output_success({
+        if state is not None and host is not None:
+            state.upsert_hosts([host], source=self.name)
+            state.upsert_services(({"ip": host["ip"], **p} for p in ports), source=self.name)
+
+        data = {
             "target": target,
             "ports": ports,
             "open_count": sum(1 for p in ports if p["state"] == "open"),
             "scan_type": args.scan_type,
             "scan_time_ms": duration_ms,
-        })
+        }
+        if args.skip_known:
+            data["known_ports"] = [
+                {k: s[k] for k in ("port", "protocol", "state", "service", "version")}
+                for s in known
+            ]
+        self.output_success(data)
+
+    @staticmethod
+    def _port_list(services: list[dict]) -> str:
+        """nmap port list with protocol prefixes, e.g. "T:22,80,U:53"."""
+        by_proto: dict[str, list[str]] = {}
+        for s in services:
+            by_proto.setdefault("U" if s["protocol"] == "udp" else "T", []).append(str(s["port"]))
+        return ",".join(f"{proto}:{','.join(ports)}" for proto, ports in sorted(by_proto.items()))
+
+    @staticmethod
+    def _parse_nmap_host(xml_output: str) -> dict | None:
+        """The scanned host's address, hostname and status from nmap XML."""
+        import xml.etree.ElementTree as ET
+
+        try:
+            root = ET.fromstring(xml_output)
+        except ET.ParseError:
+            return None
+
+        host = root.find("host")
+        if host is None:
+            return None
+        addr = host.find("address[@addrtype='ipv4']")
+        if addr is None:
+            addr = host.find("address")
+        if addr is None:
+            return None
+        mac = host.find("address[@addrtype='mac']")
+        name = host.find("hostnames/hostname")
+        status = host.find("status")
+        return {
+            "ip": addr.get("addr", ""),
+            "mac": mac.get("addr") if mac is not None else None,
+            "vendor": mac.get("vendor") if mac is not None else None,
+            "hostname": name.get("name") if name is not None else None,
+            "status": status.get("state") if status is not None else None,
+        }
 
     @staticmethod
     def _parse_nmap_xml(xml_output: str) -> list[dict]:
@@ -10,9 +10,9 @@ Karton dependency removed, base_module.py used instead.
 import json
 import time
 
-import psycopg2
+from base_module import TacticalModule, lazy_import
 
-from base_module import TacticalModule
+psycopg2 = lazy_import("psycopg2")
 
 DEFAULT_CREDENTIALS = [
     ("postgres", ""),
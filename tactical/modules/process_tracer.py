@@ -14,6 +14,7 @@ Syscall filter categories:
 
 import argparse
 import re
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
@@ -140,12 +141,12 @@ class ProcessTracer(TacticalModule):
 
         return strace_args
 
-    def _parse_summary(self, stderr: str) -> list[dict[str, Any]]:
-        """Parse strace -c summary table from stderr."""
+    def _parse_summary(self, stderr: Iterable[str]) -> list[dict[str, Any]]:
+        """Parse strace -c summary table from stderr lines (consumed lazily)."""
         syscalls: list[dict[str, Any]] = []
         in_table = False
 
-        for line in stderr.splitlines():
+        for line in stderr:
             if "% time" in line or "syscall" in line.lower():
                 in_table = True
                 continue
@@ -193,21 +194,31 @@ class ProcessTracer(TacticalModule):
             args.filter or "all",
         )
 
-        stdout, stderr = self.run_tool_popen(
-            "strace",
-            strace_args,
-            duration=args.duration,
-        )
-
-        combined = stdout + "\n" + stderr
-
+        # A traced command can print without limit: spool the raw trace to
+        # disk (stdout and stderr interleaved as they arrive) and parse the
+        # summary table off stderr as it streams, holding neither in memory.
+        raw_file = None
         if args.output_file:
             out_path = Path(args.output_file)
             out_path.parent.mkdir(parents=True, exist_ok=True)
-            out_path.write_text(combined)
+            raw_file = out_path.open("w")
+
+        stream = self.stream_tool("strace", strace_args, duration=args.duration)
+
+        def stderr_lines() -> Iterator[str]:
+            for stream_name, line in stream:
+                if raw_file is not None:
+                    raw_file.write(f"{line}\n")
+                if stream_name == "stderr":
+                    yield line  # type: ignore[misc]
+
+        try:
+            syscall_summary = self._parse_summary(stderr_lines())
+        finally:
+            if raw_file is not None:
+                raw_file.close()
+        if args.output_file:
             self.logger.info("Raw trace saved to %s", args.output_file)
-
-        syscall_summary = self._parse_summary(stderr)
         category_map = self._categorize(syscall_summary)
 
         total_calls = sum(s["calls"] for s in syscall_summary)
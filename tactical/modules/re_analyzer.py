@@ -2,10 +2,16 @@
 """
 Reverse Engineering Analyzer Module — static analysis via radare2.
 
-Wraps radare2 (r2) in non-interactive batch mode (-q -c "command")
-to extract binary intelligence: file info, strings, functions,
-imports, section layout, and disassembly at a specific address.
+Wraps radare2 (r2) to extract binary intelligence: file info, strings,
+functions, imports, section layout, and disassembly at a specific address.
 Uses r2's JSON output (aj/aflj/iij/isj/pdj flags) where available.
+
+Queries go to a pooled `r2 -q0` session per binary (core/tool_pool.py), so
+the binary is loaded and `aa` analysis runs once however many modes are
+queried; batch mode (-q -c "command") is the fallback. Analysed and
+unanalysed queries use separate sessions: `aa` changes what every later
+command prints, so sharing one would make an unanalysed answer depend on
+whichever query ran before it.
 """
 
 import argparse
@@ -14,7 +20,7 @@ import re
 from pathlib import Path
 from typing import Any
 
-from base_module import TacticalModule
+from base_module import TacticalModule, json_loads
 
 # r2 commands for each mode (prefer JSON output with j suffix)
 _R2_COMMANDS: dict[str, str] = {
@@ -36,6 +42,8 @@ _R2_PLAIN_COMMANDS: dict[str, str] = {
     "disasm":    "",
 }
 
+_R2_OPTIONS = ["scr.color=false", "anal.timeout=60"]
+
 _HEX_ADDR_RE = re.compile(r"^0x[0-9a-fA-F]+$")
 
 
@@ -48,6 +56,8 @@ class ReAnalyzer(TacticalModule):
         "info, strings, functions, imports, sections, or disassembly."
     )
 
+    cache_ttl = 86400
+
     def _add_module_args(self) -> None:
         self.parser.add_argument(
             "--file",
@@ -101,23 +111,44 @@ class ReAnalyzer(TacticalModule):
                 {"instructions": args.instructions},
             )
 
-    def _build_r2_command(self, args: argparse.Namespace) -> str:
-        """Construct the r2 -c command string."""
-        pre = "aa;" if args.analyze and args.mode in ("functions", "imports") else ""
+    @staticmethod
+    def _needs_analysis(args: argparse.Namespace) -> bool:
+        return args.analyze and args.mode in ("functions", "imports")
+
+    def _build_query(self, args: argparse.Namespace) -> str:
+        """The r2 command for this mode, without the analysis step."""
         if args.mode == "disasm":
             addr_part = args.address if args.address else "entry0"
-            return f"{pre}pdj {args.instructions} @ {addr_part}"
-        return f"{pre}{_R2_COMMANDS[args.mode]}"
+            return f"pdj {args.instructions} @ {addr_part}"
+        return _R2_COMMANDS[args.mode]
+
+    def _build_r2_command(self, args: argparse.Namespace) -> str:
+        """Construct the r2 -c command string."""
+        pre = "aa;" if self._needs_analysis(args) else ""
+        return f"{pre}{self._build_query(args)}"
 
     def _run_r2(self, args: argparse.Namespace, command: str) -> tuple[str, int]:
-        """Execute r2 in batch mode and return (stdout, return_code)."""
-        r2_args = [
-            "-q",       # quiet (no banner)
-            "-e", "scr.color=false",
-            "-e", "anal.timeout=60",
-            "-c", command,
-            args.file,
-        ]
+        """Run the query in the pooled r2 session, or r2 batch mode; returns (stdout, return_code)."""
+        from core.tool_pool import R2Session, ToolSessionError, input_identity
+
+        analyze = self._needs_analysis(args)
+        session = self.tool_session(
+            ("r2", analyze, *input_identity(args.file)),
+            lambda: R2Session(args.file, _R2_OPTIONS, startup_timeout=args.timeout),
+        )
+        if session is not None:
+            try:
+                if analyze and not session.state.get("analyzed"):
+                    session.cmd("aa", timeout=args.timeout)
+                    session.state["analyzed"] = True
+                return session.cmd(self._build_query(args), timeout=args.timeout), 0
+            except ToolSessionError as exc:
+                self.logger.warning("r2 session failed (%s); retrying in batch mode", exc)
+
+        r2_args = ["-q"]  # quiet (no banner)
+        for opt in _R2_OPTIONS:
+            r2_args += ["-e", opt]
+        r2_args += ["-c", command, args.file]
         result = self.run_tool("r2", r2_args, timeout=args.timeout)
         return result.stdout, result.returncode
 
@@ -131,7 +162,7 @@ class ReAnalyzer(TacticalModule):
 
         # Try JSON parse
         try:
-            data = json.loads(raw)
+            data = json_loads(raw)
             return {"data": data, "parsed": True, "count": len(data) if isinstance(data, list) else 1}
         except json.JSONDecodeError:
             pass
@@ -221,6 +252,10 @@ class ReAnalyzer(TacticalModule):
 
         return summary
 
+    def cache_inputs(self, args: argparse.Namespace) -> list[str] | None:
+        """r2 output depends only on the binary and the query args."""
+        return [args.file]
+
     def run(self, args: argparse.Namespace) -> None:
         """Execute r2 analysis and return structured results."""
         self._validate_args(args)
@@ -243,8 +278,9 @@ class ReAnalyzer(TacticalModule):
                 {"return_code": return_code, "file": args.file},
             )
 
-        parsed = self._parse_output(args.mode, raw_output)
-        summary = self._summarize(args.mode, parsed)
+        with self.span("parse"):
+            parsed = self._parse_output(args.mode, raw_output)
+            summary = self._summarize(args.mode, parsed)
 
         self.output_success(
             {
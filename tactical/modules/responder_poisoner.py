@@ -72,7 +72,7 @@ class ResponderPoisoner(TacticalModule):
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
-            preexec_fn=os.setsid,  # New process group for clean kill
+            start_new_session=True,  # New process group for clean kill
         )
 
         # Wait for the specified duration
@@ -24,6 +24,7 @@ class RfReplay(TacticalModule):
         "Replay a captured IQ file through HackRF One via hackrf_transfer -t. "
         "Requires root. WARNING: Only use in authorized training environments."
     )
+    devices = ("hackrf",)
 
     def _add_module_args(self) -> None:
         self.parser.add_argument(
@@ -0,0 +1,190 @@
+/**
+ * module_runs writer for module_runner.ts — one row per run, merged by run_id.
+ *
+ * A spawned module sends its own module_runs / module_run_spans rows over
+ * the runner's log pipe instead of opening the DB. RunLogWriter collects
+ * them with the runner's row for the run, merges module_runs rows by
+ * run_id — the module's non-null fields win, the runner's fill the gaps —
+ * and writes each DB's rows in one transaction. Where module_runs.run_id
+ * is unique the insert also merges into a row the module already wrote
+ * itself (through the daemon), again filling only what that row lacks.
+ * Kept apart from the runner so it can be tested without running one.
+ */
+
+import Database from 'better-sqlite3';
+import { existsSync } from 'fs';
+
+export type Row = Record<string, unknown>;
+
+/** Columns a row may carry; ones a DB predates are left out (see core/run_log.py). */
+const TABLE_COLUMNS: Record<string, readonly string[]> = {
+	module_runs: [
+		'engagement_id',
+		'module_name',
+		'args',
+		'exit_code',
+		'stdout',
+		'stderr',
+		'duration_ms',
+		'stdout_artifact',
+		'stderr_artifact',
+		'resources',
+		'run_id',
+		'profile_path',
+		'input_size'
+	],
+	module_run_spans: ['run_id', 'module_name', 'name', 'start_ms', 'duration_ms', 'depth']
+};
+
+function openDbIfReady(dbPath: string): Database.Database | null {
+	if (!existsSync(dbPath)) {
+		log(`DB not found at ${dbPath}, skipping log`);
+		return null;
+	}
+
+	const db = new Database(dbPath);
+	db.pragma('journal_mode = WAL');
+	db.pragma('busy_timeout = 5000');
+
+	const tableCheck = db
+		.prepare(`SELECT name FROM sqlite_master WHERE type='table' AND name='module_runs'`)
+		.get();
+
+	if (!tableCheck) {
+		log('module_runs table does not exist, skipping DB log');
+		db.close();
+		return null;
+	}
+
+	return db;
+}
+
+/** True when module_runs.run_id is unique (20261017_unique_module_run_id.sql). */
+function hasUniqueRunId(db: Database.Database): boolean {
+	const indexes = db.pragma('index_list(module_runs)') as Array<{ name: string; unique: number }>;
+	return indexes.some(
+		(index) =>
+			index.unique === 1 &&
+			(db.pragma(`index_info(${index.name})`) as Array<{ name: string }>)
+				.map((c) => c.name)
+				.join(',') === 'run_id'
+	);
+}
+
+/**
+ * Prepared INSERT for the columns of table this DB has. For module_runs
+ * with a unique run_id it merges into an existing row — written by the
+ * module through the daemon — filling only what that row lacks.
+ */
+function prepareInsert(
+	db: Database.Database,
+	table: string
+): { columns: string[]; stmt: Database.Statement } | null {
+	const existing = new Set(
+		(db.pragma(`table_info(${table})`) as Array<{ name: string }>).map((c) => c.name)
+	);
+	const columns = TABLE_COLUMNS[table].filter((c) => existing.has(c));
+	if (columns.length === 0) return null;
+
+	let sql = `INSERT INTO ${table} (${columns.join(', ')}) VALUES (${columns.map(() => '?').join(', ')})`;
+	if (table === 'module_runs' && columns.includes('run_id') && hasUniqueRunId(db)) {
+		const updates = columns
+			.filter((c) => c !== 'run_id')
+			.map((c) => `${c} = COALESCE(${table}.${c}, excluded.${c})`);
+		sql += ` ON CONFLICT (run_id) DO UPDATE SET ${updates.join(', ')}`;
+	}
+	return { columns, stmt: db.prepare(sql) };
+}
+
+/**
+ * The run's single module_runs writer. Collects the module's rows (from
+ * its log pipe) and the runner's own, merges module_runs rows by run_id
+ * and writes each DB's rows in one transaction on flush().
+ */
+export class RunLogWriter {
+	private readonly runs = new Map<string, Map<string, Row>>();
+	private readonly spans = new Map<string, Row[]>();
+
+	/** One JSON line from the module's log pipe: {"db", "table", "row"}. */
+	accept(line: string): void {
+		let record: { db?: string; table?: string; row?: Row };
+		try {
+			record = JSON.parse(line) as typeof record;
+		} catch {
+			log('Warning: dropped non-JSON run log record');
+			return;
+		}
+		if (!record.db || !record.row) return;
+		if (record.table === 'module_run_spans') {
+			const spans = this.spans.get(record.db) ?? [];
+			spans.push(record.row);
+			this.spans.set(record.db, spans);
+		} else if (record.table === 'module_runs') {
+			this.merge(record.db, record.row, true);
+		}
+	}
+
+	/** The runner's row for the run; it only fills fields the module did not report. */
+	addRunnerRow(dbPath: string, row: Row): void {
+		this.merge(dbPath, row, false);
+	}
+
+	private merge(dbPath: string, row: Row, wins: boolean): void {
+		const byRun = this.runs.get(dbPath) ?? new Map<string, Row>();
+		this.runs.set(dbPath, byRun);
+		const key = typeof row.run_id === 'string' && row.run_id ? row.run_id : `#${byRun.size}`;
+		const merged = byRun.get(key) ?? {};
+		for (const [column, value] of Object.entries(row)) {
+			if (value === null || value === undefined) continue;
+			if (wins || merged[column] === null || merged[column] === undefined) merged[column] = value;
+		}
+		byRun.set(key, merged);
+	}
+
+	/** Write everything collected. Returns the number of module_runs rows written. */
+	flush(): number {
+		let written = 0;
+		for (const dbPath of new Set([...this.runs.keys(), ...this.spans.keys()])) {
+			written += this.write(
+				dbPath,
+				[...(this.runs.get(dbPath)?.values() ?? [])],
+				this.spans.get(dbPath) ?? []
+			);
+		}
+		this.runs.clear();
+		this.spans.clear();
+		return written;
+	}
+
+	private write(dbPath: string, runs: Row[], spans: Row[]): number {
+		try {
+			const db = openDbIfReady(dbPath);
+			if (!db) return 0;
+			try {
+				const insertRun = prepareInsert(db, 'module_runs');
+				const insertSpan = spans.length ? prepareInsert(db, 'module_run_spans') : null;
+				const insertAll = db.transaction(() => {
+					for (const [insert, rows] of [
+						[insertRun, runs],
+						[insertSpan, spans]
+					] as const) {
+						if (!insert) continue;
+						for (const row of rows) insert.stmt.run(insert.columns.map((c) => row[c] ?? null));
+					}
+				});
+				insertAll();
+				return insertRun ? runs.length : 0;
+			} finally {
+				db.close();
+			}
+		} catch (err) {
+			log(`DB log failed: ${err instanceof Error ? err.message : String(err)}`);
+			return 0;
+		}
+	}
+}
+
+function log(msg: string): void {
+	const ts = new Date().toISOString();
+	process.stderr.write(`[${ts}] [module_runner] ${msg}\n`);
+}
@@ -336,7 +336,7 @@ class SocialEngineer(TacticalModule):
                     stderr=subprocess.PIPE,
                     text=True,
                     env={**os.environ, "TERM": "dumb"},
-                    preexec_fn=os.setsid,
+                    start_new_session=True,
                 )
 
             try:
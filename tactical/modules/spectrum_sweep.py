@@ -9,13 +9,59 @@ dB values...). Returns peak frequencies and a summary power table.
 
 import argparse
 import csv
+import heapq
 import io
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
 from base_module import TacticalModule
 
 
+class _SweepStats:
+    """
+    Running sweep summary: overall min/max/sum, per-MHz sum/count and a
+    top-N heap of bins, so a long sweep never holds every bin in memory.
+    """
+
+    def __init__(self, top_n: int = 10) -> None:
+        self.top_n = top_n
+        self.count = 0
+        self.min_db = float("inf")
+        self.max_db = float("-inf")
+        self.sum_db = 0.0
+        self._mhz: dict[float, list[float]] = {}  # mhz -> [sum, count]
+        # (power_db, -seq, bin): on equal power the earlier bin wins
+        self._top: list[tuple[float, int, dict[str, Any]]] = []
+
+    def add_bins(self, bins: Iterable[dict[str, Any]]) -> None:
+        for b in bins:
+            power = b["power_db"]
+            self.count += 1
+            self.sum_db += power
+            self.min_db = min(self.min_db, power)
+            self.max_db = max(self.max_db, power)
+            bucket = self._mhz.setdefault(round(b["center_hz"] / 1e6, 1), [0.0, 0])
+            bucket[0] += power
+            bucket[1] += 1
+            entry = (power, -self.count, b)
+            if len(self._top) < self.top_n:
+                heapq.heappush(self._top, entry)
+            elif entry[:2] > self._top[0][:2]:
+                heapq.heapreplace(self._top, entry)
+
+    def peaks(self) -> list[dict[str, Any]]:
+        """Top-N bins, strongest first."""
+        return [b for _, _, b in sorted(self._top, key=lambda e: (-e[0], -e[1]))]
+
+    def by_mhz(self) -> dict[float, float]:
+        """Average power per MHz bucket, in frequency order."""
+        return {
+            mhz: round(total / n, 2)
+            for mhz, (total, n) in sorted(self._mhz.items())
+        }
+
+
 class SpectrumSweep(TacticalModule):
     """Wideband RF spectrum sweep using hackrf_sweep."""
 
@@ -23,6 +69,8 @@ class SpectrumSweep(TacticalModule):
     description = (
         "Scan a frequency range with hackrf_sweep and report peak power levels."
     )
+    devices = ("hackrf",)
+    ingests_rf = True
 
     def _add_module_args(self) -> None:
         self.parser.add_argument(
@@ -91,51 +139,49 @@ class SpectrumSweep(TacticalModule):
         Returns list of bin dicts with center_hz and power_db.
         """
         bins: list[dict[str, Any]] = []
-        reader = csv.reader(io.StringIO(raw_csv))
-        for row in reader:
-            if len(row) < 7:
-                continue
-            try:
-                hz_low = float(row[2].strip())
-                hz_high = float(row[3].strip())
-                hz_bin_width = float(row[4].strip())
-                db_values = [float(v.strip()) for v in row[6:] if v.strip()]
-                if not db_values:
-                    continue
-                for i, db in enumerate(db_values):
-                    center_hz = hz_low + hz_bin_width * i + hz_bin_width / 2.0
-                    bins.append(
-                        {
-                            "center_hz": int(center_hz),
-                            "center_mhz": round(center_hz / 1e6, 3),
-                            "power_db": round(db, 2),
-                        }
-                    )
-            except (ValueError, IndexError):
-                continue
+        for row in csv.reader(io.StringIO(raw_csv)):
+            bins.extend(self._parse_csv_row(row))
         return bins
 
-    def _find_peaks(
-        self, bins: list[dict[str, Any]], top_n: int = 10
-    ) -> list[dict[str, Any]]:
-        """Return the top-N bins by power level."""
-        if not bins:
+    @staticmethod
+    def _parse_csv_row(row: list[str]) -> list[dict[str, Any]]:
+        """Parse one hackrf_sweep CSV row into bin dicts (empty if malformed)."""
+        if len(row) < 7:
             return []
-        sorted_bins = sorted(bins, key=lambda b: b["power_db"], reverse=True)
-        return sorted_bins[:top_n]
-
-    def _aggregate_by_mhz(
-        self, bins: list[dict[str, Any]]
-    ) -> dict[float, float]:
-        """Average power readings per integer MHz bucket."""
-        buckets: dict[float, list[float]] = {}
-        for b in bins:
-            mhz_key = round(b["center_hz"] / 1e6, 1)
-            buckets.setdefault(mhz_key, []).append(b["power_db"])
-        return {
-            mhz: round(sum(vals) / len(vals), 2)
-            for mhz, vals in sorted(buckets.items())
-        }
+        try:
+            hz_low = float(row[2].strip())
+            hz_bin_width = float(row[4].strip())
+            db_values = [float(v.strip()) for v in row[6:] if v.strip()]
+        except (ValueError, IndexError):
+            return []
+        bins: list[dict[str, Any]] = []
+        for i, db in enumerate(db_values):
+            center_hz = hz_low + hz_bin_width * i + hz_bin_width / 2.0
+            bins.append(
+                {
+                    "center_hz": int(center_hz),
+                    "center_mhz": round(center_hz / 1e6, 3),
+                    "power_db": round(db, 2),
+                }
+            )
+        return bins
+
+    @staticmethod
+    def _peak_signals(peaks: list[dict[str, Any]], bin_width: int) -> list[dict[str, Any]]:
+        """Peak bins as rf_signals observations, one synthetic emitter per MHz/10 dB cell."""
+        from core.rf_ingest import synthetic_device_id
+
+        return [
+            {
+                "device_id": synthetic_device_id("rf", p["center_mhz"], p["power_db"]),
+                "type": "rf",
+                "frequency": p["center_mhz"],
+                "power": p["power_db"],
+                "bandwidth": bin_width,
+                "metadata": {"signalType": "rf", "bin_width_hz": bin_width},
+            }
+            for p in peaks
+        ]
 
     def run(self, args: argparse.Namespace) -> None:
         """Execute hackrf_sweep and parse spectrum data."""
@@ -159,38 +205,65 @@ class SpectrumSweep(TacticalModule):
             args.duration,
         )
 
-        stdout, stderr = self.run_tool_popen(
-            "hackrf_sweep",
-            cmd_args,
-            duration=args.duration,
-        )
+        # Stream rows as hackrf_sweep emits them: each row's bins are folded
+        # into running stats (and the raw CSV optionally spooled to disk), so
+        # memory stays flat however long the capture runs.
+        stats = _SweepStats(top_n=10)
+        stderr_tail: list[str] = []
+        preview: list[str] = []
+        raw_file = None
+        if args.output_file:
+            out_path = Path(args.output_file)
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            raw_file = out_path.open("w")
+
+        def on_row(line: str) -> None:
+            if raw_file is not None:
+                raw_file.write(line + "\n")
+            if sum(len(p) for p in preview) < 300:
+                preview.append(line)
+            for row in csv.reader([line]):
+                stats.add_bins(self._parse_csv_row(row))
 
-        if not stdout.strip():
+        def on_stderr(line: str) -> None:
+            stderr_tail.append(line)
+            del stderr_tail[:-20]
+
+        try:
+            stream = self.run_tool_stream(
+                "hackrf_sweep",
+                cmd_args,
+                on_stdout=on_row,
+                on_stderr=on_stderr,
+                duration=args.duration,
+            )
+        finally:
+            if raw_file is not None:
+                raw_file.close()
+
+        stderr = "\n".join(stderr_tail)
+        if not stream.bytes_read["stdout"]:
             self.output_error(
                 "hackrf_sweep produced no output. Check device connection.",
                 {"stderr": stderr[-500:] if stderr else ""},
             )
 
-        # Optionally save raw CSV
         if args.output_file:
-            out_path = Path(args.output_file)
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            out_path.write_text(stdout)
             self.logger.info("Raw CSV saved to %s", args.output_file)
 
-        bins = self._parse_csv(stdout)
-        if not bins:
+        if not stats.count:
             self.output_error(
                 "Failed to parse any spectrum bins from hackrf_sweep output.",
-                {"raw_output_preview": stdout[:300]},
+                {"raw_output_preview": "\n".join(preview)[:300]},
             )
 
-        peaks = self._find_peaks(bins, top_n=10)
-        avg_by_mhz = self._aggregate_by_mhz(bins)
+        with self.span("aggregate"):
+            peaks = stats.peaks()
+            avg_by_mhz = stats.by_mhz()
 
-        overall_min = min(b["power_db"] for b in bins)
-        overall_max = max(b["power_db"] for b in bins)
-        overall_avg = round(sum(b["power_db"] for b in bins) / len(bins), 2)
+        ingest = self.rf_ingest(args)
+        if ingest is not None:
+            ingest.ingest(signals=self._peak_signals(peaks, args.bin_width))
 
         self.output_success(
             {
@@ -200,10 +273,10 @@ class SpectrumSweep(TacticalModule):
                 "freq_end_mhz": round(args.freq_end / 1e6, 1),
                 "bin_width_hz": args.bin_width,
                 "duration_sec": args.duration,
-                "total_bins": len(bins),
-                "power_min_db": overall_min,
-                "power_max_db": overall_max,
-                "power_avg_db": overall_avg,
+                "total_bins": stats.count,
+                "power_min_db": stats.min_db,
+                "power_max_db": stats.max_db,
+                "power_avg_db": round(stats.sum_db / stats.count, 2),
                 "peak_frequencies": peaks,
                 "power_by_mhz": avg_by_mhz,
                 "output_file": args.output_file or None,
@@ -13,9 +13,10 @@ import json
 import socket
 import time
 
-import paramiko
+from base_module import TacticalModule, lazy_import
 
-from base_module import TacticalModule
+# Deferred until run(): paramiko pulls in cryptography at import
+paramiko = lazy_import("paramiko")
 
 DEFAULT_CREDENTIALS = [
     ("user", "password"),
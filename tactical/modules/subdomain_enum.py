@@ -50,7 +50,7 @@ class SubdomainEnum(TacticalModule):
         am_args.extend(["-max-dns-queries", str(args.max_dns_queries)])
 
         start = time.monotonic()
-        result = self.run_tool("amass", am_args, timeout=args.timeout)
+        result = self.run_tool("amass", am_args, timeout=args.timeout, partial=True)
         duration_ms = int((time.monotonic() - start) * 1000)
 
         subdomains = self._parse_output(result.stdout)
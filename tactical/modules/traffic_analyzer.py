@@ -6,18 +6,40 @@ Analyzes network traffic from a PCAP file or live capture using tshark.
 Supports multiple analysis modes: conversations, protocols, endpoints,
 HTTP dissection, DNS queries, and general statistics.
 Outputs structured JSON by parsing tshark's -T json / -z stat flags.
+
+tshark has no interactive mode to keep warm, so for PCAP files the four
+-z statistics modes share one dissection instead: the first of them runs
+tshark once with every -z tap, and the per-mode blocks are kept in memory
+for that capture (keyed by path, size, mtime and filter). Further stat
+modes on the same capture within the process — the module daemon, or a
+run_collect() caller — are answered without re-reading the PCAP.
 """
 
 import argparse
 import json
 import re
+from collections import OrderedDict
+from collections.abc import Iterator
+from itertools import islice
 from typing import Any
 
-from base_module import TacticalModule
+from base_module import TacticalModule, json_loads
 
 
 _VALID_MODES = ("conversations", "protocols", "endpoints", "http", "dns", "statistics")
 
+# -z taps per stat mode, and the title tshark prints atop each block
+_STAT_TAPS: dict[str, tuple[str, str]] = {
+    "conversations": ("conv,tcp", "TCP Conversations"),
+    "protocols":     ("io,phs", "Protocol Hierarchy Statistics"),
+    "endpoints":     ("endpoints,tcp", "TCP Endpoints"),
+    "statistics":    ("io,stat,0", "IO Statistics"),
+}
+
+# Stat blocks of recently analysed captures: identity -> {mode: block}
+_STAT_SECTIONS: "OrderedDict[tuple[Any, ...], dict[str, str]]" = OrderedDict()
+_STAT_SECTIONS_MAX = 4
+
 
 class TrafficAnalyzer(TacticalModule):
     """Analyze network traffic from PCAP or live interface using tshark."""
@@ -28,6 +50,8 @@ class TrafficAnalyzer(TacticalModule):
         "conversations, protocols, endpoints, http, dns, statistics."
     )
 
+    cache_ttl = 3600
+
     def _add_module_args(self) -> None:
         """Register traffic analysis arguments."""
         source = self.parser.add_mutually_exclusive_group(required=True)
@@ -132,12 +156,65 @@ class TrafficAnalyzer(TacticalModule):
         }
         return mode_map[mode]
 
+    # ── Shared stat pass ─────────────────────────────────────────────
+
+    @staticmethod
+    def _split_stat_blocks(stdout: str) -> dict[str, str]:
+        """Split multi -z output into {mode: block}, each block bounded by ==== lines."""
+        titles = {title: mode for mode, (_, title) in _STAT_TAPS.items()}
+        blocks: dict[str, str] = {}
+        current: list[str] | None = None
+        for line in stdout.splitlines():
+            if re.match(r"^=+$", line.strip()):
+                if current is None:
+                    current = [line]
+                    continue
+                current.append(line)
+                title = next((l.strip(" |") for l in current[1:] if l.strip(" |")), "")
+                if title in titles:
+                    blocks[titles[title]] = "\n".join(current) + "\n"
+                current = None
+            elif current is not None:
+                current.append(line)
+        return blocks
+
+    def _stat_block(self, args: argparse.Namespace, base_args: list[str]) -> str | None:
+        """
+        The stat block for args.mode from the shared single-pass dissection.
+
+        Returns None if tshark's output could not be split into the
+        expected blocks; the caller then runs the mode on its own.
+        """
+        from core.tool_pool import input_identity
+
+        key = (*input_identity(args.input_file), args.filter)
+        sections = _STAT_SECTIONS.get(key)
+        if sections is None:
+            taps: list[str] = []
+            for tap, _ in _STAT_TAPS.values():
+                taps += ["-z", tap]
+            result = self.run_tool("tshark", base_args + taps + ["-q"], timeout=args.timeout)
+            sections = self._split_stat_blocks(result.stdout)
+            if len(sections) != len(_STAT_TAPS):
+                self.logger.warning("Shared stat pass returned %d/%d blocks", len(sections), len(_STAT_TAPS))
+                return None
+            _STAT_SECTIONS[key] = sections
+            while len(_STAT_SECTIONS) > _STAT_SECTIONS_MAX:
+                _STAT_SECTIONS.popitem(last=False)
+        else:
+            _STAT_SECTIONS.move_to_end(key)
+            self.logger.info("Reusing stat pass for %s", args.input_file)
+        return sections[args.mode]
+
     # ── Output parsers ───────────────────────────────────────────────
 
     def _parse_text_output(self, stdout: str, mode: str, top_n: int) -> list[dict[str, Any]]:
         """Parse tshark text-format statistical output into structured rows."""
+        return list(islice(self._iter_text_entries(stdout, mode), top_n))
+
+    def _iter_text_entries(self, stdout: str, mode: str) -> Iterator[dict[str, Any]]:
+        """Yield each structured row of tshark's text output as it is parsed."""
         lines = stdout.splitlines()
-        results: list[dict[str, Any]] = []
 
         if mode == "protocols":
             # Parse protocol hierarchy: lines like "  tcp       frames:N bytes:N"
@@ -146,11 +223,11 @@ class TrafficAnalyzer(TacticalModule):
                     r"(\S+)\s+frames:(\d+)\s+bytes:(\d+)", line
                 )
                 if match:
-                    results.append({
+                    yield {
                         "protocol": match.group(1),
                         "frames": int(match.group(2)),
                         "bytes": int(match.group(3)),
-                    })
+                    }
 
         elif mode in ("conversations", "endpoints"):
             # Parse tabular output — extract data rows after the header separator
@@ -162,7 +239,7 @@ class TrafficAnalyzer(TacticalModule):
                 if in_data and line.strip() and not line.startswith("Filter"):
                     parts = line.split()
                     if len(parts) >= 4:
-                        results.append({"raw": line.strip(), "columns": parts})
+                        yield {"raw": line.strip(), "columns": parts}
 
         elif mode == "statistics":
             # Parse IO stat table
@@ -171,56 +248,63 @@ class TrafficAnalyzer(TacticalModule):
                     r"(\d+\.\d+)\s*<>\s*(\d+\.\d+)\s+(\d+)\s+(\d+)", line
                 )
                 if match:
-                    results.append({
+                    yield {
                         "interval_start": float(match.group(1)),
                         "interval_end": float(match.group(2)),
                         "frames": int(match.group(3)),
                         "bytes": int(match.group(4)),
-                    })
-
-        return results[:top_n]
+                    }
 
     def _parse_json_output(
         self, stdout: str, mode: str, top_n: int
     ) -> tuple[list[dict[str, Any]], int]:
         """Parse tshark JSON output for http/dns modes. Returns (results, total_count)."""
-        if not stdout.strip():
-            return [], 0
+        packets = self._decode_packets(stdout)
+        return list(self._iter_json_entries(packets[:top_n], mode)), len(packets)
 
+    def _decode_packets(self, stdout: str) -> list[dict]:
+        """tshark -T json output as a list of packets ([] if empty or malformed)."""
+        if not stdout.strip():
+            return []
         try:
-            packets: list[dict] = json.loads(stdout)
+            return json_loads(stdout)
         except json.JSONDecodeError as exc:
             self.logger.warning("JSON decode error: %s", exc)
-            return [], 0
-
-        results: list[dict[str, Any]] = []
+            return []
 
-        for pkt in packets[:top_n]:
+    @staticmethod
+    def _iter_json_entries(packets: list[dict], mode: str) -> Iterator[dict[str, Any]]:
+        """Yield the http/dns entry of each packet that has one."""
+        for pkt in packets:
             layers = pkt.get("_source", {}).get("layers", {})
 
             if mode == "http":
                 http = layers.get("http", {})
                 if http:
-                    results.append({
+                    yield {
                         "method": http.get("http.request.method", ""),
                         "uri": http.get("http.request.full_uri", ""),
                         "host": http.get("http.host", ""),
                         "user_agent": http.get("http.user_agent", ""),
                         "response_code": http.get("http.response.code", ""),
                         "content_type": http.get("http.content_type", ""),
-                    })
+                    }
 
             elif mode == "dns":
                 dns = layers.get("dns", {})
                 if dns:
-                    results.append({
+                    yield {
                         "query_name": dns.get("dns.qry.name", ""),
                         "query_type": dns.get("dns.qry.type", ""),
                         "response_code": dns.get("dns.flags.rcode", ""),
                         "answers": dns.get("dns.count.answers", "0"),
-                    })
+                    }
 
-        return results, len(packets)
+    # ── Result cache ─────────────────────────────────────────────────
+
+    def cache_inputs(self, args: argparse.Namespace) -> list[str] | None:
+        """Only PCAP file analysis is deterministic; live captures are never cached."""
+        return [args.input_file] if args.input_file else None
 
     # ── Main run ─────────────────────────────────────────────────────
 
@@ -242,31 +326,44 @@ class TrafficAnalyzer(TacticalModule):
         is_live = bool(args.interface)
         duration = args.duration if is_live else args.timeout
 
-        if is_live:
+        block = None
+        if not is_live and args.mode in _STAT_TAPS:
+            block = self._stat_block(args, base_args)
+
+        if block is not None:
+            stdout = block
+        elif is_live:
             stdout, stderr = self.run_tool_popen("tshark", tshark_args, duration=duration)
         else:
             result = self.run_tool("tshark", tshark_args, timeout=duration)
             stdout, stderr = result.stdout, result.stderr
 
-        # Parse output based on format
+        # Parse output based on format; each entry is emitted as it is
+        # parsed, so --ndjson streams them before the parse finishes
+        entries_returned = 0
         if output_fmt == "json":
-            entries, total_count = self._parse_json_output(stdout, args.mode, args.top_n)
+            with self.span("parse"):
+                packets = self._decode_packets(stdout)
+                for entry in self._iter_json_entries(packets[:args.top_n], args.mode):
+                    entries_returned += 1
+                    self.emit_item("entries", entry)
             self.output_success({
                 "mode": args.mode,
                 "source": args.input_file or args.interface,
                 "filter": args.filter or "(none)",
-                "total_packets": total_count,
-                "entries": entries,
-                "entries_returned": len(entries),
+                "total_packets": len(packets),
+                "entries_returned": entries_returned,
             })
         else:
-            entries = self._parse_text_output(stdout, args.mode, args.top_n)
+            with self.span("parse"):
+                for entry in islice(self._iter_text_entries(stdout, args.mode), args.top_n):
+                    entries_returned += 1
+                    self.emit_item("entries", entry)
             self.output_success({
                 "mode": args.mode,
                 "source": args.input_file or args.interface,
                 "filter": args.filter or "(none)",
-                "entries": entries,
-                "entries_returned": len(entries),
+                "entries_returned": entries_returned,
                 "raw_output_lines": len(stdout.splitlines()),
             })
 
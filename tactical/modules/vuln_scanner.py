@@ -7,17 +7,19 @@ CLI deps: nmap (installed), nuclei (optional — install via `go install`)
 
 Scans targets for known vulnerabilities using nmap's --script vuln
 and optionally nuclei templates. Gracefully degrades if nuclei isn't installed.
+With --scan-type both the two scanners run concurrently.
 """
 
 import json
 import re
 import time
-import xml.etree.ElementTree as ET
 
-from base_module import TacticalModule
+from base_module import AsyncTacticalModule, lazy_import
 
+ET = lazy_import("xml.etree.ElementTree")
 
-class VulnScanner(TacticalModule):
+
+class VulnScanner(AsyncTacticalModule):
     name = "vuln_scanner"
     description = "Vulnerability scanning via nmap scripts + nuclei"
 
@@ -44,17 +46,17 @@ class VulnScanner(TacticalModule):
             help="Port specification for nmap (default: --top-ports 100)",
         )
 
-    def run(self, args) -> None:
+    async def run_async(self, args) -> None:
         start = time.monotonic()
         vulnerabilities: list[dict] = []
 
+        scans = []
         if args.scan_type in ("nmap-scripts", "both"):
-            nmap_vulns = self._run_nmap_vuln(args)
-            vulnerabilities.extend(nmap_vulns)
-
+            scans.append(self._run_nmap_vuln(args))
         if args.scan_type in ("nuclei", "both"):
-            nuclei_vulns = self._run_nuclei(args)
-            vulnerabilities.extend(nuclei_vulns)
+            scans.append(self._run_nuclei(args))
+        for found in await self.gather(*scans):
+            vulnerabilities.extend(found)
 
         # Filter by severity
         severity_order = {"info": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
@@ -82,7 +84,7 @@ class VulnScanner(TacticalModule):
             "duration_ms": duration_ms,
         })
 
-    def _run_nmap_vuln(self, args) -> list[dict]:
+    async def _run_nmap_vuln(self, args) -> list[dict]:
         """Run nmap with --script vuln for vulnerability detection."""
         nmap_args = [
             "-sV",
@@ -98,14 +100,14 @@ class VulnScanner(TacticalModule):
 
         nmap_args.append(args.target)
 
-        result = self.run_tool("nmap", nmap_args, timeout=args.timeout)
+        result = await self.run_tool_async("nmap", nmap_args, timeout=args.timeout)
         if result.returncode != 0 and not result.stdout:
             self.logger.warning("nmap vuln scan failed: %s", result.stderr[:500])
             return []
 
         return self._parse_nmap_vulns(result.stdout)
 
-    def _run_nuclei(self, args) -> list[dict]:
+    async def _run_nuclei(self, args) -> list[dict]:
         """Run nuclei for template-based vulnerability detection."""
         import shutil
 
@@ -120,7 +122,7 @@ class VulnScanner(TacticalModule):
             "-silent",
         ]
 
-        result = self.run_tool("nuclei", nuclei_args, timeout=args.timeout)
+        result = await self.run_tool_async("nuclei", nuclei_args, timeout=args.timeout)
 
         vulnerabilities: list[dict] = []
         for line in result.stdout.strip().split("\n"):
@@ -98,7 +98,7 @@ class WebBruter(TacticalModule):
         if args.extensions:
             gobuster_args.extend(["-x", args.extensions])
 
-        result = self.run_tool("gobuster", gobuster_args, timeout=args.timeout)
+        result = self.run_tool("gobuster", gobuster_args, timeout=args.timeout, partial=True)
 
         if result.returncode != 0 and not result.stdout:
             self.logger.warning("gobuster error: %s", result.stderr[:500])
@@ -23,6 +23,8 @@ class WiFiCapture(TacticalModule):
     name = "wifi_capture"
     description = "PMKID/handshake capture via hcxdumptool + hcxpcapngtool"
 
+    lease_interface_arg = "interface"
+
     def _add_module_args(self) -> None:
         self.parser.add_argument(
             "--interface", required=True,
@@ -18,6 +18,8 @@ class WiFiDeauth(TacticalModule):
     name = "wifi_deauth"
     description = "Deauthentication attack via aireplay-ng"
 
+    lease_interface_arg = "interface"
+
     def _add_module_args(self) -> None:
         self.parser.add_argument(
             "--bssid",
@@ -22,6 +22,8 @@ class WiFiHandshake(TacticalModule):
     name = "wifi_handshake"
     description = "WPA handshake capture via wifite2"
 
+    lease_interface_arg = "interface"
+
     def _add_module_args(self) -> None:
         self.parser.add_argument(
             "--bssid",
@@ -27,8 +27,13 @@ import json
 import os
 import sqlite3
 import time
+from collections.abc import Iterator
 
-from base_module import TacticalModule
+from base_module import TacticalModule, json_loads
+
+# Reuse a DB snapshot copy for about one dashboard refresh, so back-to-back
+# runs against a live, non-WAL .kismet file don't each copy it afresh
+SNAPSHOT_CACHE_S = 30
 
 # Kismet type strings → normalized type
 KISMET_TYPE_MAP = {
@@ -63,6 +68,7 @@ def _freq_to_band(freq_khz: int) -> str:
 class WiFiRecon(TacticalModule):
     name = "wifi_recon"
     description = "Query Kismet DB for WiFi targets (APs and clients)"
+    ingests_rf = True
 
     def _add_module_args(self) -> None:
         self.parser.add_argument(
@@ -171,6 +177,22 @@ class WiFiRecon(TacticalModule):
             action="store_true",
             help="Include Kismet alerts (deauth floods, source errors, etc.) in report",
         )
+        self.parser.add_argument(
+            "--snapshot",
+            choices=["auto", "wal", "copy"],
+            default="auto",
+            help="How to read the live DBs: pinned WAL read transaction, backup copy "
+                 "on tmpfs, or auto (WAL if the DB uses it, else copy) (default: auto)",
+        )
+        self.parser.add_argument(
+            "--snapshot-cache",
+            type=float,
+            default=SNAPSHOT_CACHE_S,
+            metavar="SECONDS",
+            dest="snapshot_cache",
+            help="Reuse a snapshot copy of the DB for this long; 0 copies "
+                 f"afresh every run (default: {SNAPSHOT_CACHE_S:g})",
+        )
 
     def run(self, args) -> None:
         kismet_db = self._resolve_kismet_db(args)
@@ -186,45 +208,50 @@ class WiFiRecon(TacticalModule):
         # Prefer Kismet native DB
         if kismet_db:
             try:
-                conn = sqlite3.connect(f"file:{kismet_db}?mode=ro", uri=True)
-                conn.row_factory = sqlite3.Row
-                tables = {r[0] for r in conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                ).fetchall()}
-
-                if "devices" in tables and "KISMET" in tables:
-                    self.logger.info("Using Kismet native DB: %s", kismet_db)
-                    # Get PHY summary before filtering
-                    phy_rows = conn.execute(
-                        "SELECT phyname, COUNT(*) FROM devices GROUP BY phyname"
-                    ).fetchall()
-                    phy_summary = {r[0]: r[1] for r in phy_rows}
-                    targets = self._query_kismet_native(conn, args)
-                    source = kismet_db
-
-                    # Fetch alerts if requested
-                    if args.alerts and "alerts" in tables:
-                        alerts = self._query_kismet_alerts(conn)
-                conn.close()
-            except sqlite3.Error as e:
+                with self.snapshot_db(kismet_db, args.snapshot, args.snapshot_cache) as conn:
+                    conn.row_factory = sqlite3.Row
+                    tables = {r[0] for r in conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type='table'"
+                    ).fetchall()}
+
+                    if "devices" in tables and "KISMET" in tables:
+                        self.logger.info("Using Kismet native DB: %s", kismet_db)
+                        # Get PHY summary before filtering
+                        phy_rows = conn.execute(
+                            "SELECT phyname, COUNT(*) FROM devices GROUP BY phyname"
+                        ).fetchall()
+                        phy_summary = {r[0]: r[1] for r in phy_rows}
+                        with self.span("query"):
+                            for target in self._query_kismet_native(conn, args):
+                                targets.append(target)
+                                self.emit_item("targets", target)
+                        source = kismet_db
+
+                        # Fetch alerts if requested
+                        if args.alerts and "alerts" in tables:
+                            alerts = self._query_kismet_alerts(conn)
+            except (sqlite3.Error, OSError) as e:
                 self.logger.warning("Cannot open Kismet DB %s: %s", kismet_db, e)
 
         # Fall back to Argos rf_signals.db
         if not targets and argos_db:
             try:
-                conn = sqlite3.connect(f"file:{argos_db}?mode=ro", uri=True)
-                conn.row_factory = sqlite3.Row
-                tables = {r[0] for r in conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                ).fetchall()}
-
-                if "devices" in tables and "signals" in tables:
-                    self.logger.info("Using Argos DB: %s", argos_db)
-                    targets = self._query_argos_targets(conn, args)
-                    networks = self._query_argos_networks(conn, args)
-                    source = argos_db
-                conn.close()
-            except sqlite3.Error as e:
+                with self.snapshot_db(argos_db, args.snapshot, args.snapshot_cache) as conn:
+                    conn.row_factory = sqlite3.Row
+                    tables = {r[0] for r in conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type='table'"
+                    ).fetchall()}
+
+                    if "devices" in tables and "signals" in tables:
+                        self.logger.info("Using Argos DB: %s", argos_db)
+                        for target in self._query_argos_targets(conn, args):
+                            targets.append(target)
+                            self.emit_item("targets", target)
+                        for network in self._query_argos_networks(conn, args):
+                            networks.append(network)
+                            self.emit_item("networks", network)
+                        source = argos_db
+            except (sqlite3.Error, OSError) as e:
                 self.logger.warning("Cannot open Argos DB %s: %s", argos_db, e)
 
         if source == "none":
@@ -235,6 +262,11 @@ class WiFiRecon(TacticalModule):
             )
             return
 
+        # Argos-sourced targets came from rf_signals.db in the first place
+        if source == kismet_db:
+            with self.span("ingest"):
+                self._ingest_targets(args, targets)
+
         # Compute summary stats
         type_counts: dict[str, int] = {}
         for t in targets:
@@ -297,8 +329,6 @@ class WiFiRecon(TacticalModule):
 
         result: dict = {
             "source": source,
-            "targets": targets,
-            "networks": networks,
             "count": len(targets),
             "network_count": len(networks),
             "summary": summary,
@@ -650,8 +680,16 @@ class WiFiRecon(TacticalModule):
                          len(kismet_files), kismet_files[0])
         return kismet_files[0]
 
-    def _query_kismet_native(self, conn: sqlite3.Connection, args) -> list[dict]:
-        """Query Kismet's native .kismet SQLite database (JSON blobs)."""
+    def _query_kismet_native(self, conn: sqlite3.Connection, args) -> Iterator[dict]:
+        """
+        Query Kismet's native .kismet SQLite database (JSON blobs), yielding
+        targets in result order.
+
+        Sorts that map onto a devices column (last_seen, data) run in SQL, so
+        each target is yielded as its row is parsed and the scan stops at
+        --limit. The others read from the JSON blob and are sorted once
+        every row has been parsed.
+        """
         cutoff = int(time.time()) - args.max_age
 
         # PHY filter
@@ -669,6 +707,12 @@ class WiFiRecon(TacticalModule):
             if kismet_type:
                 type_filter = f"AND type = '{kismet_type}'"
 
+        # Same order as the Python sort below (stable over last_time DESC)
+        sql_order = {
+            "last_seen": "last_time DESC",
+            "data": "COALESCE(bytes_data, 0) DESC, last_time DESC",
+        }.get(args.sort)
+
         query = f"""
             SELECT devmac, type, phyname, strongest_signal, first_time, last_time,
                    avg_lat, avg_lon, bytes_data, device
@@ -676,12 +720,23 @@ class WiFiRecon(TacticalModule):
             WHERE last_time >= ?
               {phy_filter}
               {type_filter}
-            ORDER BY last_time DESC
+            ORDER BY {sql_order or "last_time DESC"}
         """
-        rows = conn.execute(query, [cutoff]).fetchall()
+        cursor = conn.execute(query, [cutoff])
+
+        if sql_order:
+            count = 0
+            for row in cursor:
+                if count >= args.limit:
+                    break
+                entry = self._parse_kismet_device(row, args)
+                if entry is not None:
+                    count += 1
+                    yield entry
+            return
 
         targets = []
-        for row in rows:
+        for row in cursor:
             entry = self._parse_kismet_device(row, args)
             if entry is not None:
                 targets.append(entry)
@@ -689,15 +744,13 @@ class WiFiRecon(TacticalModule):
         # Sort
         sort_keys = {
             "signal": lambda t: t.get("signal_dbm") or -999,
-            "data": lambda t: t.get("bytes_data") or 0,
-            "last_seen": lambda t: t.get("last_seen") or 0,
             "packets": lambda t: t.get("packets_total") or 0,
             "clients": lambda t: t.get("num_clients") or 0,
         }
         key_fn = sort_keys.get(args.sort, sort_keys["signal"])
         targets.sort(key=key_fn, reverse=True)
 
-        return targets[:args.limit]
+        yield from targets[:args.limit]
 
     def _parse_kismet_device(self, row, args) -> dict | None:
         """Parse a single Kismet device row, applying all filters. Returns None if filtered out."""
@@ -734,7 +787,7 @@ class WiFiRecon(TacticalModule):
 
         if blob:
             try:
-                data = json.loads(blob)
+                data = json_loads(blob)
                 manufacturer = data.get("kismet.device.base.manuf", "")
                 channel = str(data.get("kismet.device.base.channel", ""))
                 frequency = data.get("kismet.device.base.frequency", 0)
@@ -951,7 +1004,7 @@ class WiFiRecon(TacticalModule):
         for row in rows:
             header = row["header"]
             try:
-                data = json.loads(row["json"])
+                data = json_loads(row["json"])
                 alerts.append({
                     "type": header,
                     "class": data.get("kismet.alert.class", ""),
@@ -966,8 +1019,16 @@ class WiFiRecon(TacticalModule):
                 alerts.append({"type": header, "text": str(row["json"])[:200]})
         return alerts
 
-    def _query_argos_targets(self, conn: sqlite3.Connection, args) -> list[dict]:
-        """Query Argos rf_signals.db devices table (fallback)."""
+    def _query_argos_targets(self, conn: sqlite3.Connection, args) -> Iterator[dict]:
+        """
+        Query Argos rf_signals.db devices table (fallback), yielding each
+        target as its row is read.
+
+        Each device's latest signal is one seek on idx_signals_device_timestamp
+        (20261017_add_signals_device_time_index.sql): the subquery reads only
+        that index, and it runs just for the rows the LIMIT keeps. The plan is
+        pinned by tests/unit/wifi-recon-argos-query-plan.test.ts.
+        """
         cutoff_ms = (int(time.time()) - args.max_age) * 1000
 
         query = """
@@ -979,12 +1040,11 @@ class WiFiRecon(TacticalModule):
                 s.frequency AS last_freq_mhz,
                 s.latitude, s.longitude
             FROM devices d
-            LEFT JOIN signals s ON d.device_id = s.device_id
-                AND s.id = (
-                    SELECT id FROM signals
-                    WHERE device_id = d.device_id
-                    ORDER BY timestamp DESC LIMIT 1
-                )
+            LEFT JOIN signals s ON s.id = (
+                SELECT id FROM signals
+                WHERE device_id = d.device_id
+                ORDER BY timestamp DESC, id DESC LIMIT 1
+            )
             WHERE d.last_seen >= ?
         """
         params: list = [cutoff_ms]
@@ -1000,14 +1060,11 @@ class WiFiRecon(TacticalModule):
         query += " ORDER BY d.last_seen DESC LIMIT ?"
         params.append(args.limit)
 
-        rows = conn.execute(query, params).fetchall()
-        targets = []
-
-        for row in rows:
+        for row in conn.execute(query, params):
             metadata = {}
             if row["metadata"]:
                 try:
-                    metadata = json.loads(row["metadata"])
+                    metadata = json_loads(row["metadata"])
                 except json.JSONDecodeError:
                     pass
 
@@ -1018,7 +1075,7 @@ class WiFiRecon(TacticalModule):
             if args.ssid and args.ssid.lower() not in (ssid or "").lower():
                 continue
 
-            targets.append({
+            yield {
                 "mac": row["device_id"],
                 "type": row["type"],
                 "ssid": ssid,
@@ -1031,12 +1088,59 @@ class WiFiRecon(TacticalModule):
                 "last_seen": row["last_seen"],
                 "latitude": row["latitude"],
                 "longitude": row["longitude"],
-            })
+            }
 
-        return targets
+    def _ingest_targets(self, args, targets: list[dict]) -> None:
+        """Record Kismet targets in rf_signals.db devices/signals/networks for the map."""
+        ingest = self.rf_ingest(args)
+        if ingest is None:
+            return
+        devices, signals, networks = [], [], []
+        for t in targets:
+            freq = t.get("frequency_mhz") or None
+            if freq and freq > 100000:  # Kismet reports kHz
+                freq = freq / 1000
+            observation = {
+                "device_id": t["mac"],
+                "type": t.get("type"),
+                "power": t.get("signal_dbm") or None,
+                "frequency": freq,
+            }
+            devices.append({
+                **observation,
+                "manufacturer": t.get("manufacturer"),
+                "first_seen": t.get("first_seen"),
+                "last_seen": t.get("last_seen"),
+                "metadata": {
+                    "ssid": t.get("ssid"),
+                    "encryption": t.get("encryption"),
+                    "channel": t.get("channel"),
+                    "band": t.get("band"),
+                },
+            })
+            signals.append({
+                **observation,
+                "timestamp": t.get("last_seen"),
+                "latitude": t.get("latitude"),
+                "longitude": t.get("longitude"),
+            })
+            if t.get("type") == "ap":
+                networks.append({
+                    "bssid": t["mac"],
+                    "ssid": t.get("ssid"),
+                    "encryption": t.get("encryption"),
+                    "channel": t.get("channel"),
+                    "first_seen": t.get("first_seen"),
+                    "last_seen": t.get("last_seen"),
+                    "center_lat": t.get("latitude"),
+                    "center_lon": t.get("longitude"),
+                })
+        # A device's last_seen may be hours old, so the sensor's current
+        # position says nothing about where it was
+        ingest.ingest(devices=devices, signals=signals, networks=networks, sensor_fallback=False)
 
-    def _query_argos_networks(self, conn: sqlite3.Connection, args) -> list[dict]:
-        """Query Argos rf_signals.db networks table."""
+    def _query_argos_networks(self, conn: sqlite3.Connection, args) -> Iterator[dict]:
+        """Query Argos rf_signals.db networks table, yielding each network as read."""
         cutoff_ms = (int(time.time()) - args.max_age) * 1000
 
         query = """
@@ -1058,9 +1162,8 @@ class WiFiRecon(TacticalModule):
         query += " GROUP BY n.network_id ORDER BY n.last_seen DESC LIMIT ?"
         params.append(args.limit)
 
-        rows = conn.execute(query, params).fetchall()
-        return [
-            {
+        for row in conn.execute(query, params):
+            yield {
                 "network_id": row["network_id"],
                 "ssid": row["ssid"],
                 "encryption": row["encryption"],
@@ -1071,8 +1174,6 @@ class WiFiRecon(TacticalModule):
                 "center_lon": row["center_lon"],
                 "device_count": row["device_count"],
             }
-            for row in rows
-        ]
 
 
 if __name__ == "__main__":
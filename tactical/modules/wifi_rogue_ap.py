@@ -22,6 +22,8 @@ class WiFiRogueAP(TacticalModule):
     name = "wifi_rogue_ap"
     description = "Rogue AP / Evil Twin via airbase-ng"
 
+    lease_interface_arg = "interface"
+
     def _add_module_args(self) -> None:
         self.parser.add_argument(
             "--essid", required=True,
@@ -21,6 +21,8 @@ class WPSAttacker(TacticalModule):
     name = "wps_attacker"
     description = "WPS PIN attacks via reaver, bully, or wash (discovery)"
 
+    lease_interface_arg = "interface"
+
     def _add_module_args(self) -> None:
         self.parser.add_argument(
             "--tool",
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+JSON backend micro-benchmark — encode/decode throughput per backend.
+
+Builds payloads shaped like what modules actually move through JSON:
+
+  - kismet_device:   one Kismet device blob (nested dot-keyed dicts)
+  - tshark_packets:  `tshark -T json` output, 2000 HTTP/DNS packets
+  - r2_aflj:         radare2 `aflj` function list, 3000 functions
+  - searchsploit:    `searchsploit -j` result set, 500 exploits
+  - envelope:        a wifi_recon success envelope with 1000 targets
+
+and times core.jsonio's dumps()/loads() under each installed backend
+(stdlib, orjson, msgspec). Reports MB/s and ops/s, plus speed-up over
+the stdlib.
+
+Usage:
+    python3 tests/performance/json_bench.py
+    python3 tests/performance/json_bench.py --payload tshark_packets --seconds 2
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+MODULES_DIR = Path(__file__).resolve().parents[2] / "tactical" / "modules"
+if str(MODULES_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULES_DIR))
+
+from core import jsonio  # noqa: E402
+
+
+def _mac(rng: random.Random) -> str:
+    return ":".join(f"{rng.randrange(256):02X}" for _ in range(6))
+
+
+def _ip(rng: random.Random) -> str:
+    return ".".join(str(rng.randrange(1, 255)) for _ in range(4))
+
+
+def kismet_device(rng: random.Random) -> dict[str, Any]:
+    mac = _mac(rng)
+    return {
+        "kismet.device.base.key": f"4202770D00000000_{mac.replace(':', '')}",
+        "kismet.device.base.macaddr": mac,
+        "kismet.device.base.manuf": rng.choice(["Ubiquiti", "Cisco Meraki", "TP-Link", "Unknown"]),
+        "kismet.device.base.type": rng.choice(["Wi-Fi AP", "Wi-Fi Client", "Wi-Fi Bridged"]),
+        "kismet.device.base.channel": str(rng.choice([1, 6, 11, 36, 149])),
+        "kismet.device.base.frequency": rng.choice([2412000, 2437000, 2462000, 5180000]),
+        "kismet.device.base.first_time": 1760000000 + rng.randrange(86400),
+        "kismet.device.base.last_time": 1760086400 + rng.randrange(3600),
+        "kismet.device.base.signal": {
+            "kismet.common.signal.last_signal": -rng.randrange(30, 95),
+            "kismet.common.signal.min_signal": -95,
+            "kismet.common.signal.max_signal": -rng.randrange(20, 60),
+            "kismet.common.signal.signal_rrd": {
+                "kismet.common.rrd.minute_vec": [-rng.randrange(30, 95) for _ in range(60)],
+                "kismet.common.rrd.hour_vec": [-rng.randrange(30, 95) for _ in range(60)],
+            },
+        },
+        "kismet.device.base.packets": {
+            "kismet.device.base.packets.total": rng.randrange(100000),
+            "kismet.device.base.packets.data": rng.randrange(50000),
+            "kismet.device.base.packets.error": rng.randrange(100),
+        },
+        "kismet.device.base.freq_khz_map": {
+            str(f): rng.randrange(5000) for f in (2412000, 2437000, 2462000)
+        },
+        "dot11.device": {
+            "dot11.device.last_beaconed_ssid_record": {
+                "dot11.advertisedssid.ssid": f"net-{rng.randrange(10000)}",
+                "dot11.advertisedssid.crypt_set": rng.randrange(1 << 16),
+                "dot11.advertisedssid.beacon_info": "",
+                "dot11.advertisedssid.wps_state": rng.randrange(3),
+            },
+            "dot11.device.associated_client_map": {
+                _mac(rng): f"4202770D00000000_{rng.randrange(1 << 48):012X}" for _ in range(rng.randrange(8))
+            },
+        },
+    }
+
+
+def tshark_packets(rng: random.Random, count: int = 2000) -> list[dict[str, Any]]:
+    packets = []
+    for i in range(count):
+        layers: dict[str, Any] = {
+            "frame": {"frame.number": str(i + 1), "frame.len": str(rng.randrange(60, 1514)),
+                      "frame.time_epoch": f"{1760000000 + i * 0.01:.6f}"},
+            "ip": {"ip.src": _ip(rng), "ip.dst": _ip(rng), "ip.ttl": str(rng.choice([64, 128]))},
+        }
+        if i % 2:
+            layers["http"] = {
+                "http.request.method": rng.choice(["GET", "POST"]),
+                "http.request.full_uri": f"http://{_ip(rng)}/api/v1/items/{rng.randrange(10**6)}",
+                "http.host": _ip(rng),
+                "http.user_agent": "Mozilla/5.0 (X11; Linux aarch64) AppleWebKit/537.36",
+                "http.content_type": "application/json",
+            }
+        else:
+            layers["dns"] = {
+                "dns.qry.name": f"host{rng.randrange(1000)}.example.com",
+                "dns.qry.type": "1",
+                "dns.flags.rcode": "0",
+                "dns.count.answers": str(rng.randrange(4)),
+            }
+        packets.append({"_index": "packets-2026-10-17", "_type": "doc", "_source": {"layers": layers}})
+    return packets
+
+
+def r2_aflj(rng: random.Random, count: int = 3000) -> list[dict[str, Any]]:
+    funcs = []
+    addr = 0x400000
+    for i in range(count):
+        size = rng.randrange(16, 2048)
+        funcs.append({
+            "offset": addr, "name": f"fcn.{addr:08x}" if i % 3 else f"sym.func_{i}",
+            "size": size, "realsz": size, "noreturn": False, "stackframe": rng.randrange(0, 256, 8),
+            "calltype": "amd64", "cost": rng.randrange(500), "cc": rng.randrange(1, 30),
+            "bits": 64, "type": "fcn", "nbbs": rng.randrange(1, 60), "edges": rng.randrange(80),
+            "callrefs": [{"addr": addr + rng.randrange(size), "type": "CALL", "at": addr + 4}
+                         for _ in range(rng.randrange(6))],
+            "datarefs": [addr + 0x10000 + rng.randrange(4096) for _ in range(rng.randrange(4))],
+        })
+        addr += size
+    return funcs
+
+
+def searchsploit(rng: random.Random, count: int = 500) -> dict[str, Any]:
+    return {
+        "SEARCH": "apache",
+        "DB_PATH_EXPLOIT": "/usr/share/exploitdb",
+        "RESULTS_EXPLOIT": [{
+            "Title": f"Apache HTTP Server 2.4.{rng.randrange(60)} - Remote Code Execution ({i})",
+            "EDB-ID": str(40000 + i), "Date_Published": "2021-10-06", "Date_Added": "2021-10-06",
+            "Author": "researcher", "Type": rng.choice(["remote", "webapps", "local", "dos"]),
+            "Platform": rng.choice(["linux", "multiple", "windows"]),
+            "Path": f"/usr/share/exploitdb/exploits/multiple/webapps/{40000 + i}.py",
+            "Verified": rng.choice(["0", "1"]), "Codes": f"CVE-2021-{41000 + i}",
+        } for i in range(count)],
+        "RESULTS_SHELLCODE": [],
+    }
+
+
+def envelope(rng: random.Random, count: int = 1000) -> dict[str, Any]:
+    return {
+        "status": "success", "module": "wifi_recon", "timestamp": "2026-10-17T07:00:00+00:00",
+        "source": "kismet", "count": count,
+        "targets": [{
+            "mac": _mac(rng), "ssid": f"net-{i}", "type": rng.choice(["ap", "client"]),
+            "signal_dbm": -rng.randrange(30, 95), "channel": rng.choice([1, 6, 11]),
+            "encryption": rng.choice(["WPA2", "WPA3", "Open"]), "wps_enabled": rng.random() < 0.1,
+            "packets": rng.randrange(10**5), "last_seen": 1760000000 + i, "clients": [],
+        } for i in range(count)],
+        "summary": {"ap_count": count // 2, "client_count": count // 2},
+    }
+
+
+PAYLOADS: dict[str, Callable[[random.Random], Any]] = {
+    "kismet_device": kismet_device,
+    "tshark_packets": tshark_packets,
+    "r2_aflj": r2_aflj,
+    "searchsploit": searchsploit,
+    "envelope": envelope,
+}
+
+
+def _time(fn: Callable[[], Any], seconds: float) -> float:
+    """Return ops/s for fn, running it for about `seconds`."""
+    fn()  # warm up
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return runs / elapsed
+
+
+def bench(payloads: list[str], seconds: float) -> dict[str, Any]:
+    rng = random.Random(1337)
+    fixtures = {name: PAYLOADS[name](rng) for name in payloads}
+    backends = [b for b in jsonio.BACKENDS if jsonio.select_backend(b) == b]
+
+    results = []
+    for name, obj in fixtures.items():
+        text = json.dumps(obj)
+        size_mb = len(text.encode()) / 1e6
+        row: dict[str, Any] = {"payload": name, "bytes": len(text.encode()), "backends": {}}
+        for b in backends:
+            jsonio.select_backend(b)
+            enc = _time(lambda: jsonio.dumps(obj), seconds)
+            dec = _time(lambda: jsonio.loads(text), seconds)
+            row["backends"][b] = {
+                "encode_ops_s": round(enc, 1),
+                "encode_mb_s": round(enc * size_mb, 1),
+                "decode_ops_s": round(dec, 1),
+                "decode_mb_s": round(dec * size_mb, 1),
+            }
+        base = row["backends"]["stdlib"]
+        for stats in row["backends"].values():
+            stats["encode_speedup"] = round(stats["encode_ops_s"] / base["encode_ops_s"], 2)
+            stats["decode_speedup"] = round(stats["decode_ops_s"] / base["decode_ops_s"], 2)
+        results.append(row)
+
+    jsonio.select_backend(None)
+    return {"available": backends, "default": jsonio.backend, "payloads": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="json_bench",
+        description="Compare JSON backend throughput on representative module payloads.",
+    )
+    parser.add_argument(
+        "--payload", action="append", choices=sorted(PAYLOADS),
+        help="Payload to benchmark (repeatable; default: all)",
+    )
+    parser.add_argument("--seconds", type=float, default=0.5, help="Time per measurement (default: 0.5)")
+    opts = parser.parse_args()
+
+    print(json.dumps(bench(opts.payload or list(PAYLOADS), opts.seconds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
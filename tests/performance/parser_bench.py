@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark suite — throughput and peak memory of the module parsers.
+
+The hot parsers turn tool output into envelopes, and a slow one costs
+seconds on the Pi 5 when a scan returns a /16 or a fls listing of a whole
+disk. Each case here feeds a realistic-size fixture to one parser:
+
+  - nmap_ports:     port_scanner._parse_nmap_xml        nmap -oX, 1024 hosts x 20 ports
+  - nmap_vulns:     vuln_scanner._parse_nmap_vulns      nmap -oX with --script vuln output
+  - masscan:        mass_scanner._parse_json            masscan -oJ, 50k open ports
+  - hackrf_sweep:   spectrum_sweep._parse_csv           hackrf_sweep CSV, 1-6 GHz x 20 sweeps
+  - tshark_http:    traffic_analyzer._parse_json_output tshark -T json, 5000 packets
+  - fls:            disk_analyzer._parse_fls_line       fls -r -l, 200k entries
+  - kismet:         wifi_recon._query_kismet_native     .kismet DB, 5000 devices
+  - r2_functions:   re_analyzer._parse_output+_summarize r2 aflj, 20k functions
+  - bulk_extractor: file_carver._read_feature_file      email.txt, 100k features
+
+Fixtures are generated from a fixed seed, so numbers are comparable across
+commits on the same machine. --record DIR writes them out; --fixtures DIR
+uses files found there instead (same names as --record writes), so real
+captures can be benchmarked.
+
+Per case the suite reports ops/s, MB/s of input, mean/min ms and peak
+traced memory (tracemalloc, measured in a separate untimed run). --save
+writes the report with the git commit; --compare flags cases that lost
+more than --tolerance of their throughput or grew peak memory by as much,
+and exits 1 so a CI step can fail on it. Throughput only compares on the
+machine that recorded the baseline; --memory-only checks the (stable)
+tracemalloc peaks alone, which is what CI runs on its own runners.
+
+Usage:
+    python3 tests/performance/parser_bench.py
+    python3 tests/performance/parser_bench.py --case fls --case kismet --seconds 2
+    python3 tests/performance/parser_bench.py --save tests/performance/baselines/parsers.json
+    python3 tests/performance/parser_bench.py --compare tests/performance/baselines/parsers.json
+
+`npm run test:parsers` runs the --compare against the committed baseline
+(as CI does); `npm run test:parsers:baseline` re-records it after an
+intended change.
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+MODULES_DIR = Path(__file__).resolve().parents[2] / "tactical" / "modules"
+if str(MODULES_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULES_DIR))
+
+# json_bench sits next to this file, so it is on sys.path already
+from json_bench import _ip, _mac, kismet_device, r2_aflj, tshark_packets  # noqa: E402
+
+# ── Fixtures ───────────────────────────────────────────────────────
+
+_SERVICES = [
+    (22, "ssh", "OpenSSH", "8.9p1"), (53, "domain", "dnsmasq", "2.89"),
+    (80, "http", "nginx", "1.24.0"), (139, "netbios-ssn", "Samba smbd", "4.6.2"),
+    (443, "https", "Apache httpd", "2.4.57"), (445, "microsoft-ds", "", ""),
+    (3306, "mysql", "MySQL", "8.0.35"), (3389, "ms-wbt-server", "xrdp", ""),
+    (5432, "postgresql", "PostgreSQL DB", "15.4"), (8080, "http-proxy", "", ""),
+]
+
+_VULN_SCRIPTS = [
+    ("smb-vuln-ms17-010", "VULNERABLE:\n  Remote Code Execution vulnerability in Microsoft SMBv1\n"
+                          "  State: VULNERABLE\n  IDs: CVE:CVE-2017-0143"),
+    ("ssl-dh-params", "VULNERABLE:\n  Diffie-Hellman Key Exchange Insufficient Group Strength\n"
+                      "  References: CVE-2015-4000"),
+    ("http-csrf", "Couldn't find any CSRF vulnerabilities."),
+    ("http-slowloris-check", "NOT VULNERABLE"),
+]
+
+
+def nmap_xml(rng: random.Random, hosts: int = 1024, ports: int = 20, scripts: bool = False) -> str:
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<nmaprun scanner="nmap" args="nmap -sV -oX -" version="7.94">']
+    for h in range(hosts):
+        parts.append(f'<host starttime="1760000000" endtime="1760000042"><status state="up" reason="arp-response"/>'
+                     f'<address addr="10.{h // 256}.{h % 256}.{rng.randrange(1, 255)}" addrtype="ipv4"/>'
+                     f'<address addr="{_mac(rng)}" addrtype="mac"/><ports>')
+        for p in range(ports):
+            port, name, product, version = _SERVICES[p % len(_SERVICES)]
+            state = "open" if rng.random() < 0.7 else "filtered"
+            parts.append(f'<port protocol="tcp" portid="{port + p // len(_SERVICES) * 10000}">'
+                         f'<state state="{state}" reason="syn-ack" reason_ttl="64"/>'
+                         f'<service name="{name}" product="{product}" version="{version}" method="probed" conf="10"/>')
+            if scripts and state == "open":
+                script_id, output = rng.choice(_VULN_SCRIPTS)
+                parts.append(f'<script id="{script_id}" output="{output}"/>')
+            parts.append("</port>")
+        parts.append("</ports></host>")
+    parts.append('<runstats><finished time="1760000100" elapsed="100.00" exit="success"/></runstats></nmaprun>')
+    return "\n".join(parts)
+
+
+def masscan_json(rng: random.Random, records: int = 50_000) -> str:
+    lines = ["["]
+    for _ in range(records):
+        lines.append(
+            f'{{   "ip": "{_ip(rng)}",   "timestamp": "{1760000000 + rng.randrange(3600)}", '
+            f'"ports": [ {{"port": {rng.choice(_SERVICES)[0]}, "proto": "tcp", "status": "open", '
+            f'"reason": "syn-ack", "ttl": {rng.choice([64, 128])}}} ] }},'
+        )
+    lines.append("]")
+    return "\n".join(lines)
+
+
+def hackrf_csv(rng: random.Random, sweeps: int = 20) -> str:
+    lines = []
+    bin_width = 1_000_000
+    for sweep in range(sweeps):
+        stamp = f"2026-10-17, 07:00:{sweep:02d}.{rng.randrange(10**6):06d}"
+        for hz_low in range(1_000_000_000, 6_000_000_000, 5_000_000):
+            dbs = ", ".join(f"{-rng.uniform(40, 95):.2f}" for _ in range(5))
+            lines.append(f"{stamp}, {hz_low}, {hz_low + 5_000_000}, {bin_width:.2f}, 20, {dbs}")
+    return "\n".join(lines) + "\n"
+
+
+def tshark_json(rng: random.Random) -> str:
+    return json.dumps(tshark_packets(rng, 5000), indent=2)
+
+
+def fls_listing(rng: random.Random, entries: int = 200_000) -> str:
+    lines = []
+    dirs = ["Windows/System32", "Users/operator/AppData/Local/Temp", "Program Files/Common Files", "ProgramData"]
+    for inode in range(64, 64 + entries):
+        kind = "d" if rng.random() < 0.1 else "r"
+        deleted = "* " if rng.random() < 0.05 else ""
+        name = f"{rng.choice(dirs)}/{'dir' if kind == 'd' else 'file'}_{inode:07d}{'' if kind == 'd' else '.dat'}"
+        stamp = f"2026-0{rng.randrange(1, 10)}-1{rng.randrange(10)} 12:{rng.randrange(60):02d}:00 (UTC)"
+        lines.append(f"{kind}/{kind} {deleted}{inode}:\t{name}\t{stamp}\t{stamp}"
+                     f"\t{stamp}\t{stamp}\t{rng.randrange(1 << 20)}\t0\t0")
+    return "\n".join(lines) + "\n"
+
+
+def r2_json(rng: random.Random) -> str:
+    return json.dumps(r2_aflj(rng, 20_000))
+
+
+def feature_file(rng: random.Random, features: int = 100_000) -> str:
+    lines = ["# BANNER FILE NOT PROVIDED (-b option)", "# BULK_EXTRACTOR-Version: 2.0.3",
+             "# Feature-Recorder: email", "# Filename: /evidence/disk.img"]
+    for i in range(features):
+        user = f"user{rng.randrange(10**5)}"
+        domain = rng.choice(["example.com", "corp.local", "mail.example.org"])
+        offset = 512 * i + rng.randrange(512)
+        lines.append(f"{offset}\t{user}@{domain}\tFrom: {user} <{user}@{domain}>\\x0D\\x0ATo: ops@{domain}")
+    return "\n".join(lines) + "\n"
+
+
+def kismet_db(rng: random.Random, path: Path, devices: int = 5000) -> None:
+    """Write a .kismet file with the tables wifi_recon reads."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE KISMET (kismet_version TEXT, db_version INT, db_module TEXT);
+        CREATE TABLE devices (
+            first_time INT, last_time INT, devkey TEXT, phyname TEXT, devmac TEXT,
+            strongest_signal INT, min_lat REAL, min_lon REAL, max_lat REAL, max_lon REAL,
+            avg_lat REAL, avg_lon REAL, bytes_data INT, type TEXT, device BLOB,
+            UNIQUE(phyname, devmac) ON CONFLICT REPLACE
+        );
+    """)
+    conn.execute("INSERT INTO KISMET VALUES ('2023.07.R1', 8, 'Kismet')")
+    now = int(time.time())
+    rows = []
+    for _ in range(devices):
+        dev = kismet_device(rng)
+        mac = dev["kismet.device.base.macaddr"]
+        rows.append((
+            now - 600, now - rng.randrange(600), dev["kismet.device.base.key"], "IEEE802.11", mac,
+            dev["kismet.device.base.signal"]["kismet.common.signal.max_signal"],
+            0, 0, 0, 0, 0, 0, rng.randrange(10**7), dev["kismet.device.base.type"],
+            json.dumps(dev).encode(),
+        ))
+    conn.executemany("INSERT INTO devices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+# Fixture name -> (file name under --record/--fixtures, text generator)
+FIXTURES: dict[str, tuple[str, Callable[[random.Random], str]]] = {
+    "nmap_ports": ("nmap.xml", nmap_xml),
+    "nmap_vulns": ("nmap_vulns.xml", lambda rng: nmap_xml(rng, hosts=256, scripts=True)),
+    "masscan": ("masscan.json", masscan_json),
+    "hackrf_sweep": ("hackrf_sweep.csv", hackrf_csv),
+    "tshark_http": ("tshark.json", tshark_json),
+    "fls": ("fls.txt", fls_listing),
+    "r2_functions": ("r2_aflj.json", r2_json),
+    "bulk_extractor": ("email.txt", feature_file),
+}
+KISMET_FIXTURE = "devices.kismet"
+
+
+def load_fixtures(names: list[str], fixtures_dir: Path | None, work_dir: Path) -> dict[str, Path]:
+    """Resolve each case's input file: a recorded one if present, else generate it into work_dir."""
+    rng = random.Random(1337)
+    paths: dict[str, Path] = {}
+    for name in names:
+        file_name = KISMET_FIXTURE if name == "kismet" else FIXTURES[name][0]
+        if fixtures_dir and (fixtures_dir / file_name).is_file():
+            paths[name] = fixtures_dir / file_name
+            continue
+        path = work_dir / file_name
+        if name == "kismet":
+            kismet_db(rng, path)
+        else:
+            path.write_text(FIXTURES[name][1](rng))
+        paths[name] = path
+    return paths
+
+
+# ── Cases ──────────────────────────────────────────────────────────
+
+def _case_fn(name: str, path: Path) -> Callable[[], int]:
+    """Build a zero-arg callable that parses the fixture and returns the item count."""
+    if name == "kismet":
+        from wifi_recon import WiFiRecon
+
+        module = WiFiRecon()
+        args = module.parser.parse_args(["--limit", "1000000", "--max-age", str(10**9)])
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        return lambda: len(list(module._query_kismet_native(conn, args)))
+
+    if name == "fls":
+        from disk_analyzer import DiskAnalyzer
+
+        def parse_fls() -> int:
+            count = 0
+            with open(path, errors="replace") as fh:
+                for line in fh:
+                    count += DiskAnalyzer._parse_fls_line(line) is not None
+            return count
+        return parse_fls
+
+    if name == "bulk_extractor":
+        from file_carver import FileCarver
+
+        module = FileCarver()
+        return lambda: len(module._read_feature_file(path))
+
+    # The rest parse the tool's stdout; reading it is part of the cost
+    if name == "nmap_ports":
+        from port_scanner import PortScanner
+        return lambda: len(PortScanner._parse_nmap_xml(path.read_text()))
+    if name == "nmap_vulns":
+        from vuln_scanner import VulnScanner
+        return lambda: len(VulnScanner._parse_nmap_vulns(path.read_text()))
+    if name == "masscan":
+        from mass_scanner import MassScanner
+        return lambda: len(MassScanner._parse_json(path.read_text()))
+    if name == "hackrf_sweep":
+        from spectrum_sweep import SpectrumSweep
+
+        module = SpectrumSweep()
+        return lambda: len(module._parse_csv(path.read_text()))
+    if name == "tshark_http":
+        from traffic_analyzer import TrafficAnalyzer
+
+        module = TrafficAnalyzer()
+        # top_n large enough that every packet is parsed
+        return lambda: module._parse_json_output(path.read_text(), "http", 10**9)[1]
+    if name == "r2_functions":
+        from re_analyzer import ReAnalyzer
+
+        module = ReAnalyzer()
+        return lambda: module._summarize(
+            "functions", module._parse_output("functions", path.read_text())
+        ).get("function_count", 0)
+    raise KeyError(name)
+
+
+CASES = [*FIXTURES, "kismet"]
+
+
+@dataclass
+class CaseResult:
+    case: str
+    input_bytes: int
+    items: int
+    rounds: int
+    ops_s: float
+    mb_s: float
+    mean_ms: float
+    min_ms: float
+    peak_kb: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(self.__dict__)
+
+
+def bench_case(name: str, path: Path, seconds: float, min_rounds: int = 3) -> CaseResult:
+    fn = _case_fn(name, path)
+    items = fn()  # warm up (imports, page cache)
+
+    times: list[float] = []
+    start = time.perf_counter()
+    while len(times) < min_rounds or time.perf_counter() - start < seconds:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    # Peak memory in its own run: tracemalloc slows allocation-heavy code
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = path.stat().st_size
+    mean = sum(times) / len(times)
+    return CaseResult(
+        case=name,
+        input_bytes=size,
+        items=items,
+        rounds=len(times),
+        ops_s=round(1 / mean, 2),
+        mb_s=round(size / mean / 1e6, 2),
+        mean_ms=round(mean * 1000, 2),
+        min_ms=round(min(times) * 1000, 2),
+        peak_kb=peak // 1024,
+    )
+
+
+# ── Baselines ──────────────────────────────────────────────────────
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=MODULES_DIR, capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float, check_speed: bool = True,
+) -> list[dict[str, Any]]:
+    """Cases that lost more than tolerance of throughput (if check_speed) or grew peak memory by more."""
+    before = {row["case"]: row for row in baseline.get("cases", [])}
+    regressions = []
+    for row in report["cases"]:
+        old = before.get(row["case"])
+        if not old:
+            continue
+        ratio = row["ops_s"] / old["ops_s"] if old["ops_s"] else 1.0
+        memory = row["peak_kb"] / old["peak_kb"] if old["peak_kb"] else 1.0
+        row["vs_baseline"] = {"speed": round(ratio, 3), "memory": round(memory, 3)}
+        if (check_speed and ratio < 1 - tolerance) or memory > 1 + tolerance:
+            regressions.append({"case": row["case"], **row["vs_baseline"]})
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="parser_bench",
+        description="Benchmark module output parsers on realistic-size fixtures.",
+    )
+    parser.add_argument("--case", action="append", choices=CASES, help="Case to run (repeatable; default: all)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Minimum timing per case (default: 1.0)")
+    parser.add_argument("--fixtures", type=Path, help="Directory of recorded fixtures to use where present")
+    parser.add_argument("--record", type=Path, help="Write the generated fixtures to this directory and exit")
+    parser.add_argument("--save", type=Path, help="Write the report to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed throughput loss / memory growth vs --compare (default: 0.2)")
+    parser.add_argument("--memory-only", action="store_true",
+                        help="Compare peak memory only: throughput is not comparable across machines")
+    opts = parser.parse_args()
+
+    names = opts.case or CASES
+
+    if opts.record:
+        opts.record.mkdir(parents=True, exist_ok=True)
+        paths = load_fixtures(names, None, opts.record)
+        print(json.dumps({name: str(p) for name, p in paths.items()}, indent=2))
+        return
+
+    with tempfile.TemporaryDirectory(prefix="parser-bench-") as work_dir:
+        paths = load_fixtures(names, opts.fixtures, Path(work_dir))
+        results = [bench_case(name, paths[name], opts.seconds) for name in names]
+
+    report: dict[str, Any] = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "cases": [r.as_dict() for r in results],
+    }
+    regressions: list[dict[str, Any]] = []
+    if opts.compare:
+        baseline = json.loads(opts.compare.read_text())
+        regressions = compare(report, baseline, opts.tolerance, check_speed=not opts.memory_only)
+        report["baseline_commit"] = baseline.get("commit")
+        report["regressions"] = regressions
+
+    if opts.save:
+        opts.save.parent.mkdir(parents=True, exist_ok=True)
+        opts.save.write_text(json.dumps(report, indent=2) + "\n")
+
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+/**
+ * Line fold tests for /api/kismet/recon.
+ *
+ * The route reads `wifi_recon --ndjson` output as it arrives: chunks split
+ * lines anywhere, a record may exceed the per-line limit, and a module that
+ * dies early never prints its summary. The fold must keep every complete
+ * record, drop an oversized one whole (not parse its tail as a new line)
+ * and report a run without a summary as having no result.
+ */
+import { describe, expect, it } from 'vitest';
+
+import { createReconFold } from '$lib/server/kismet/recon-fold';
+
+function ndjson(...records: unknown[]): string {
+	return records.map((r) => JSON.stringify(r) + '\n').join('');
+}
+
+const HEADER = { type: 'header', module: 'wifi_recon' };
+const SUMMARY = {
+	type: 'summary',
+	status: 'success',
+	module: 'wifi_recon',
+	summary: { total: 2 },
+	timestamp: '2026-10-17T00:00:00Z'
+};
+
+describe('createReconFold', () => {
+	it('folds items by key and the summary into the envelope', () => {
+		const fold = createReconFold(1_000);
+		fold.push(
+			ndjson(
+				HEADER,
+				{ type: 'item', key: 'targets', data: { mac: 'AA' } },
+				{ type: 'item', key: 'alerts', data: { id: 1 } },
+				{ type: 'item', key: 'targets', data: { mac: 'BB' } },
+				SUMMARY
+			)
+		);
+
+		const { result, oversized, skipped } = fold.end();
+		expect(oversized).toBe(0);
+		expect(skipped).toBe(0);
+		expect(result).toEqual({
+			status: 'success',
+			module: 'wifi_recon',
+			targets: [{ mac: 'AA' }, { mac: 'BB' }],
+			alerts: [{ id: 1 }],
+			summary: { total: 2 },
+			timestamp: '2026-10-17T00:00:00Z'
+		});
+	});
+
+	it('joins records split across chunks', () => {
+		const text = ndjson(HEADER, { type: 'item', key: 'targets', data: { mac: 'AA' } }, SUMMARY);
+		const fold = createReconFold(1_000);
+		for (let i = 0; i < text.length; i += 7) fold.push(text.slice(i, i + 7));
+
+		const { result } = fold.end();
+		expect(result?.targets).toEqual([{ mac: 'AA' }]);
+		expect(result?.status).toBe('success');
+	});
+
+	it('folds a final line without a trailing newline', () => {
+		const fold = createReconFold(1_000);
+		fold.push(ndjson(HEADER) + JSON.stringify(SUMMARY));
+		expect(fold.end().result?.status).toBe('success');
+	});
+
+	it('drops an oversized record whole and keeps the rest', () => {
+		const big = JSON.stringify({ type: 'item', key: 'targets', data: 'x'.repeat(5_000) });
+		const fold = createReconFold(1_000);
+		fold.push(ndjson(HEADER, { type: 'item', key: 'targets', data: { mac: 'AA' } }));
+		// arrives in pieces, each under the limit, so it is caught while buffering
+		for (let i = 0; i < big.length; i += 500) fold.push(big.slice(i, i + 500));
+		fold.push('\n' + ndjson({ type: 'item', key: 'targets', data: { mac: 'BB' } }, SUMMARY));
+
+		const { result, oversized, skipped } = fold.end();
+		expect(oversized).toBe(1);
+		expect(skipped).toBe(0);
+		expect(result?.targets).toEqual([{ mac: 'AA' }, { mac: 'BB' }]);
+	});
+
+	it('counts bytes, not UTF-16 units, against the limit', () => {
+		// 400 three-byte characters: 400 units, 1200 bytes
+		const line = JSON.stringify({ type: 'item', key: 'targets', data: '€'.repeat(400) });
+		const fold = createReconFold(1_000);
+		fold.push(line);
+		fold.push('\n' + ndjson(SUMMARY));
+
+		const { result, oversized } = fold.end();
+		expect(oversized).toBe(1);
+		expect(result?.targets).toBeUndefined();
+	});
+
+	it('returns no result when the summary never arrives', () => {
+		const fold = createReconFold(1_000);
+		fold.push(ndjson(HEADER, { type: 'item', key: 'targets', data: { mac: 'AA' } }));
+		fold.push('{"type":"summ');
+
+		const { result, skipped } = fold.end();
+		expect(result).toBeNull();
+		expect(skipped).toBe(1);
+	});
+
+	it('skips non-JSON lines', () => {
+		const fold = createReconFold(1_000);
+		fold.push('Traceback (most recent call last):\n' + ndjson(HEADER, SUMMARY) + '\n\n');
+
+		const { result, skipped } = fold.end();
+		expect(skipped).toBe(1);
+		expect(result?.status).toBe('success');
+	});
+});
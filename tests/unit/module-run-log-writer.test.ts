@@ -0,0 +1,193 @@
+/**
+ * Merge tests for module_runner.ts's run log writer.
+ *
+ * A run's module_runs row comes from two sides: the module sends its own
+ * over the runner's log pipe (or writes it through the daemon), and the
+ * runner adds its row when the module exits. RunLogWriter must leave one
+ * row per run_id in which the module's fields win and the runner's only
+ * fill what the module left out — including when the module's row is
+ * already in the DB and the insert merges into it on the unique run_id.
+ */
+import { mkdtempSync, rmSync } from 'node:fs';
+import { tmpdir } from 'node:os';
+import { join } from 'node:path';
+
+import Database from 'better-sqlite3';
+import { afterEach, beforeEach, describe, expect, it } from 'vitest';
+
+import { RunLogWriter } from '../../tactical/modules/run_log_writer';
+
+const MODULE_RUNS = `
+	CREATE TABLE module_runs (
+		id INTEGER PRIMARY KEY AUTOINCREMENT,
+		engagement_id TEXT,
+		module_name TEXT NOT NULL,
+		args TEXT,
+		exit_code INTEGER,
+		stdout TEXT,
+		stderr TEXT,
+		duration_ms INTEGER,
+		run_id TEXT,
+		profile_path TEXT
+	);
+	CREATE TABLE module_run_spans (
+		id INTEGER PRIMARY KEY AUTOINCREMENT,
+		run_id TEXT,
+		module_name TEXT,
+		name TEXT,
+		start_ms REAL,
+		duration_ms REAL,
+		depth INTEGER
+	);
+`;
+const UNIQUE_RUN_ID = 'CREATE UNIQUE INDEX idx_module_runs_run_id ON module_runs(run_id)';
+
+function record(dbPath: string, table: string, row: Record<string, unknown>): string {
+	return JSON.stringify({ db: dbPath, table, row });
+}
+
+describe('RunLogWriter', () => {
+	let dir: string;
+	let dbPath: string;
+
+	function createDb(uniqueRunId: boolean): void {
+		const db = new Database(dbPath);
+		db.exec(MODULE_RUNS);
+		if (uniqueRunId) db.exec(UNIQUE_RUN_ID);
+		db.close();
+	}
+
+	function readRuns(): Array<Record<string, unknown>> {
+		const db = new Database(dbPath, { readonly: true });
+		try {
+			return db.prepare('SELECT * FROM module_runs ORDER BY id').all() as Array<
+				Record<string, unknown>
+			>;
+		} finally {
+			db.close();
+		}
+	}
+
+	beforeEach(() => {
+		dir = mkdtempSync(join(tmpdir(), 'argos-run-log-'));
+		dbPath = join(dir, 'rf_signals.db');
+	});
+
+	afterEach(() => {
+		rmSync(dir, { recursive: true, force: true });
+	});
+
+	it.each([false, true])('merges module and runner rows into one (unique run_id: %s)', (unique) => {
+		createDb(unique);
+		const writer = new RunLogWriter();
+		writer.accept(
+			record(dbPath, 'module_runs', {
+				run_id: 'run-1',
+				module_name: 'wifi_recon',
+				exit_code: 0,
+				stdout: '{"status":"success"}',
+				profile_path: null
+			})
+		);
+		writer.addRunnerRow(dbPath, {
+			run_id: 'run-1',
+			module_name: 'module_runner',
+			engagement_id: 'eng-7',
+			args: '["--ndjson"]',
+			exit_code: 1,
+			stderr: 'runner stderr',
+			duration_ms: 1234,
+			profile_path: '/tmp/profile.json'
+		});
+
+		expect(writer.flush()).toBe(1);
+
+		const rows = readRuns();
+		expect(rows).toHaveLength(1);
+		expect(rows[0]).toMatchObject({
+			run_id: 'run-1',
+			// the module's fields win
+			module_name: 'wifi_recon',
+			exit_code: 0,
+			stdout: '{"status":"success"}',
+			// the runner fills only what the module left out
+			engagement_id: 'eng-7',
+			args: '["--ndjson"]',
+			stderr: 'runner stderr',
+			duration_ms: 1234,
+			profile_path: '/tmp/profile.json'
+		});
+	});
+
+	it('lets the module row win regardless of arrival order', () => {
+		createDb(true);
+		const writer = new RunLogWriter();
+		writer.addRunnerRow(dbPath, { run_id: 'run-2', module_name: 'module_runner', exit_code: 1 });
+		writer.accept(record(dbPath, 'module_runs', { run_id: 'run-2', module_name: 'disk_analyzer' }));
+		writer.flush();
+
+		expect(readRuns()).toEqual([
+			expect.objectContaining({ run_id: 'run-2', module_name: 'disk_analyzer', exit_code: 1 })
+		]);
+	});
+
+	it('fills only the missing fields of a row the module already wrote', () => {
+		createDb(true);
+		const db = new Database(dbPath);
+		db.prepare(
+			'INSERT INTO module_runs (run_id, module_name, exit_code, stdout) VALUES (?, ?, ?, ?)'
+		).run('run-3', 'wifi_recon', 0, 'daemon stdout');
+		db.close();
+
+		const writer = new RunLogWriter();
+		writer.addRunnerRow(dbPath, {
+			run_id: 'run-3',
+			module_name: 'module_runner',
+			exit_code: 2,
+			stdout: 'runner stdout',
+			duration_ms: 50
+		});
+		expect(writer.flush()).toBe(1);
+
+		const rows = readRuns();
+		expect(rows).toHaveLength(1);
+		expect(rows[0]).toMatchObject({
+			run_id: 'run-3',
+			module_name: 'wifi_recon',
+			exit_code: 0,
+			stdout: 'daemon stdout',
+			duration_ms: 50
+		});
+	});
+
+	it('writes spans and skips malformed records', () => {
+		createDb(false);
+		const writer = new RunLogWriter();
+		writer.accept('not json');
+		writer.accept(JSON.stringify({ table: 'module_runs', row: { run_id: 'x' } }));
+		writer.accept(
+			record(dbPath, 'module_run_spans', {
+				run_id: 'run-4',
+				module_name: 'wifi_recon',
+				name: 'parse',
+				start_ms: 0,
+				duration_ms: 12.5,
+				depth: 0
+			})
+		);
+		writer.addRunnerRow(dbPath, { run_id: 'run-4', module_name: 'wifi_recon' });
+		expect(writer.flush()).toBe(1);
+
+		const db = new Database(dbPath, { readonly: true });
+		const spans = db.prepare('SELECT run_id, name, duration_ms FROM module_run_spans').all();
+		db.close();
+		expect(spans).toEqual([{ run_id: 'run-4', name: 'parse', duration_ms: 12.5 }]);
+		expect(readRuns()).toHaveLength(1);
+	});
+
+	it('writes nothing when the DB does not exist', () => {
+		const writer = new RunLogWriter();
+		writer.addRunnerRow(dbPath, { run_id: 'run-5', module_name: 'wifi_recon' });
+		expect(writer.flush()).toBe(0);
+	});
+});
@@ -0,0 +1,114 @@
+/**
+ * Query plan regression tests for wifi_recon's Argos DB fallback.
+ *
+ * WiFiRecon._query_argos_targets looks up each device's latest signal with a
+ * correlated subquery. Without idx_signals_device_timestamp that subquery
+ * sorts every signal of the device, which made the fallback O(devices x
+ * signals) on large rf_signals.db files. The SQL is read from wifi_recon.py
+ * so the plan checked here is the one the module runs.
+ */
+import { readFileSync } from 'node:fs';
+import { join } from 'node:path';
+
+import Database from 'better-sqlite3';
+import { afterEach, beforeEach, describe, expect, it } from 'vitest';
+
+const ROOT = join(__dirname, '..', '..');
+const SCHEMA = join(ROOT, 'src', 'lib', 'server', 'db', 'schema.sql');
+const MIGRATION = join(
+	ROOT,
+	'src',
+	'lib',
+	'server',
+	'db',
+	'migrations',
+	'20261017_add_signals_device_time_index.sql'
+);
+const WIFI_RECON = join(ROOT, 'tactical', 'modules', 'wifi_recon.py');
+
+/** The base SELECT of _query_argos_targets, with the filters it appends. */
+function argosTargetsQuery(filters: { type?: boolean; minSignal?: boolean } = {}): string {
+	const source = readFileSync(WIFI_RECON, 'utf-8');
+	const match = source.match(/def _query_argos_targets[\s\S]*?query = """([\s\S]*?)"""/);
+	if (!match) throw new Error('_query_argos_targets query not found in wifi_recon.py');
+	let query = match[1];
+	if (filters.type) query += ' AND d.type = ?';
+	if (filters.minSignal) query += ' AND (d.avg_power >= ? OR d.avg_power IS NULL)';
+	return query + ' ORDER BY d.last_seen DESC LIMIT ?';
+}
+
+function queryPlan(db: Database.Database, sql: string, params: unknown[]): string[] {
+	const rows = db.prepare(`EXPLAIN QUERY PLAN ${sql}`).all(...params) as Array<{
+		detail: string;
+	}>;
+	return rows.map((row) => row.detail);
+}
+
+describe('wifi_recon Argos fallback query plan', () => {
+	let db: Database.Database;
+
+	beforeEach(() => {
+		db = new Database(':memory:');
+		db.exec(readFileSync(SCHEMA, 'utf-8'));
+		db.exec(readFileSync(MIGRATION, 'utf-8'));
+	});
+
+	afterEach(() => {
+		db.close();
+	});
+
+	it('finds the latest signal with an index-only seek per device', () => {
+		const plan = queryPlan(db, argosTargetsQuery(), [0, 200]);
+
+		expect(plan).toContainEqual(
+			expect.stringMatching(
+				/SEARCH signals USING COVERING INDEX idx_signals_device_timestamp \(device_id=\?\)/
+			)
+		);
+		expect(plan).toContainEqual(expect.stringMatching(/SEARCH s USING INTEGER PRIMARY KEY/));
+		expect(plan.some((step) => /SCAN (signals|s)\b/.test(step))).toBe(false);
+		expect(plan.some((step) => step.includes('TEMP B-TREE'))).toBe(false);
+	});
+
+	it('walks devices by last_seen so LIMIT stops the scan early', () => {
+		const plan = queryPlan(db, argosTargetsQuery({ type: true, minSignal: true }), [
+			0,
+			'wifi',
+			-80,
+			200
+		]);
+
+		expect(plan).toContainEqual(
+			expect.stringMatching(/SEARCH d USING INDEX idx_devices_last_seen/)
+		);
+		expect(plan.some((step) => step.includes('TEMP B-TREE'))).toBe(false);
+	});
+
+	it('returns the most recent signal of each device', () => {
+		const insertDevice = db.prepare(
+			`INSERT INTO devices (device_id, type, first_seen, last_seen)
+			 VALUES (?, 'wifi', 0, ?)`
+		);
+		const insertSignal = db.prepare(
+			`INSERT INTO signals (signal_id, device_id, timestamp, latitude, longitude, power, frequency, source)
+			 VALUES (?, ?, ?, 0, 0, ?, 2437, 'kismet')`
+		);
+		insertDevice.run('aa:aa', 2000);
+		insertDevice.run('bb:bb', 1000);
+		insertSignal.run('s1', 'aa:aa', 1500, -70);
+		insertSignal.run('s2', 'aa:aa', 1900, -40);
+		insertSignal.run('s3', 'aa:aa', 1200, -90);
+		insertSignal.run('s4', 'bb:bb', 900, -60);
+		insertSignal.run('s5', 'bb:bb', 900, -55);
+
+		const rows = db.prepare(argosTargetsQuery()).all(0, 10) as Array<{
+			device_id: string;
+			last_signal_dbm: number;
+		}>;
+
+		expect(rows.map((row) => [row.device_id, row.last_signal_dbm])).toEqual([
+			['aa:aa', -40],
+			['bb:bb', -55]
+		]);
+	});
+});